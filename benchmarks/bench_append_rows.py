@@ -0,0 +1,97 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Append Benchmark - appending a daily delta versus re-uploading the history.
+
+Uploads a synthetic order history, then adds a small delta of new orders
+(with a few already loaded ones) two ways:
+- re-upload: read, profile and load the whole history plus the delta,
+- append: append_delta, which checks, inserts and profiles the delta only.
+The first append also builds the column sketches of the loaded rows, so it
+is timed separately from the following ones.
+
+Usage:
+    python benchmarks/bench_append_rows.py [--rows 500000] [--delta 5000]
+"""
+
+# =============================== IMPORTS ===============================
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+
+# =============================== DATA GENERATION ===============================
+def build_orders(start: int, rows: int, seed: int) -> pd.DataFrame:
+    """Order rows with ids start..start+rows-1."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "order_id": np.arange(start, start + rows),
+        "customer": [f"Customer {i}" for i in rng.integers(0, 50_000, rows)],
+        "region": rng.choice(["North", "South", "East", "West"], rows),
+        "amount": rng.normal(250, 80, rows).round(2),
+        "ordered_at": (
+            pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24 * 3600, rows), unit="s")
+        ).strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+
+# =============================== BENCHMARK ===============================
+def upload(csv_path: str, table_name: str) -> dict:
+    """Read, profile and load a file the way the upload endpoint does."""
+    from src.app.utils.database_manager import load_file_to_db
+    from src.app.utils.schema_generator import generate_schema, read_excel_file
+
+    sheets_data = read_excel_file(csv_path)
+    schema = generate_schema(csv_path, sheets_data=sheets_data)
+    load_file_to_db(csv_path, table_name, sheets_data=sheets_data, file_hash=table_name, schema=schema)
+    return schema
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--delta", type=int, default=5_000)
+    parser.add_argument("--appends", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        from src.app.utils.table_append import append_delta, read_delta
+
+        history = build_orders(1, args.rows, 19)
+        history.to_csv("history.csv", index=False)
+        schema = upload("history.csv", "orders")
+        print(f"History: {args.rows:,} rows, delta: {args.delta:,} rows (1% already loaded), pandas {pd.__version__}")
+
+        # Re-upload: the history with one more delta, from scratch
+        overlap = max(1, args.delta // 100)
+        delta = build_orders(args.rows + 1 - overlap, args.delta, 20)
+        pd.concat([history, delta.iloc[overlap:]]).to_csv("full.csv", index=False)
+        start = time.perf_counter()
+        upload("full.csv", "orders_full")
+        print(f"re-upload      {time.perf_counter() - start:7.2f}s")
+
+        for number in range(1, args.appends + 1):
+            delta = build_orders(args.rows + (number - 1) * (args.delta - overlap) + 1 - overlap, args.delta, 20 + number)
+            delta.to_csv(f"delta{number}.csv", index=False)
+            start = time.perf_counter()
+            table, appended = append_delta(
+                "orders", "orders", schema, "Sheet1", read_delta(f"delta{number}.csv", "Sheet1"), ["order_id"]
+            )
+            elapsed = time.perf_counter() - start
+            schema = {**schema, "tables": [table]}
+            label = "append (first)" if number == 1 else f"append #{number}"
+            print(f"{label:<14} {elapsed:7.2f}s   appended: {appended:,}   total rows: {table['row_count']:,}")
+        os.chdir(project_root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Bulk Load Benchmark - Rows/sec of the original to_sql load versus the staged bulk load.
+
+"before" replaces the live table with DataFrame.to_sql(if_exists="replace") on
+a default connection, as load_file_to_db originally did. "after" is the current
+load_file_to_db: a new per-file database with relaxed pragmas, typed tables,
+batched executemany and indexes, swapped in by one catalog update.
+
+Usage:
+    python benchmarks/bench_bulk_load.py [--rows 1000000] [--repeat 3]
+"""
+
+# =============================== IMPORTS ===============================
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+
+# =============================== DATA GENERATION ===============================
+def build_frame(rows: int) -> pd.DataFrame:
+    """Synthetic HR-style table with numeric, text and date columns."""
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        "Employee_ID": np.arange(rows),
+        "Name": [f"Employee {i}" for i in range(rows)],
+        "Department": rng.choice(["HR", "Sales", "IT", "Finance"], rows),
+        "Age": rng.integers(20, 65, rows),
+        "Salary": rng.normal(60000, 15000, rows).round(2),
+        "Joined": pd.Timestamp("2015-01-01") + pd.to_timedelta(rng.integers(0, 3000, rows), unit="D"),
+    })
+
+
+# =============================== BENCHMARK ===============================
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_bulk_"))
+    os.chdir(work_dir)
+
+    from src.app.utils.database_manager import DB_FILE, load_file_to_db, close_db_connections
+    from src.app.utils.schema_generator import generate_schema
+
+    df = build_frame(args.rows)
+    csv_path = work_dir / "bench.csv"
+    df.head(10).to_csv(csv_path, index=False)  # the catalog only needs a file to stat
+    schema = generate_schema(str(csv_path), {"Sheet1": df})
+    print(f"Loading {args.rows:,} rows x {len(df.columns)} columns, best of {args.repeat}, in {work_dir}")
+
+    before = float("inf")
+    conn = sqlite3.connect(str(work_dir / "before.db"))
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        df.to_sql("bench", conn, index=False, if_exists="replace")
+        conn.commit()
+        before = min(before, time.perf_counter() - start)
+    conn.close()
+
+    after = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        load_file_to_db(str(csv_path), "bench", sheets_data={"Sheet1": df.copy()}, schema=schema)
+        after = min(after, time.perf_counter() - start)
+    close_db_connections()
+
+    print(f"Before (to_sql, live table):     {before:.2f}s  {args.rows / before:>12,.0f} rows/sec")
+    print(f"After  (file database + swap):   {after:.2f}s  {args.rows / after:>12,.0f} rows/sec")
+    print(f"Speed-up: {before / after:.2f}x  (database: {DB_FILE.resolve()})")
+
+
+if __name__ == "__main__":
+    main()
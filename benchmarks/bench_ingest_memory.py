@@ -0,0 +1,113 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Ingestion Memory Benchmark - standard versus compact DataFrames during upload.
+
+Builds a synthetic HR/sales export (ids, names, low-cardinality text such as
+department/country/status, amounts, dates), then runs the upload pipeline
+(read, profile, load into a file database) once per INGEST_MEMORY_MODE. Each
+run is a fresh process in a scratch directory; the peak RSS increase is
+measured with the same tracker the upload endpoint reports.
+
+Usage:
+    python benchmarks/bench_ingest_memory.py [--rows 500000]
+"""
+
+# =============================== IMPORTS ===============================
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+
+# =============================== DATA GENERATION ===============================
+def build_export(path: Path, rows: int) -> None:
+    """HR/sales-style CSV export."""
+    rng = np.random.default_rng(17)
+    hire_dates = pd.Timestamp("2000-01-01") + pd.to_timedelta(rng.integers(0, 8000, rows), unit="D")
+    pd.DataFrame({
+        "employee_id": np.arange(1, rows + 1),
+        "name": [f"Person {i}" for i in rng.integers(0, rows, rows)],
+        "department": rng.choice([f"Department {i}" for i in range(20)], rows),
+        "country": rng.choice([f"Country {i}" for i in range(60)], rows),
+        "job_title": rng.choice([f"Job title {i}" for i in range(300)], rows),
+        "status": rng.choice(["Active", "Terminated", "On leave"], rows),
+        "salary": rng.normal(60000, 15000, rows).round(2),
+        "bonus_pct": rng.choice([0, 0.05, 0.1, 0.125, 0.25], rows),
+        "age": rng.integers(18, 70, rows),
+        "is_manager": rng.integers(0, 2, rows),
+        "hire_date": hire_dates.strftime("%Y-%m-%d"),
+        "units_sold": rng.integers(0, 500, rows),
+        "region": rng.choice(["North", "South", "East", "West"], rows),
+    }).to_csv(path, index=False)
+
+
+# =============================== SINGLE RUN (child process) ===============================
+def run_ingest(csv_path: str) -> None:
+    """Read, profile and load the export; print a JSON report."""
+    from src.app.utils.database_manager import load_file_to_db
+    from src.app.utils.memory_usage import PeakMemoryTracker
+    from src.app.utils.schema_generator import generate_schema, read_excel_file
+
+    tracker = PeakMemoryTracker("benchmark ingest").start()
+    start = time.perf_counter()
+    sheets_data = read_excel_file(csv_path)
+    frame_mb = sum(df.memory_usage(deep=True).sum() for df in sheets_data.values()) / (1024 * 1024)
+    schema = generate_schema(csv_path, sheets_data=sheets_data)
+    load_file_to_db(csv_path, "bench", sheets_data=sheets_data, file_hash="bench", schema=schema)
+    elapsed = time.perf_counter() - start
+    report = tracker.stop()
+    print(json.dumps({"seconds": elapsed, "frame_mb": frame_mb, "peak_increase_mb": report["peak_increase_mb"]}))
+
+
+def measure(csv_path: Path, mode: str) -> dict:
+    """Run one ingest in a fresh process with INGEST_MEMORY_MODE=mode."""
+    with tempfile.TemporaryDirectory() as scratch:
+        env = dict(os.environ, PYTHONPATH=str(project_root), INGEST_MEMORY_MODE=mode)
+        output = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--child", str(csv_path)],
+            cwd=scratch, env=env, check=True, capture_output=True, text=True,
+        ).stdout.strip().splitlines()[-1]
+    return json.loads(output)
+
+
+# =============================== BENCHMARK ===============================
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_ingest(args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = Path(work_dir) / "export.csv"
+        build_export(csv_path, args.rows)
+        print(f"Export: {args.rows:,} rows ({csv_path.stat().st_size / (1024 * 1024):.1f} MB CSV), pandas {pd.__version__}")
+
+        results = {mode: measure(csv_path, mode) for mode in ("standard", "compact")}
+        for mode, result in results.items():
+            print(
+                f"{mode:<9} read + profile + load: {result['seconds']:6.2f}s   "
+                f"frames: {result['frame_mb']:7.1f} MB   peak RSS increase: {result['peak_increase_mb']:7.1f} MB"
+            )
+        standard, compact = results["standard"], results["compact"]
+        print(
+            f"Frames {standard['frame_mb'] / compact['frame_mb']:.1f}x smaller, "
+            f"peak RSS increase {standard['peak_increase_mb'] / compact['peak_increase_mb']:.1f}x lower"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Parallel Ingest Benchmark - Serial vs process-pool parsing/profiling of a multi-sheet workbook.
+
+Usage:
+    python benchmarks/bench_parallel_ingest.py [--sheets 20] [--rows 20000] [--workers 16]
+"""
+
+# =============================== IMPORTS ===============================
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+
+# =============================== WORKBOOK GENERATION ===============================
+def build_workbook(path: Path, sheets: int, rows: int) -> None:
+    """Write a synthetic workbook with the given number of sheets."""
+    rng = np.random.default_rng(3)
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet in range(sheets):
+            pd.DataFrame({
+                "Record ID": np.arange(rows),
+                "Category": rng.choice(["A", "B", "C", "D"], rows),
+                "Value": rng.normal(100, 25, rows).round(3),
+                "Count": rng.integers(0, 1000, rows),
+                "Day": pd.Timestamp("2021-01-01") + pd.to_timedelta(rng.integers(0, 900, rows), unit="D"),
+            }).to_excel(writer, sheet_name=f"Sheet{sheet + 1}", index=False)
+
+
+# =============================== BENCHMARK ===============================
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sheets", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_parallel_"))
+    os.chdir(work_dir)
+    os.environ["INGEST_WORKERS"] = str(args.workers)
+
+    from src.app.utils import parallel_ingest
+    from src.app.utils.schema_generator import generate_schema, read_excel_file
+
+    workbook = work_dir / "bench.xlsx"
+    print(f"Building workbook with {args.sheets} sheet(s) x {args.rows} rows in {work_dir} ...")
+    build_workbook(workbook, args.sheets, args.rows)
+
+    start = time.perf_counter()
+    serial_schema = generate_schema(str(workbook), read_excel_file(str(workbook)))
+    serial = time.perf_counter() - start
+
+    # Exclude worker start-up (spawn + imports), which happens once per API process
+    pool = parallel_ingest._get_pool()
+    list(pool.map(parallel_ingest.list_sheet_names, [str(workbook)] * args.workers))
+    start = time.perf_counter()
+    _, parallel_schema = parallel_ingest.read_and_profile(str(workbook))
+    parallel = time.perf_counter() - start
+    assert parallel_schema == serial_schema, "parallel and serial schemas differ"
+    parallel_ingest.shutdown_ingest_pool()
+
+    print(f"CPU cores: {os.cpu_count()}, workers: {args.workers}")
+    print(f"Serial parse + profile:   {serial:.2f}s")
+    print(f"Parallel parse + profile: {parallel:.2f}s")
+    print(f"Speed-up: {serial / parallel:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Query Engine Benchmark - SQLite vs DuckDB on typical group-by/aggregate questions.
+
+Loads one synthetic sales table the way an upload does (per-file SQLite
+database + Arrow sidecar + registry metadata on disk) and times the same
+queries on both engines of src/app/utils/query_engine.py.
+
+Usage:
+    python benchmarks/bench_query_engines.py [--rows 2000000] [--repeat 5]
+"""
+
+# =============================== IMPORTS ===============================
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+# =============================== QUERIES ===============================
+QUERIES = {
+    "group by region": (
+        "SELECT Region, COUNT(*) AS orders, SUM(Amount) AS revenue, AVG(Amount) AS avg_amount "
+        "FROM sales GROUP BY Region ORDER BY revenue DESC"
+    ),
+    "revenue per product and year": (
+        "SELECT Product, strftime('%Y', Order_Date) AS year, SUM(Amount) AS revenue "
+        "FROM sales GROUP BY Product, year ORDER BY revenue DESC LIMIT 10"
+    ),
+    "distinct customers over threshold": (
+        "SELECT COUNT(DISTINCT Customer_ID) AS customers FROM sales WHERE Amount > 500"
+    ),
+    "filtered aggregate": (
+        "SELECT Region, MAX(Amount) AS max_amount, MIN(Quantity) AS min_quantity FROM sales "
+        "WHERE Order_Date >= '2022-01-01' GROUP BY Region HAVING COUNT(*) > 100"
+    ),
+}
+
+
+# =============================== DATA GENERATION ===============================
+def build_frame(rows: int) -> pd.DataFrame:
+    """Synthetic sales table with numeric, text and date columns."""
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        "Order ID": np.arange(rows),
+        "Customer ID": rng.integers(0, rows // 20 + 1, rows),
+        "Region": rng.choice(["North", "South", "East", "West", "Central"], rows),
+        "Product": rng.choice([f"Product {i}" for i in range(50)], rows),
+        "Quantity": rng.integers(1, 20, rows),
+        "Amount": rng.gamma(2.0, 150.0, rows).round(2),
+        "Order Date": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1800, rows), unit="D"),
+    })
+
+
+def time_query(engine, query: str, repeat: int) -> float:
+    """Median wall time of a query after one warm-up run."""
+    engine.execute(query)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine.execute(query)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+# =============================== BENCHMARK ===============================
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_engines_"))
+    os.chdir(work_dir)
+
+    from src.app.utils.database_manager import load_file_to_db, close_db_connections
+    from src.app.utils.query_engine import SQLiteEngine, DuckDBEngine, DUCKDB_AVAILABLE
+    from src.app.utils.schema_generator import generate_schema
+    from src.app.utils.sidecar_cache import write_sidecar
+
+    if not DUCKDB_AVAILABLE:
+        sys.exit("duckdb is not installed")
+
+    print(f"Loading {args.rows:,} rows in {work_dir} ...")
+    df = build_frame(args.rows)
+    for directory in ("uploads", "schemas", "metadata"):
+        Path(directory).mkdir()
+    upload = Path("uploads") / "sales.csv"
+    df.head(100).to_csv(upload, index=False)  # registry entry; the data is read from the sidecar
+    file_hash = "bench" + "0" * 59
+
+    sheets_data = {"Sheet1": df}
+    schema = generate_schema(str(upload), sheets_data)
+    load_file_to_db(str(upload), "sales", sheets_data=sheets_data, file_hash=file_hash, schema=schema)
+    write_sidecar(file_hash, sheets_data)
+    with open(Path("schemas") / "sales.json", "w", encoding="utf-8") as f:
+        json.dump(schema, f)
+    with open(Path("metadata") / "sales.json", "w", encoding="utf-8") as f:
+        json.dump({"original_filename": "sales.csv", "file_id": "sales", "table_name": "sales",
+                   "file_hash": file_hash}, f)
+
+    engines = [SQLiteEngine(), DuckDBEngine()]
+    print(f"{'query':<36}{'sqlite':>10}{'duckdb':>10}{'speed-up':>10}")
+    for label, query in QUERIES.items():
+        sqlite_time, duckdb_time = (time_query(engine, query, args.repeat) for engine in engines)
+        print(f"{label:<36}{sqlite_time:>9.3f}s{duckdb_time:>9.3f}s{sqlite_time / duckdb_time:>9.1f}x")
+
+    for engine in engines:
+        engine.close()
+    close_db_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Result Cache Benchmark - repeated dashboard queries with and without the result cache.
+
+Loads a synthetic order history, then runs the same few dashboard queries
+(group-bys and a filtered count) several times through execute_sql_query,
+first with the result cache disabled, then enabled. Appending rows bumps the
+catalog version, so the next run misses and sees the new rows.
+
+Usage:
+    python benchmarks/bench_result_cache.py [--rows 1000000] [--repeats 10]
+"""
+
+# =============================== IMPORTS ===============================
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+DASHBOARD = [
+    "SELECT region, COUNT(*) AS orders, ROUND(SUM(amount), 2) AS revenue FROM orders GROUP BY region",
+    "SELECT strftime('%Y-%m', ordered_at) AS month, COUNT(*) AS orders FROM orders GROUP BY month ORDER BY month",
+    "SELECT COUNT(*) AS big_orders FROM orders WHERE amount > 400",
+]
+
+
+# =============================== DATA GENERATION ===============================
+def build_orders(start: int, rows: int, seed: int) -> pd.DataFrame:
+    """Order rows with ids start..start+rows-1."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "order_id": np.arange(start, start + rows),
+        "region": rng.choice(["North", "South", "East", "West"], rows),
+        "amount": rng.normal(250, 80, rows).round(2),
+        "ordered_at": (
+            pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24 * 3600, rows), unit="s")
+        ).strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+
+# =============================== BENCHMARK ===============================
+def run_dashboard(repeats: int) -> list:
+    """Run the dashboard queries repeats times; return the wall time of each round."""
+    from src.app.mcp.tools import execute_sql_query
+
+    rounds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for query in DASHBOARD:
+            assert json.loads(execute_sql_query(query))["success"]
+        rounds.append(time.perf_counter() - start)
+    return rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        from src.app.mcp.tools import execute_sql_query
+        from src.app.utils import result_cache
+        from src.app.utils.database_manager import append_rows_to_db, load_file_to_db
+        from src.app.utils.schema_generator import generate_schema, read_excel_file
+
+        build_orders(1, args.rows, 25).to_csv("orders.csv", index=False)
+        sheets_data = read_excel_file("orders.csv")
+        schema = generate_schema("orders.csv", sheets_data=sheets_data)
+        load_file_to_db("orders.csv", "orders", sheets_data=sheets_data, file_hash="orders", schema=schema)
+        print(f"Orders: {args.rows:,} rows, dashboard of {len(DASHBOARD)} queries x {args.repeats} rounds")
+
+        configured = result_cache.RESULT_CACHE_MAX_BYTES
+        result_cache.RESULT_CACHE_MAX_BYTES = 0
+        uncached = run_dashboard(args.repeats)
+        result_cache.RESULT_CACHE_MAX_BYTES = configured
+        cached = run_dashboard(args.repeats)
+
+        print(f"no cache   round: {np.mean(uncached) * 1000:8.1f} ms   total: {sum(uncached):6.2f}s")
+        print(
+            f"cache      round: {np.mean(cached[1:]) * 1000:8.1f} ms   total: {sum(cached):6.2f}s   "
+            f"(first round {cached[0] * 1000:.1f} ms fills the cache)"
+        )
+
+        # Appending rows bumps the catalog version: the next run misses and sees the new rows
+        count_query = "SELECT COUNT(*) AS n FROM orders"
+        execute_sql_query(count_query)
+        column_types = {col["name"]: col["type"] for col in schema["tables"][0]["columns"]}
+        append_rows_to_db("orders", build_orders(args.rows + 1, 1000, 26), column_types)
+        start = time.perf_counter()
+        count = json.loads(execute_sql_query(count_query))["data"][0]["n"]
+        print(f"after append: {(time.perf_counter() - start) * 1000:.1f} ms, COUNT(*) = {count:,}")
+        stats = result_cache.get_result_cache_stats()
+        print(
+            f"result cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+            f"{stats['entries']} entr(ies), {stats['bytes']:,} bytes"
+        )
+        os.chdir(project_root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Upload Formats Benchmark - stored size and parse time per upload format.
+
+Writes the same synthetic export as CSV, gzipped CSV, zip, Parquet and JSON
+Lines, then reads each one the way an upload does (read_excel_file, which
+also compacts the frames). The stored size is what users upload and what is
+kept in uploads/.
+
+Usage:
+    python benchmarks/bench_upload_formats.py [--rows 500000]
+"""
+
+# =============================== IMPORTS ===============================
+import argparse
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+
+# =============================== DATA GENERATION ===============================
+def build_export(rows: int) -> pd.DataFrame:
+    """Sales-style export: ids, low-cardinality text, amounts and timestamps."""
+    rng = np.random.default_rng(18)
+    return pd.DataFrame({
+        "order_id": np.arange(1, rows + 1),
+        "customer": [f"Customer {i}" for i in rng.integers(0, rows // 10, rows)],
+        "region": rng.choice(["North", "South", "East", "West"], rows),
+        "product": rng.choice([f"Product {i}" for i in range(200)], rows),
+        "quantity": rng.integers(1, 50, rows),
+        "amount": rng.normal(250, 80, rows).round(2),
+        "ordered_at": (
+            pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24 * 3600, rows), unit="s")
+        ).strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+
+def write_formats(df: pd.DataFrame, work_dir: Path) -> dict:
+    """Write the export in every upload format; return format -> path."""
+    paths = {
+        "csv": work_dir / "export.csv",
+        "csv.gz": work_dir / "export.csv.gz",
+        "zip": work_dir / "export.zip",
+        "parquet": work_dir / "export.parquet",
+        "jsonl": work_dir / "export.jsonl",
+    }
+    df.to_csv(paths["csv"], index=False)
+    df.to_csv(paths["csv.gz"], index=False)
+    with zipfile.ZipFile(paths["zip"], "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.write(paths["csv"], "export.csv")
+    df.to_parquet(paths["parquet"], index=False)
+    df.to_json(paths["jsonl"], orient="records", lines=True)
+    return paths
+
+
+# =============================== BENCHMARK ===============================
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    from src.app.utils.schema_generator import read_excel_file
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        paths = write_formats(build_export(args.rows), Path(work_dir))
+        csv_mb = paths["csv"].stat().st_size / (1024 * 1024)
+        print(f"Export: {args.rows:,} rows, pandas {pd.__version__}")
+
+        for name, path in paths.items():
+            size_mb = path.stat().st_size / (1024 * 1024)
+            start = time.perf_counter()
+            sheets = read_excel_file(str(path))
+            elapsed = time.perf_counter() - start
+            rows = sum(len(df) for df in sheets.values())
+            print(
+                f"{name:<8} stored: {size_mb:7.1f} MB ({size_mb / csv_mb:5.1%} of CSV)   "
+                f"parse: {elapsed:6.2f}s   rows: {rows:,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Upload Jobs Benchmark - responsiveness of the API while a large upload runs.
+
+Uploads a synthetic CSV export through the real upload endpoint while another
+client pings a trivial async endpoint on the same event loop (a stand-in for
+/api/chat, whose own work is awaiting the model). Each mode runs in a fresh
+process in a scratch directory:
+- inline: UPLOAD_JOB_WORKERS=0, the upload is processed inside the request,
+  as before upload jobs, so the event loop is blocked until it finishes,
+- jobs: the upload runs on the job pool and is polled until it completes.
+
+Usage:
+    python benchmarks/bench_upload_jobs.py [--rows 1000000]
+"""
+
+# =============================== IMPORTS ===============================
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+
+# =============================== DATA GENERATION ===============================
+def build_export(path: Path, rows: int) -> None:
+    """Sales-style CSV export."""
+    rng = np.random.default_rng(20)
+    pd.DataFrame({
+        "order_id": np.arange(1, rows + 1),
+        "customer": [f"Customer {i}" for i in rng.integers(0, rows // 10, rows)],
+        "region": rng.choice(["North", "South", "East", "West"], rows),
+        "amount": rng.normal(250, 80, rows).round(2),
+        "quantity": rng.integers(1, 50, rows),
+    }).to_csv(path, index=False)
+
+
+# =============================== SINGLE RUN (child process) ===============================
+def run_upload(csv_path: str) -> None:
+    """Upload the export while pinging the event loop; print a JSON report."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from src.app.api.file_manager import router
+
+    app = FastAPI()
+    app.include_router(router)
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    # One event loop for every request, as on a uvicorn worker
+    with TestClient(app) as client:
+        client.get("/ping")
+        done = threading.Event()
+        timings = {}
+
+        def upload() -> None:
+            start = time.perf_counter()
+            with open(csv_path, "rb") as f:
+                job = client.post("/api/upload-file", files={"file": ("export.csv", f)}).json()
+            timings["response_seconds"] = time.perf_counter() - start
+            while client.get(f"/api/upload-jobs/{job['job_id']}").json()["state"] not in ("completed", "failed"):
+                time.sleep(0.1)
+            timings["upload_seconds"] = time.perf_counter() - start
+            done.set()
+
+        worker = threading.Thread(target=upload)
+        worker.start()
+        latencies = []
+        while not done.is_set():
+            start = time.perf_counter()
+            client.get("/ping")
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.02)
+        worker.join()
+
+    latencies.sort()
+    print(json.dumps({
+        **timings,
+        "pings": len(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p99_ms": latencies[int(len(latencies) * 0.99)],
+        "max_ms": latencies[-1],
+    }))
+
+
+def measure(csv_path: Path, workers: str) -> dict:
+    """Run one upload in a fresh process with UPLOAD_JOB_WORKERS=workers."""
+    with tempfile.TemporaryDirectory() as scratch:
+        env = dict(os.environ, PYTHONPATH=str(project_root), UPLOAD_JOB_WORKERS=workers)
+        output = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--child", str(csv_path)],
+            cwd=scratch, env=env, check=True, capture_output=True, text=True,
+        ).stdout.strip().splitlines()[-1]
+    return json.loads(output)
+
+
+# =============================== BENCHMARK ===============================
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_upload(args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = Path(work_dir) / "export.csv"
+        build_export(csv_path, args.rows)
+        print(f"Export: {args.rows:,} rows ({csv_path.stat().st_size / (1024 * 1024):.1f} MB CSV)")
+
+        for mode, workers in (("inline", "0"), ("jobs", "2")):
+            result = measure(csv_path, workers)
+            print(
+                f"{mode:<7} upload response: {result['response_seconds']:6.2f}s   "
+                f"done: {result['upload_seconds']:6.2f}s   ping p50/p99/max: "
+                f"{result['p50_ms']:6.1f} / {result['p99_ms']:7.1f} / {result['max_ms']:7.1f} ms "
+                f"({result['pings']} pings)"
+            )
+
+
+if __name__ == "__main__":
+    main()
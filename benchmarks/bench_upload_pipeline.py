@@ -0,0 +1,79 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Upload Pipeline Benchmark - Compares the double-parse and single-parse upload paths.
+
+The old upload flow parsed every file twice (once in generate_schema, once in
+load_file_to_db). The current flow parses once and shares the DataFrames.
+
+Usage:
+    python benchmarks/bench_upload_pipeline.py [--rows 200000] [--sheets 2]
+"""
+
+# =============================== IMPORTS ===============================
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+
+# =============================== WORKBOOK GENERATION ===============================
+def build_workbook(path: Path, rows: int, sheets: int) -> None:
+    """Write a synthetic HR-style workbook with the given size."""
+    rng = np.random.default_rng(42)
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet in range(sheets):
+            df = pd.DataFrame({
+                "Employee ID": np.arange(rows),
+                "Name": [f"Employee {i}" for i in range(rows)],
+                "Department": rng.choice(["HR", "Sales", "IT", "Finance"], rows),
+                "Age": rng.integers(20, 65, rows),
+                "Salary": rng.normal(60000, 15000, rows).round(2),
+                "Joined": pd.Timestamp("2015-01-01") + pd.to_timedelta(rng.integers(0, 3000, rows), unit="D"),
+            })
+            df.to_excel(writer, sheet_name=f"Sheet{sheet + 1}", index=False)
+
+
+# =============================== BENCHMARK ===============================
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--sheets", type=int, default=2)
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_upload_"))
+    os.chdir(work_dir)
+
+    from src.app.utils.schema_generator import generate_schema, read_excel_file
+    from src.app.utils.database_manager import load_file_to_db
+
+    workbook = work_dir / "bench.xlsx"
+    print(f"Building workbook with {args.sheets} sheet(s) x {args.rows} rows in {work_dir} ...")
+    build_workbook(workbook, args.rows, args.sheets)
+    print(f"Workbook size: {workbook.stat().st_size / 1024 / 1024:.1f} MB")
+
+    start = time.perf_counter()
+    generate_schema(str(workbook))
+    load_file_to_db(str(workbook), "bench_double")
+    double_parse = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sheets_data = read_excel_file(str(workbook))
+    generate_schema(str(workbook), sheets_data)
+    load_file_to_db(str(workbook), "bench_single", sheets_data=sheets_data)
+    single_parse = time.perf_counter() - start
+
+    print(f"Double parse (old): {double_parse:.2f}s")
+    print(f"Single parse (new): {single_parse:.2f}s")
+    print(f"Speed-up: {double_parse / single_parse:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
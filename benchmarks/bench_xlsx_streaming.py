@@ -0,0 +1,112 @@
+# =============================== FILE PURPOSE ===============================
+"""
+XLSX Streaming Benchmark - pd.read_excel versus the streaming XLSX reader.
+
+Builds a synthetic workbook, then loads it into a file database once with the
+pandas reader (whole sheet parsed, then inserted) and once with the streaming
+reader (read-only row iteration, inserted batch by batch). Each load runs in
+a fresh process inside a scratch directory, so the reported peak resident
+memory (ru_maxrss) belongs to that load alone.
+
+Usage:
+    python benchmarks/bench_xlsx_streaming.py [--rows 200000] [--columns 10] [--batch-rows 50000]
+"""
+
+# =============================== IMPORTS ===============================
+import argparse
+import datetime
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+
+# =============================== DATA GENERATION ===============================
+def build_workbook(path: Path, rows: int, columns: int) -> None:
+    """Single-sheet workbook cycling through integer, float, text and date columns."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Data")
+    sheet.append([f"col_{i}" for i in range(columns)])
+    start = datetime.datetime(2020, 1, 1)
+    for row in range(rows):
+        values = []
+        for i in range(columns):
+            kind = i % 4
+            if kind == 0:
+                values.append(row * (i + 1))
+            elif kind == 1:
+                values.append(row * 0.25 + i)
+            elif kind == 2:
+                values.append(f"value {row % 1000} of {i}")
+            else:
+                values.append(start + datetime.timedelta(minutes=row))
+        sheet.append(values)
+    workbook.save(path)
+
+
+# =============================== SINGLE LOAD (child process) ===============================
+def run_load(workbook: str, reader: str, batch_rows: int) -> None:
+    """Load the workbook with one reader and print 'seconds peak_mb'."""
+    from src.app.utils.database_manager import load_file_to_db
+    from src.app.utils.schema_generator import generate_schema, read_excel_file
+
+    start = time.perf_counter()
+    if reader == "streaming":
+        schema = generate_schema(workbook, reader="streaming")
+        load_file_to_db(workbook, "bench", chunk_size=batch_rows, file_hash="bench", schema=schema)
+    else:
+        sheets_data = read_excel_file(workbook)
+        schema = generate_schema(workbook, sheets_data=sheets_data)
+        load_file_to_db(workbook, "bench", sheets_data=sheets_data, file_hash="bench", schema=schema)
+    elapsed = time.perf_counter() - start
+    print(f"{elapsed:.3f} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f}")
+
+
+def measure(workbook: Path, reader: str, batch_rows: int) -> tuple:
+    """Run one load in a fresh process and scratch directory; return (seconds, peak MB)."""
+    with tempfile.TemporaryDirectory() as scratch:
+        env = dict(os.environ, PYTHONPATH=str(project_root))
+        output = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--child", reader,
+             "--workbook", str(workbook), "--batch-rows", str(batch_rows)],
+            cwd=scratch, env=env, check=True, capture_output=True, text=True,
+        ).stdout.strip().splitlines()[-1]
+    seconds, peak_mb = output.split()
+    return float(seconds), float(peak_mb)
+
+
+# =============================== BENCHMARK ===============================
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--batch-rows", type=int, default=50_000)
+    parser.add_argument("--child", choices=("pandas", "streaming"), help=argparse.SUPPRESS)
+    parser.add_argument("--workbook", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_load(args.workbook, args.child, args.batch_rows)
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        workbook = Path(work_dir) / "bench.xlsx"
+        build_workbook(workbook, args.rows, args.columns)
+        size_mb = workbook.stat().st_size / (1024 * 1024)
+        print(f"Workbook: {args.rows:,} rows x {args.columns} columns ({size_mb:.1f} MB)")
+
+        for reader in ("pandas", "streaming"):
+            seconds, peak_mb = measure(workbook, reader, args.batch_rows)
+            print(f"{reader:<10} schema + load: {seconds:7.2f}s   peak RSS: {peak_mb:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
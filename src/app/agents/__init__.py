@@ -4,6 +4,7 @@ from .sql_agent import sql_agent
 from .orchestrator_agent import orchestrator_agent
 from .sqlValidatorAndSqlExecutor_agent import sqlValidatorAndSqlExecutor_agent
 from .inputValidationAndSqlGeneration_agent import inputValidationAndSqlGeneration_agent
+from .localSqlExecutor_agent import localSqlExecutor_agent
 
-__all__ = ["greeting_agent", "sql_agent", "orchestrator_agent", "sqlValidatorAndSqlExecutor_agent", "inputValidationAndSqlGeneration_agent"]
+__all__ = ["greeting_agent", "sql_agent", "orchestrator_agent", "sqlValidatorAndSqlExecutor_agent", "inputValidationAndSqlGeneration_agent", "localSqlExecutor_agent"]
     
\ No newline at end of file
@@ -152,6 +152,8 @@ RULES
 - Always include full schema in <<<SCHEMA>>> block
 - Only SELECT queries (no INSERT/UPDATE/DELETE)
 - Use exact table/column names from schema
+- DATETIME columns are stored as ISO-8601 text ('YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS'): compare them with ISO strings (e.g. joined >= '2024-01-01') and use strftime()/date() for parts; BOOLEAN columns hold 0/1
+- Queries may run on SQLite or DuckDB: stick to portable SQL (strftime('%Y', column) for date parts, CAST(... AS INTEGER/REAL), no julianday() or other engine-specific functions)
 - Keep explanations under 5 lines
 - Do NOT execute SQL (just generate it)
 - Do NOT use LIMIT unless the user explicitly requests it (e.g., 'top', 'first', 'limit').
@@ -0,0 +1,3 @@
+from .agent import localSqlExecutor_agent, skip_when_answered_locally
+
+__all__ = ["localSqlExecutor_agent", "skip_when_answered_locally"]
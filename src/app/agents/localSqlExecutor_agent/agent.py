@@ -0,0 +1,152 @@
+"""
+Local SQL Executor Agent - Validates and executes the generated SQL without a model call.
+
+Checking the generated SQL (read-only, known tables and columns) and running
+it is deterministic, so this stage does it in-process instead of asking the
+validator model to: each query is validated with sql_guard and executed with
+the same function as the execute_sql MCP tool. Its calls are emitted as
+execute_sql function call/response events, so the chat endpoint picks up the
+rows exactly as it does for the model's own tool calls.
+
+When every query ran, the stage writes the answer itself and the validator
+model is skipped (skip_when_answered_locally). The model is only invoked when
+an explanation is needed: a query was rejected or failed (it can explain or
+repair it), the generation output had no query, or SQL_LLM_EXPLANATION=always.
+"""
+
+import asyncio
+import json
+import os
+import uuid
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from .prompt import name, description
+from src.app.configs.logger_config import get_logger
+from src.app.mcp.tools import execute_sql_query
+from src.app.utils.response_parser import SINGLE_QUERY_NAME, extract_generated_queries, parse_agent_response
+from src.app.utils.sql_guard import SqlValidationError, validate_select_query
+
+logger = get_logger("Agent-Service-Local-Sql-Executor")
+
+# "on_error": the validator model only runs when a query was rejected or failed; "always": after every query
+SQL_LLM_EXPLANATION = os.getenv("SQL_LLM_EXPLANATION", "on_error").lower()
+
+# Session state key holding this turn's locally written answer (None when the model must answer)
+LOCAL_RESPONSE_KEY = "local_sql_response"
+EXECUTE_SQL_TOOL = "execute_sql"
+
+
+def _describe_result(payload: dict) -> str:
+    """One line on what a query returned."""
+    row_count = payload.get("row_count", 0)
+    if not row_count:
+        return "No matching records were found."
+    noun = "record" if row_count == 1 else "records"
+    if payload.get("has_more"):
+        return f"Found {row_count:,} {noun}; showing the first {payload.get('returned_rows', 0):,}."
+    return f"Found {row_count:,} {noun}."
+
+
+def _format_response(explanation: str, lines: list, error: Optional[str] = None) -> str:
+    """Answer in the validator's delimiter format."""
+    parts = ["<<<EXPLANATION>>>", "\n".join(line for line in [explanation, *lines] if line)]
+    if error:
+        parts += ["<<<ERROR>>>", error]
+    parts.append("<<<END>>>")
+    return "\n".join(parts)
+
+
+def run_generated_sql(generated_sql: str, explain_always: bool = False) -> Dict[str, Any]:
+    """
+    Validate and run the queries of the SQL generation agent's output (blocking).
+
+    Args:
+        generated_sql: Output of the SQL generation agent (state["generated_sql"])
+        explain_always: Leave the answer to the model even when every query ran
+
+    Returns:
+        Dict[str, Any]: {
+            "response": the answer in the validator's format, or None when the
+                        model must answer (a query was rejected or failed, or
+                        no query was found),
+            "executions": (query, execute_sql output JSON) of the queries run, in order
+        }
+    """
+    generated = parse_agent_response(generated_sql)
+    queries = extract_generated_queries(generated_sql)
+    executions: List[Tuple[str, str]] = []
+
+    if "<<<INVALID>>>" in generated_sql:
+        # Nothing to run: pass the generation agent's verdict on
+        response = _format_response(generated["explanation"], [], generated["error"] or "Invalid request")
+        return {"response": response, "executions": executions}
+    if not queries:
+        logger.info("No query found in the generated SQL; handing over to the validator model")
+        return {"response": None, "executions": executions}
+
+    lines = []
+    for query_name, query in queries:
+        try:
+            validate_select_query(query)
+        except SqlValidationError as e:
+            logger.info(f"Query '{query_name}' needs the validator model: {e}")
+            return {"response": None, "executions": executions}
+
+        output = execute_sql_query(query)
+        executions.append((query, output))
+        payload = json.loads(output)
+        if not payload.get("success"):
+            logger.info(f"Query '{query_name}' needs the validator model: {payload.get('error')}")
+            return {"response": None, "executions": executions}
+        summary = _describe_result(payload)
+        lines.append(summary if query_name == SINGLE_QUERY_NAME else f"{query_name}: {summary}")
+
+    if explain_always:
+        return {"response": None, "executions": executions}
+    logger.info(f"Answered {len(queries)} query(ies) locally")
+    return {"response": _format_response(generated["explanation"], lines), "executions": executions}
+
+
+class LocalSqlExecutorAgent(BaseAgent):
+    """Runs the queries in state["generated_sql"] and answers without a model when they succeed."""
+
+    def _event(self, ctx: InvocationContext, **kwargs) -> Event:
+        return Event(invocation_id=ctx.invocation_id, author=self.name, branch=ctx.branch, **kwargs)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        generated_sql = ctx.session.state.get("generated_sql") or ""
+        outcome = await asyncio.to_thread(run_generated_sql, generated_sql, SQL_LLM_EXPLANATION == "always")
+
+        # Report each query as an execute_sql call, like the model's own tool calls
+        for query, output in outcome["executions"]:
+            call_id = f"local-{uuid.uuid4().hex}"
+            yield self._event(ctx, content=types.Content(role="model", parts=[types.Part(
+                function_call=types.FunctionCall(id=call_id, name=EXECUTE_SQL_TOOL, args={"query": query})
+            )]))
+            yield self._event(ctx, content=types.Content(role="user", parts=[types.Part(
+                function_response=types.FunctionResponse(id=call_id, name=EXECUTE_SQL_TOOL, response={"result": output})
+            )]))
+
+        if outcome["response"] is not None:
+            logger.info("Skipping the validator model")
+        yield self._event(ctx, actions=EventActions(state_delta={LOCAL_RESPONSE_KEY: outcome["response"]}))
+
+
+def skip_when_answered_locally(callback_context: CallbackContext) -> Optional[types.Content]:
+    """before_agent_callback of the validator: reuse the local answer instead of calling the model."""
+    response = callback_context.state.get(LOCAL_RESPONSE_KEY)
+    if response:
+        return types.Content(role="model", parts=[types.Part(text=response)])
+    return None
+
+
+localSqlExecutor_agent = LocalSqlExecutorAgent(
+    name=name,
+    description=description,
+)
@@ -0,0 +1,5 @@
+name = "localSqlExecutor_agent"
+
+description = """
+This agent validates the generated SQL against the loaded tables and executes it locally, without a model call.
+"""
@@ -3,6 +3,7 @@ from .prompt import name, description, instruction
 from google.adk.models.lite_llm import LiteLlm
 import os
 from src.app.mcp.server.mcp_toolset import get_mcp_toolset
+from src.app.agents.localSqlExecutor_agent.agent import skip_when_answered_locally
 
 
 mcp_tools=get_mcp_toolset()
@@ -13,5 +14,6 @@ sqlValidatorAndSqlExecutor_agent = LlmAgent(
     description=description,
     instruction=instruction,
     output_key="query_result",  # stored in state['query_result']
-    tools=[mcp_tools]
+    tools=[mcp_tools],
+    before_agent_callback=skip_when_answered_locally  # no model call when the SQL ran locally
 )
\ No newline at end of file
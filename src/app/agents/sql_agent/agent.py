@@ -5,6 +5,7 @@ from .prompt import name, description
 
 # Import sub-agents - must import from .agent module, not from parent package
 from src.app.agents.inputValidationAndSqlGeneration_agent.agent import inputValidationAndSqlGeneration_agent
+from src.app.agents.localSqlExecutor_agent.agent import localSqlExecutor_agent
 from src.app.agents.sqlValidatorAndSqlExecutor_agent.agent import sqlValidatorAndSqlExecutor_agent
 
 
@@ -13,6 +14,7 @@ sql_agent = SequentialAgent(
     description=description,
     sub_agents=[
         inputValidationAndSqlGeneration_agent,
-        sqlValidatorAndSqlExecutor_agent
+        localSqlExecutor_agent,  # validates and runs the SQL locally
+        sqlValidatorAndSqlExecutor_agent  # skipped unless an explanation is needed
     ]
 )
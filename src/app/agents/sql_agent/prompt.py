@@ -2,4 +2,4 @@
 
 name = "sql_agent"
 
-description="Executes sequential SQL pipeline: validation → generation → validation → execution."
\ No newline at end of file
+description="Executes sequential SQL pipeline: validation → generation → local validation and execution → explanation (when needed)."
\ No newline at end of file
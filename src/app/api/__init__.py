@@ -2,5 +2,7 @@
 from .chat import router as chat_router
 from .health import router as health_router
 from .file_manager import router as file_manager_router
+from .results import router as results_router
+from .metrics import router as metrics_router
 
-__all__ = ["chat_router", "health_router", "file_manager_router"]
+__all__ = ["chat_router", "health_router", "file_manager_router", "results_router", "metrics_router"]
@@ -13,7 +13,12 @@ What this file does
 - Verifies required Excel/CSV files are uploaded.
 - Creates or loads a chat session.
 - Sends the message to the orchestrator/agent and waits for the final response.
-- Parses the response into explanation, SQL query, results, and errors.
+- Parses the response into explanation, SQL query, and errors.
+- Takes the query results from the execute_sql tool responses themselves, so
+  the rows reach the UI exactly as the database returned them and the model
+  only writes the explanation.
+- Answers a question asked before from the question cache: its cached SQL is
+  run directly, without any model call.
 - Allows deleting a session safely (idempotent).
 """
 
@@ -23,10 +28,24 @@ from fastapi.responses import JSONResponse
 from typing import Optional
 
 from src.app.configs.logger_config import get_logger
-from src.app.utils.response_parser import parse_agent_response
+from src.app.utils.question_cache import (
+    catalog_fingerprint,
+    discard_cached_sql,
+    lookup_cached_sql,
+    record_cache_hit,
+    record_llm_answer,
+    store_cached_sql,
+)
+from src.app.utils.response_parser import build_query_result, extract_tool_payload, parse_agent_response
 from src.app.services import session_service, runner
+from src.app.agents.localSqlExecutor_agent.agent import LOCAL_RESPONSE_KEY, run_generated_sql
+from src.app.agents.sql_agent.prompt import name as SQL_AGENT_NAME
+from google.adk.events import Event
 from google.genai import types
 import asyncio
+import json
+import time
+import uuid
 
 # =============================== LOGGER ===============================
 logger = get_logger("Chat-Api-Service")
@@ -34,6 +53,40 @@ logger = get_logger("Chat-Api-Service")
 # =============================== ROUTER ===============================
 router = APIRouter(prefix="/api", tags=["chat"])
 
+# =============================== CONSTANTS ===============================
+# MCP tool whose responses are the query results shown to the user
+EXECUTE_SQL_TOOL = "execute_sql"
+
+
+# =============================== QUESTION CACHE ===============================
+async def answer_from_cache(session, user_msg: types.Content, generated_sql: str):
+    """
+    Answer a question by running its cached SQL, without any model call.
+
+    The question and the answer are added to the session, so follow-ups
+    have the same context as after a model answer.
+
+    Returns:
+        Optional[dict]: Parsed answer with its query_result, or None if the
+                        cached SQL no longer runs cleanly
+    """
+    outcome = await asyncio.to_thread(run_generated_sql, generated_sql)
+    if outcome["response"] is None:
+        return None
+
+    invocation_id = f"question-cache-{uuid.uuid4().hex}"
+    await session_service.append_event(session, Event(invocation_id=invocation_id, author="user", content=user_msg))
+    await session_service.append_event(session, Event(
+        invocation_id=invocation_id,
+        author=runner.agent.name,
+        content=types.Content(role="model", parts=[types.Part(text=outcome["response"])])
+    ))
+
+    parsed = parse_agent_response(outcome["response"])
+    executions = [(query, json.loads(output)) for query, output in outcome["executions"]]
+    parsed["query_result"] = build_query_result(executions, generated_sql)
+    return parsed
+
 
 # =============================== CHAT ENDPOINT ===============================
 @router.post("/chat")
@@ -91,10 +144,44 @@ async def chat(
                     session_id=session_id
                 )
 
-        # =============================== SEND MESSAGE TO GENAI ===============================
+        # =============================== QUESTION CACHE ===============================
+        start_time = time.perf_counter()
         user_msg = types.UserContent(message)
+        fingerprint = catalog_fingerprint(FILE_REGISTRY)
+        # Only the first question of a session is self-contained enough to cache,
+        # or to answer from the cache: a follow-up needs the conversation's context
+        fresh_session = not session.events
+
+        cached_sql = lookup_cached_sql(message, fingerprint) if fresh_session else None
+        if cached_sql is not None:
+            parsed = await answer_from_cache(session, user_msg, cached_sql)
+            if parsed is not None:
+                elapsed = time.perf_counter() - start_time
+                record_cache_hit(elapsed)
+                logger.info(f"Answered from the question cache in {elapsed:.3f}s")
+                return {
+                    "status": "success",
+                    "explanation": parsed["explanation"],
+                    "query_result": parsed["query_result"],
+                    "sql_query": parsed["sql_query"],
+                    "error": parsed["error"],
+                    "suggestions": parsed.get("suggestions"),
+                    "structured_response": parsed.get("structured_response"),
+                    "selected_agent": SQL_AGENT_NAME,
+                    "session_id": session_id,
+                    "cached": True
+                }
+            discard_cached_sql(message, fingerprint)
+
+        # =============================== SEND MESSAGE TO GENAI ===============================
         selected_agent = None
         response_text = ""
+        generated_sql = None
+        # Answer written by the local SQL executor (None when the validator model answered)
+        local_response = None
+        # execute_sql call id -> SQL, and (SQL, tool output) in call order
+        sql_calls = {}
+        executions = []
 
         logger.info("Sending message to agent...")
 
@@ -103,9 +190,26 @@ async def chat(
             session_id=session_id,
             new_message=user_msg
         ):
+            for call in event.get_function_calls():
+                if call.name == EXECUTE_SQL_TOOL:
+                    sql_calls[call.id] = (call.args or {}).get("query", "")
+
+            for function_response in event.get_function_responses():
+                if function_response.name == EXECUTE_SQL_TOOL:
+                    payload = extract_tool_payload(function_response.response)
+                    if payload is not None:
+                        executions.append((sql_calls.get(function_response.id, ""), payload))
+
+            if event.actions and event.actions.state_delta:
+                state_delta = event.actions.state_delta
+                if "generated_sql" in state_delta:
+                    generated_sql = state_delta["generated_sql"]
+                if LOCAL_RESPONSE_KEY in state_delta:
+                    local_response = state_delta[LOCAL_RESPONSE_KEY]
+
             if event.is_final_response():
                 if event.content and event.content.parts:
-                    response_text = event.content.parts[0].text
+                    response_text = event.content.parts[0].text or ""
 
             if event.actions and event.actions.transfer_to_agent:
                 selected_agent = event.actions.transfer_to_agent
@@ -118,16 +222,31 @@ async def chat(
         # =============================== PARSE RESPONSE ===============================
         parsed = parse_agent_response(response_text)
 
+        # Rows come from the tool responses; the model's own copy is only a fallback
+        query_result = build_query_result(executions, generated_sql) or parsed["query_result"]
+        if executions:
+            logger.info(f"Attached {len(executions)} execute_sql result(s) from tool responses")
+
+        # Cache self-contained questions the local executor answered itself: when the
+        # validator model ran, it may have repaired the SQL, and generated_sql is the original
+        answered_locally = bool(local_response) and bool(executions) and all(
+            payload.get("success") for _, payload in executions
+        )
+        if fresh_session and generated_sql and answered_locally:
+            store_cached_sql(message, fingerprint, generated_sql)
+            record_llm_answer(time.perf_counter() - start_time)
+
         return {
             "status": "success",
             "explanation": parsed["explanation"],
-            "query_result": parsed["query_result"],
+            "query_result": query_result,
             "sql_query": parsed["sql_query"],
             "error": parsed["error"],
             "suggestions": parsed.get("suggestions"),
             "structured_response": parsed.get("structured_response"),
             "selected_agent": selected_agent,
-            "session_id": session_id
+            "session_id": session_id,
+            "cached": False
         }
 
     except HTTPException:
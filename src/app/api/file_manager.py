@@ -4,34 +4,61 @@ File Manager API Endpoints
 Purpose
 -------
 Provides a clean and minimal interface for uploading, tracking, validating, and deleting Excel/CSV
-files used by the SQL chatbot. It keeps the file registry, metadata, and database tables in sync.
+files (also gzipped CSV, zip archives of CSVs, Parquet and JSON Lines) used by the SQL chatbot. It keeps the file registry, metadata, and database tables in sync.
 
 Core responsibilities
 ---------------------
-- Upload files → generate schema → load into DB → store metadata.
+- Upload files → parse once → generate schema → load into DB → store metadata,
+  as background jobs whose progress can be polled.
+- Optionally ingest only selected sheets/columns; list a file's sheets cheaply
+  and load further sheets of an uploaded workbook later.
+- Append delta files to loaded tables (new rows only, profile updated incrementally).
+  Sheet loads and appends run as background jobs too, one at a time per file.
 - Return status and detailed info about uploaded files.
 - Delete a single file or clear all files safely.
-- Reconstruct registry and rebuild database on startup.
+- Reconstruct registry and incrementally rebuild the database on startup.
 """
 
 # =============================== IMPORTS ===============================
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from fastapi.responses import JSONResponse
 from pathlib import Path
 import uuid
 import json
-from typing import Optional, Dict, List
+import shutil
+import threading
+import time
+from typing import Any, Optional, Dict, List, Set, Tuple
 import re
 
 from src.app.configs.logger_config import get_logger
-from src.app.utils.schema_generator import generate_schema, generate_schema_summary
+from src.app.utils.schema_generator import (
+    generate_schema,
+    generate_schema_summary,
+    build_schema,
+    list_sheets,
+    get_schema_selection,
+    get_schema_sheet_count,
+    is_streamed_schema,
+)
+from src.app.utils.xlsx_stream import resolve_xlsx_reader, should_stream_xlsx
+from src.app.utils.file_formats import SUPPORTED_EXTENSIONS, get_file_extension, get_file_stem
+from src.app.utils.memory_usage import PeakMemoryTracker
+from src.app.utils.parallel_ingest import read_and_profile, read_sheets
 from src.app.utils.database_manager import (
+    CSV_CHUNK_SIZE,
     load_file_to_db,
+    should_stream_csv,
     remove_table_from_db,
     rebuild_database,
     compute_file_hash,
-    get_all_table_names
+    get_physical_table_name
 )
+from src.app.utils.index_advisor import apply_schema_indexes, sweep_idle_indexes
+from src.app.utils.sidecar_cache import write_sidecar, remove_sidecar, prune_sidecars
+from src.app.utils.table_append import append_delta, read_delta, remove_table_sketches, replay_deltas
+from src.app.utils.upload_jobs import UploadJob, get_upload_job, submit_upload_job
+from src.app.utils.question_cache import invalidate_question_cache
 
 # =============================== LOGGER ===============================
 logger = get_logger("File-Manager-Api-Service")
@@ -43,6 +70,8 @@ router = APIRouter(prefix="/api", tags=["file-manager"])
 UPLOAD_DIR = Path("uploads")
 SCHEMA_DIR = Path("schemas")
 METADATA_DIR = Path("metadata")
+# Delta files appended to an upload: uploads/deltas/<file_id>/
+DELTA_DIR = UPLOAD_DIR / "deltas"
 
 UPLOAD_DIR.mkdir(exist_ok=True)
 SCHEMA_DIR.mkdir(exist_ok=True)
@@ -57,11 +86,19 @@ MAX_FILES = 10  # Maximum number of files allowed
 
 # =============================== GLOBAL STATE - FILE REGISTRY ===============================
 FILE_REGISTRY: Dict[str, Dict] = {}
+# Uploads still being processed by a job: file_id -> {"filename", "table_name", "file_hash"}.
+# Changes to both go through REGISTRY_LOCK, so concurrent uploads cannot exceed
+# MAX_FILES, share a table name or both pass the duplicate check.
+PENDING_UPLOADS: Dict[str, Dict[str, Optional[str]]] = {}
+# Registered files with a sheet-load or append job running; another such job or
+# a delete of the same file is refused (409) until it finishes
+BUSY_FILES: Set[str] = set()
+REGISTRY_LOCK = threading.Lock()
 
 # =============================== HELPER FUNCTIONS ===============================
 def derive_table_name(filename: str, existing_names: List[str]) -> str:
     """Derive a SQL-safe table name from filename."""
-    base_name = Path(filename).stem
+    base_name = get_file_stem(filename)
     table_name = re.sub(r'[^a-zA-Z0-9_]', '_', base_name)
     table_name = re.sub(r'_+', '_', table_name).strip('_').lower()
 
@@ -79,15 +116,137 @@ def derive_table_name(filename: str, existing_names: List[str]) -> str:
 
 
 def check_duplicate_content(file_hash: str) -> Optional[str]:
-    """Return filename if duplicate content exists."""
+    """Return filename if duplicate content exists (uploaded or being uploaded)."""
     for file_id, info in FILE_REGISTRY.items():
         if info.get("file_hash") == file_hash:
             return info.get("original_filename")
+    for pending in PENDING_UPLOADS.values():
+        if pending.get("file_hash") == file_hash:
+            return pending.get("filename")
     return None
 
+def _parse_json_field(value: Optional[str], field: str) -> Any:
+    """Decode a JSON-encoded form field."""
+    if value is None or not value.strip():
+        return None
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail=f"'{field}' must be valid JSON")
+
+
+def parse_sheet_selection(
+    file_path: Path,
+    sheets: Optional[str],
+    columns: Optional[str]
+) -> Tuple[Optional[List[str]], Optional[Dict[str, List[str]]]]:
+    """
+    Validate the sheet/column selection of a request against the file.
+
+    Args:
+        file_path: Uploaded file
+        sheets: JSON list of sheet names (or a comma-separated list); None selects all
+        columns: JSON object mapping sheet names to column names (a plain list
+                 applies to a CSV file); None selects all columns
+
+    Returns:
+        Tuple[Optional[List[str]], Optional[Dict[str, List[str]]]]: (sheets, columns)
+    """
+    if sheets is None and columns is None:
+        return None, None
+
+    available = {sheet["name"]: sheet["columns"] for sheet in list_sheets(str(file_path))}
+
+    selected_sheets = None
+    if sheets is not None and sheets.strip():
+        if sheets.strip().startswith("["):
+            selected_sheets = [str(name) for name in _parse_json_field(sheets, "sheets")]
+        else:
+            selected_sheets = [name.strip() for name in sheets.split(",") if name.strip()]
+        if not selected_sheets:
+            raise HTTPException(status_code=400, detail="Select at least one sheet")
+        unknown = [name for name in selected_sheets if name not in available]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown sheet(s): {', '.join(unknown)}")
+        selected_sheets = list(dict.fromkeys(selected_sheets))
+
+    selected_columns = _parse_json_field(columns, "columns")
+    if isinstance(selected_columns, list):
+        selected_columns = {"Sheet1": selected_columns}
+    if selected_columns is not None:
+        if not isinstance(selected_columns, dict):
+            raise HTTPException(status_code=400, detail="'columns' must map sheet names to column lists")
+        for name, names in selected_columns.items():
+            if name not in available:
+                raise HTTPException(status_code=400, detail=f"Unknown sheet in 'columns': {name}")
+            unknown = [col for col in names if col not in available[name]]
+            if unknown or not names:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown or empty column selection for sheet '{name}': {', '.join(unknown)}"
+                )
+        if selected_sheets is not None:
+            selected_columns = {name: cols for name, cols in selected_columns.items() if name in selected_sheets}
+        selected_columns = {name: list(dict.fromkeys(cols)) for name, cols in selected_columns.items()} or None
+
+    return selected_sheets, selected_columns
+
+
+def validate_file_extension(filename: str) -> str:
+    """Extension of an uploaded file name (e.g. ".csv.gz"); 400 for unsupported types."""
+    file_ext = get_file_extension(filename or "")
+    if file_ext not in SUPPORTED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed types: {', '.join(SUPPORTED_EXTENSIONS)}"
+        )
+    return file_ext
+
+
+def parse_name_list(value: Optional[str], field: str) -> Optional[List[str]]:
+    """Decode a form field holding a JSON list or a comma-separated list of names."""
+    if value is None or not value.strip():
+        return None
+    if value.strip().startswith("["):
+        names = _parse_json_field(value, field)
+        if not isinstance(names, list):
+            raise HTTPException(status_code=400, detail=f"'{field}' must be a list")
+        names = [str(name) for name in names]
+    else:
+        names = [name.strip() for name in value.split(",") if name.strip()]
+    return list(dict.fromkeys(names)) or None
+
+
+def reserve_file(file_id: str) -> Dict:
+    """Mark a registered file busy for one job; 404 if unknown, 409 if a job is already running."""
+    with REGISTRY_LOCK:
+        if file_id not in FILE_REGISTRY:
+            raise HTTPException(status_code=404, detail=f"File ID '{file_id}' not found")
+        if file_id in BUSY_FILES:
+            raise HTTPException(
+                status_code=409,
+                detail=f"File ID '{file_id}' is being updated; wait for its job to finish"
+            )
+        BUSY_FILES.add(file_id)
+        return FILE_REGISTRY[file_id]
+
+
+def release_file(file_id: str) -> None:
+    """Drop the busy mark set by reserve_file."""
+    with REGISTRY_LOCK:
+        BUSY_FILES.discard(file_id)
+
+
+def write_json_atomic(path: Path, data: Dict) -> None:
+    """Write a JSON file through a temporary file, so readers never see it half-written."""
+    temp_path = path.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    temp_path.replace(path)
+
 # =============================== STARTUP CHECK ===============================
 def check_files_on_startup():
-    """Reconstruct registry + rebuild DB if files exist on disk."""
+    """Reconstruct registry + bring the DB in sync, reloading only new or changed files."""
     global FILE_REGISTRY
 
     logger.info("Checking for uploaded files on startup...")
@@ -100,7 +259,7 @@ def check_files_on_startup():
     logger.info(f"Found {len(files)} file(s). Rebuilding file registry...")
 
     for file_path in files:
-        file_id = file_path.stem
+        file_id = get_file_stem(file_path)
         metadata_file = METADATA_DIR / f"{file_id}.json"
 
         if not metadata_file.exists():
@@ -124,7 +283,8 @@ def check_files_on_startup():
                 "file_path": str(file_path),
                 "file_hash": metadata.get("file_hash", ""),
                 "schema": schema,
-                "uploaded_at": metadata.get("uploaded_at")
+                "uploaded_at": metadata.get("uploaded_at"),
+                "deltas": metadata.get("deltas", [])
             }
 
             logger.info(
@@ -135,10 +295,15 @@ def check_files_on_startup():
         except Exception as e:
             logger.error(f"Failed to load metadata for {file_id}: {e}", exc_info=True)
 
+    prune_sidecars(info["file_hash"] for info in FILE_REGISTRY.values())
+
     if FILE_REGISTRY:
         try:
-            logger.info(f"Rebuilding database with {len(FILE_REGISTRY)} file(s)...")
+            logger.info(f"Syncing database with {len(FILE_REGISTRY)} file(s)...")
             rebuild_database(FILE_REGISTRY)
+            for info in FILE_REGISTRY.values():
+                apply_schema_indexes(info["table_name"], info.get("schema"))
+            sweep_idle_indexes()
             logger.info("Database rebuild complete.")
         except Exception as e:
             logger.error(f"Failed to rebuild database: {e}", exc_info=True)
@@ -146,118 +311,217 @@ def check_files_on_startup():
     logger.info(f"Startup completed with {len(FILE_REGISTRY)} file(s) in registry.")
 
 # =============================== 1. FILE UPLOAD ===============================
-@router.post("/upload-file")
-async def upload_file(file: UploadFile = File(...)):
-    """Upload an Excel/CSV file → generate schema → load to DB → update registry."""
+@router.post("/upload-file", status_code=202)
+async def upload_file(
+    file: UploadFile = File(...),
+    sheets: Optional[str] = Form(None),
+    columns: Optional[str] = Form(None),
+    xlsx_reader: Optional[str] = Form(None)
+):
+    """
+    Upload a data file → generate schema → load to DB → update registry.
+
+    Accepted types: .xlsx, .xls, .csv, .csv.gz, .zip (one table per CSV
+    member), .parquet and .jsonl. Compressed files are kept compressed in
+    uploads/ and decompressed as a stream while parsing.
+
+    Optional form fields restrict ingestion: `sheets` (JSON list of sheet
+    names) and `columns` (JSON object: sheet name -> column names). Other
+    sheets can be loaded later with POST /api/file/{file_id}/sheets.
+    `xlsx_reader` ("pandas", "streaming" or "auto") picks how an .xlsx file
+    is read; the streaming reader keeps memory flat for large workbooks.
+
+    The file is saved and processed by a background job, so the event loop
+    stays free for other requests. The response (202) carries the job_id to
+    poll at GET /api/upload-jobs/{job_id}; the finished job holds the upload
+    result (file_id, table_name, schema, ...).
+    """
     logger.info(f"Upload request received for file: {file.filename}")
 
+    # Validate extension (compressed and columnar files are stored as sent)
+    file_ext = validate_file_extension(file.filename)
+
     try:
-        # File limit check
-        if len(FILE_REGISTRY) >= MAX_FILES:
+        xlsx_reader = resolve_xlsx_reader(xlsx_reader)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # File limit check and table name, counting uploads still being processed
+    file_id = str(uuid.uuid4())
+    with REGISTRY_LOCK:
+        if len(FILE_REGISTRY) + len(PENDING_UPLOADS) >= MAX_FILES:
             raise HTTPException(
                 status_code=400,
                 detail=f"Maximum {MAX_FILES} files allowed. Please delete some files first."
             )
+        existing = [info["table_name"] for info in FILE_REGISTRY.values()]
+        existing += [pending["table_name"] for pending in PENDING_UPLOADS.values()]
+        table_name = derive_table_name(file.filename, existing)
+        PENDING_UPLOADS[file_id] = {"filename": file.filename, "table_name": table_name, "file_hash": None}
 
-        # Validate extension
-        allowed_ext = {".xlsx", ".xls", ".csv"}
-        file_ext = Path(file.filename).suffix.lower()
-
-        if file_ext not in allowed_ext:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type. Allowed types: {', '.join(allowed_ext)}"
-            )
-
-        # Save temp
-        file_id = str(uuid.uuid4())
-        file_path = UPLOAD_DIR / f"{file_id}{file_ext}"
-
+    # Save temp
+    file_path = UPLOAD_DIR / f"{file_id}{file_ext}"
+    try:
         with open(file_path, "wb") as f:
             while chunk := await file.read(8192):
                 f.write(chunk)
+    except Exception as e:
+        release_upload(file_id, file_path)
+        raise HTTPException(status_code=500, detail=f"Upload failed: {e}")
 
-        # Duplicate detection
-        file_hash = compute_file_hash(str(file_path))
+    job = submit_upload_job(
+        file_id,
+        file.filename,
+        lambda job: process_upload(
+            job, file_id, file_path, file.filename, table_name, sheets, columns, xlsx_reader
+        ),
+        cleanup=lambda: release_upload(file_id, file_path)
+    )
+    return {"status": "accepted", **job.to_dict()}
+
+
+def release_upload(file_id: str, file_path: Path) -> None:
+    """Drop an upload's reservation; remove its files unless it was registered."""
+    with REGISTRY_LOCK:
+        PENDING_UPLOADS.pop(file_id, None)
+        if file_id in FILE_REGISTRY:
+            return
+    for path in (file_path, SCHEMA_DIR / f"{file_id}.json", METADATA_DIR / f"{file_id}.json"):
+        path.unlink(missing_ok=True)
+
+
+def process_upload(
+    job: UploadJob,
+    file_id: str,
+    file_path: Path,
+    filename: str,
+    table_name: str,
+    sheets: Optional[str],
+    columns: Optional[str],
+    xlsx_reader: str
+) -> Dict[str, Any]:
+    """Upload job: hash, profile and load a saved upload, then register it."""
+    # Duplicate detection
+    job.set_stage("hashing")
+    file_hash = compute_file_hash(str(file_path), progress=job.set_progress)
+    with REGISTRY_LOCK:
         dup = check_duplicate_content(file_hash)
-        if dup:
-            file_path.unlink()
-            raise HTTPException(
-                status_code=400,
-                detail=f"This file content already exists as '{dup}'."
-            )
-
-        # Table name
-        existing = [info["table_name"] for info in FILE_REGISTRY.values()]
-        table_name = derive_table_name(file.filename, existing)
-
-        # Schema generation
-        schema = generate_schema(str(file_path))
-        schema_summary = generate_schema_summary(schema)
+        if not dup:
+            PENDING_UPLOADS[file_id]["file_hash"] = file_hash
+    if dup:
+        raise HTTPException(
+            status_code=400,
+            detail=f"This file content already exists as '{dup}'."
+        )
+
+    # Sheet / column selection
+    job.set_stage("profiling")
+    selected_sheets, selected_columns = parse_sheet_selection(file_path, sheets, columns)
+
+    # Peak memory of parsing, profiling and loading (reported in the response)
+    memory_tracker = PeakMemoryTracker(f"upload of {filename}").start()
+
+    # Parse once: the same DataFrames feed the schema profile and the DB load.
+    # Workbook sheets are parsed and profiled in parallel worker processes;
+    # large CSVs and workbooks are left to the streaming loaders instead of being
+    # materialized (and profiled chunk by chunk). Content profiled before (same
+    # hash) takes its schema from the cache.
+    stream_csv = should_stream_csv(str(file_path))
+    if stream_csv or should_stream_xlsx(str(file_path), xlsx_reader):
+        sheets_data = None
+        schema = generate_schema(
+            str(file_path), file_hash=file_hash, sheets=selected_sheets,
+            columns=selected_columns, reader=xlsx_reader,
+            csv_chunk_rows=CSV_CHUNK_SIZE if stream_csv else None
+        )
+    else:
+        sheets_data, schema = read_and_profile(str(file_path), file_hash, selected_sheets, selected_columns)
+    schema_summary = generate_schema_summary(schema)
+
+
+    if schema_summary:
+        logger.info(f"Schema summary created succesfuly for uploaded file {filename}")
+    else:
+        logger.error(f"Failed to generate schema summary for uploaded file {filename}")
+        raise HTTPException(status_code=500, detail="Failed to generate schema summary")
+
+
+    write_json_atomic(SCHEMA_DIR / f"{file_id}.json", schema)
+
+    # Metadata save
+    metadata = {
+        "original_filename": filename,
+        "file_id": file_id,
+        "table_name": table_name,
+        "file_hash": file_hash,
+        "uploaded_at": str(file_path.stat().st_mtime)
+    }
+    write_json_atomic(METADATA_DIR / f"{file_id}.json", metadata)
 
+    # Load to DB
+    job.set_stage("loading")
+    try:
+        load_file_to_db(
+            str(file_path), table_name, sheets_data=sheets_data, file_hash=file_hash,
+            schema=schema, progress=job.set_progress
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load file: {e}")
 
-        if schema_summary:
-            logger.info(f"Schema summary created succesfuly for uploaded file {file.filename}")
-        else:
-            logger.error(f"Failed to generate schema summary for uploaded file {file.filename}")
-            raise HTTPException(status_code=500, detail="Failed to generate schema summary")
-            
-
-        temp_schema_file = SCHEMA_DIR / f"{file_id}.tmp"
-        with open(temp_schema_file, "w", encoding="utf-8") as f:
-            json.dump(schema, f, indent=2)
-        schema_file = SCHEMA_DIR / f"{file_id}.json"
-        temp_schema_file.replace(schema_file)
-
-        # Metadata save
-        metadata = {
-            "original_filename": file.filename,
-            "file_id": file_id,
-            "table_name": table_name,
-            "file_hash": file_hash,
-            "uploaded_at": str(file_path.stat().st_mtime)
-        }
-        temp_metadata_file = METADATA_DIR / f"{file_id}.tmp"
-        with open(temp_metadata_file, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2)
-        metadata_file = METADATA_DIR / f"{file_id}.json"
-        temp_metadata_file.replace(metadata_file)
+    # Index key-like columns so point lookups do not scan the table
+    job.set_stage("finalizing")
+    apply_schema_indexes(table_name, schema)
 
-        # Load to DB
-        try:
-            row_count, col_count = load_file_to_db(str(file_path), table_name)
-        except Exception as e:
-            file_path.unlink()
-            schema_file.unlink()
-            metadata_file.unlink()
-            raise HTTPException(status_code=500, detail=f"Failed to load file: {e}")
+    # Keep a columnar copy so rebuilds never have to re-parse the upload
+    # (Parquet uploads are columnar already)
+    if sheets_data is not None and get_file_extension(file_path) != ".parquet":
+        write_sidecar(file_hash, sheets_data)
+    sheets_data = None  # free the parsed sheets before building the response
+    memory_usage = memory_tracker.stop()
 
-        # Update registry
+    # Update registry
+    with REGISTRY_LOCK:
         FILE_REGISTRY[file_id] = {
             "file_id": file_id,
-            "original_filename": file.filename,
+            "original_filename": filename,
             "table_name": table_name,
             "file_path": str(file_path),
             "file_hash": file_hash,
             "schema": schema,
-            "uploaded_at": metadata["uploaded_at"]
+            "uploaded_at": metadata["uploaded_at"],
+            "deltas": []
         }
+        total_files = len(FILE_REGISTRY)
+    invalidate_question_cache(f"uploaded {filename}")
 
-        return {
-            "status": "success",
-            "file_id": file_id,
-            "filename": file.filename,
-            "table_name": table_name,
-            "schema": schema,
-            "schema_summary": schema_summary,
-            "total_files": len(FILE_REGISTRY),
-            "max_files": MAX_FILES
-        }
+    return {
+        "status": "success",
+        "file_id": file_id,
+        "filename": filename,
+        "table_name": table_name,
+        "schema": schema,
+        "schema_summary": schema_summary,
+        "available_sheets": schema.get("available_sheets", []),
+        "memory_usage": memory_usage,
+        "total_files": total_files,
+        "max_files": MAX_FILES
+    }
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Upload failed: {e}")
+
+@router.get("/upload-jobs/{job_id}")
+async def upload_job_status(job_id: str):
+    """
+    Progress of a background upload, sheet load or append.
+
+    `state` is queued, running, completed or failed; `stage` (hashing,
+    profiling, loading, finalizing) and `percent` show how far it got. A
+    completed job carries the upload response in `result`, a failed one the
+    `error` and the `status_code` the upload would have returned.
+    """
+    job = get_upload_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Upload job '{job_id}' not found")
+    return {"status": "success", **job.to_dict()}
 
 # =============================== 2. FILE STATUS ===============================
 @router.get("/file-status")
@@ -296,17 +560,320 @@ async def file_status():
     }
 
 
-# =============================== 4. DELETE A SINGLE FILE ===============================
+# =============================== 3. INSPECT / LAZY-LOAD SHEETS ===============================
+@router.post("/inspect-file")
+async def inspect_file(file: UploadFile = File(...)):
+    """
+    List the sheets and columns of a file without ingesting it.
+
+    Only header rows are read; use the result to pick `sheets` / `columns`
+    for the upload.
+    """
+    file_ext = validate_file_extension(file.filename)
+    temp_path = UPLOAD_DIR / f".inspect-{uuid.uuid4()}{file_ext}"
+    try:
+        with open(temp_path, "wb") as f:
+            while chunk := await file.read(8192):
+                f.write(chunk)
+        return {"status": "success", "filename": file.filename, "sheets": list_sheets(str(temp_path))}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to read file: {e}")
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+@router.get("/file/{file_id}/sheets")
+async def get_file_sheets(file_id: str):
+    """List every sheet of an uploaded file with its columns and whether it is loaded."""
+    if file_id not in FILE_REGISTRY:
+        raise HTTPException(status_code=404, detail=f"File ID '{file_id}' not found")
+
+    info = FILE_REGISTRY[file_id]
+    schema = info.get("schema") or {}
+    loaded = {str(table["name"]): table for table in schema.get("tables", [])}
+    selected_columns = schema.get("selected_columns") or {}
+    sheet_count = get_schema_sheet_count(schema, len(loaded))
+
+    sheets = []
+    for sheet in list_sheets(info["file_path"]):
+        table = loaded.get(sheet["name"])
+        sheets.append({
+            "name": sheet["name"],
+            "columns": sheet["columns"],
+            "loaded": table is not None,
+            "table_name": get_physical_table_name(info["table_name"], sheet["name"], sheet_count) if table else None,
+            "loaded_columns": selected_columns.get(sheet["name"], sheet["columns"]) if table else [],
+            "row_count": table.get("row_count") if table else None,
+        })
+
+    return {"status": "success", "file_id": file_id, "sheets": sheets}
+
+
+@router.post("/file/{file_id}/sheets", status_code=202)
+async def load_file_sheets(
+    file_id: str,
+    sheets: str = Form(...),
+    columns: Optional[str] = Form(None)
+):
+    """
+    Load more sheets of an uploaded workbook.
+
+    `sheets` (JSON list) names the sheets to add and `columns` optionally
+    projects them. Only the new sheets are parsed and profiled; sheets already
+    loaded keep their tables, names and column selection.
+
+    Like an upload, the sheets are loaded by a background job: the response
+    (202) carries the job_id to poll at GET /api/upload-jobs/{job_id}.
+    """
+    info = reserve_file(file_id)
+    job = submit_upload_job(
+        file_id,
+        info["original_filename"],
+        lambda job: process_sheet_load(job, file_id, sheets, columns),
+        cleanup=lambda: release_file(file_id)
+    )
+    return {"status": "accepted", **job.to_dict()}
+
+
+def process_sheet_load(job: UploadJob, file_id: str, sheets: str, columns: Optional[str]) -> Dict[str, Any]:
+    """Sheet-load job: profile the added sheets and rebuild the file's database."""
+    info = FILE_REGISTRY[file_id]
+    file_path = Path(info["file_path"])
+    schema = info.get("schema") or {}
+    loaded_sheets, loaded_columns = get_schema_selection(schema)
+    loaded_sheets = loaded_sheets or [str(table["name"]) for table in schema.get("tables", [])]
+
+    job.set_stage("profiling")
+    new_sheets, new_columns = parse_sheet_selection(file_path, sheets, columns)
+    new_sheets = [name for name in (new_sheets or []) if name not in loaded_sheets]
+    if not new_sheets:
+        return {"status": "success", "message": "Sheets already loaded", "file_id": file_id, "schema": schema}
+
+    streamed = is_streamed_schema(schema)
+    try:
+        # Profile only the added sheets; loaded sheets keep their profiles
+        if streamed:
+            added_data = None
+            added_schema = generate_schema(str(file_path), sheets=new_sheets, columns=new_columns, reader="streaming")
+        else:
+            added_data, added_schema = read_and_profile(str(file_path), None, new_sheets, new_columns)
+        available = {sheet: None for sheet in schema.get("available_sheets") or []}
+        available.update({sheet: None for sheet in added_schema["available_sheets"]})
+        selection = dict(loaded_columns or {})
+        selection.update(new_columns or {})
+        new_schema = build_schema(
+            str(file_path),
+            schema.get("tables", []) + added_schema["tables"],
+            list(available),
+            selection or None,
+            streamed
+        )
+
+        # Rebuild the file's database: loaded sheets come from the sidecar, added ones were
+        # just parsed (streamed workbooks are streamed again instead)
+        job.set_stage("loading")
+        sheets_data = None
+        if not streamed:
+            sheets_data = read_sheets(str(file_path), info.get("file_hash"), loaded_sheets, loaded_columns)
+            sheets_data.update(added_data)
+        load_file_to_db(
+            str(file_path), info["table_name"], sheets_data=sheets_data,
+            file_hash=info.get("file_hash") or None, schema=new_schema, progress=job.set_progress
+        )
+        # The rebuilt tables come from the upload alone
+        replay_deltas({**info, "schema": new_schema})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load sheets: {e}")
+
+    job.set_stage("finalizing")
+    apply_schema_indexes(info["table_name"], new_schema)
+    remove_sidecar(info.get("file_hash"))
+    if sheets_data is not None and get_file_extension(file_path) != ".parquet":
+        write_sidecar(info.get("file_hash"), sheets_data)
+
+    write_json_atomic(SCHEMA_DIR / f"{file_id}.json", new_schema)
+    info["schema"] = new_schema
+    invalidate_question_cache(f"loaded sheets of {info['original_filename']}")
+
+    return {
+        "status": "success",
+        "file_id": file_id,
+        "loaded_sheets": new_sheets,
+        "schema": new_schema,
+        "schema_summary": generate_schema_summary(new_schema)
+    }
+
+
+# =============================== 4. APPEND ROWS ===============================
+@router.post("/file/{file_id}/append", status_code=202)
+async def append_file_rows(
+    file_id: str,
+    file: UploadFile = File(...),
+    sheet: Optional[str] = Form(None),
+    key_columns: Optional[str] = Form(None)
+):
+    """
+    Append the rows of a delta file to a loaded table.
+
+    The delta must have the same columns as the target sheet (`sheet`,
+    optional for single-sheet uploads) with compatible values. Rows whose
+    `key_columns` (JSON or comma-separated list; default: the sheet's
+    potential primary key, if any) are already loaded are skipped; the
+    others are inserted into the existing table and the sheet's profile is
+    updated from them alone, so the cost follows the size of the delta.
+
+    The delta is saved and appended by a background job: the response (202)
+    carries the job_id to poll at GET /api/upload-jobs/{job_id}.
+    """
+    if file_id not in FILE_REGISTRY:
+        raise HTTPException(status_code=404, detail=f"File ID '{file_id}' not found")
+
+    info = FILE_REGISTRY[file_id]
+    schema = info.get("schema") or {}
+    tables = {str(table["name"]): table for table in schema.get("tables", [])}
+    if sheet is None and len(tables) == 1:
+        sheet = next(iter(tables))
+    if sheet not in tables:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Choose a loaded sheet to append to: {', '.join(tables)}"
+        )
+    if is_streamed_schema(schema):
+        raise HTTPException(status_code=400, detail="Appending to a streamed workbook is not supported")
+
+    table_columns = [col["name"] for col in tables[sheet]["columns"]]
+    keys = parse_name_list(key_columns, "key_columns")
+    if keys is None:
+        keys = [col["name"] for col in tables[sheet]["columns"] if col.get("is_potential_primary_key")][:1] or None
+    unknown = [col for col in keys or [] if col not in table_columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown key column(s): {', '.join(unknown)}")
+
+    file_ext = validate_file_extension(file.filename)
+    reserve_file(file_id)
+    delta_dir = DELTA_DIR / file_id
+    delta_path = delta_dir / f"{len(info.get('deltas') or []) + 1:04d}-{uuid.uuid4().hex[:8]}{file_ext}"
+    try:
+        delta_dir.mkdir(parents=True, exist_ok=True)
+        with open(delta_path, "wb") as f:
+            while chunk := await file.read(8192):
+                f.write(chunk)
+    except Exception as e:
+        release_delta(file_id, delta_path)
+        raise HTTPException(status_code=500, detail=f"Upload failed: {e}")
+
+    job = submit_upload_job(
+        file_id,
+        file.filename,
+        lambda job: process_append(job, file_id, delta_path, file.filename, sheet, keys),
+        cleanup=lambda: release_delta(file_id, delta_path)
+    )
+    return {"status": "accepted", **job.to_dict()}
+
+
+def release_delta(file_id: str, delta_path: Path) -> None:
+    """Drop an append's busy mark; remove its delta file unless it was recorded."""
+    info = FILE_REGISTRY.get(file_id) or {}
+    if not any(delta.get("file_path") == str(delta_path) for delta in info.get("deltas") or []):
+        delta_path.unlink(missing_ok=True)
+    release_file(file_id)
+
+
+def process_append(
+    job: UploadJob,
+    file_id: str,
+    delta_path: Path,
+    filename: str,
+    sheet: str,
+    keys: Optional[List[str]]
+) -> Dict[str, Any]:
+    """Append job: hash, read and append a saved delta file, then record it."""
+    info = FILE_REGISTRY[file_id]
+    schema = info.get("schema") or {}
+    deltas = list(info.get("deltas") or [])
+
+    job.set_stage("hashing")
+    delta_hash = compute_file_hash(str(delta_path), progress=job.set_progress)
+    if delta_hash == info.get("file_hash") or any(delta.get("file_hash") == delta_hash for delta in deltas):
+        raise HTTPException(status_code=400, detail="This delta has already been appended to the file")
+
+    start_time = time.perf_counter()
+    try:
+        job.set_stage("profiling")
+        rows = read_delta(str(delta_path), sheet)
+        rows_received = len(rows)
+        job.set_stage("loading")
+        new_table, rows_appended = append_delta(file_id, info["table_name"], schema, sheet, rows, keys)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Cannot append delta: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to append delta: {e}")
+
+    job.set_stage("finalizing")
+    new_schema = build_schema(
+        info["file_path"],
+        [new_table if str(table["name"]) == sheet else table for table in schema.get("tables", [])],
+        schema.get("available_sheets"),
+        schema.get("selected_columns"),
+    )
+    deltas.append({
+        "original_filename": filename,
+        "file_path": str(delta_path),
+        "file_hash": delta_hash,
+        "sheet": sheet,
+        "key_columns": keys,
+        "rows_received": rows_received,
+        "rows_appended": rows_appended,
+        "appended_at": str(time.time()),
+    })
+
+    metadata_file = METADATA_DIR / f"{file_id}.json"
+    with open(metadata_file, "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+    metadata["deltas"] = deltas
+    write_json_atomic(metadata_file, metadata)
+    write_json_atomic(SCHEMA_DIR / f"{file_id}.json", new_schema)
+    info["schema"] = new_schema
+    info["deltas"] = deltas
+
+    logger.info(
+        f"Appended {rows_appended}/{rows_received} row(s) of {filename} to "
+        f"'{info['table_name']}' sheet '{sheet}' in {time.perf_counter() - start_time:.2f}s"
+    )
+    return {
+        "status": "success",
+        "file_id": file_id,
+        "table_name": info["table_name"],
+        "sheet": sheet,
+        "key_columns": keys,
+        "rows_received": rows_received,
+        "rows_appended": rows_appended,
+        "rows_skipped": rows_received - rows_appended,
+        "total_rows": new_table["row_count"],
+        "schema": new_schema,
+        "schema_summary": generate_schema_summary(new_schema)
+    }
+
+
+# =============================== 5. DELETE A SINGLE FILE ===============================
 @router.delete("/file/{file_id}")
 async def delete_file(file_id: str):
     """Delete a file and clean DB, metadata, schema, registry."""
     
     logger.info(f"File deletion request received for ID: {file_id}")
 
-    if file_id not in FILE_REGISTRY:
-        raise HTTPException(status_code=404, detail=f"File ID '{file_id}' not found")
-
-    data = FILE_REGISTRY[file_id]
+    # Unregistered in the same step as the busy check, so no job can start on it
+    with REGISTRY_LOCK:
+        if file_id not in FILE_REGISTRY:
+            raise HTTPException(status_code=404, detail=f"File ID '{file_id}' not found")
+        if file_id in BUSY_FILES:
+            raise HTTPException(
+                status_code=409,
+                detail=f"File ID '{file_id}' is being updated; delete it once its job has finished"
+            )
+        data = FILE_REGISTRY.pop(file_id)
     table_name = data["table_name"]
 
     # DB cleanup
@@ -324,11 +891,15 @@ async def delete_file(file_id: str):
     if schema_file.exists():
         schema_file.unlink()
 
+    remove_sidecar(data.get("file_hash"))
+    shutil.rmtree(DELTA_DIR / file_id, ignore_errors=True)
+    remove_table_sketches(file_id)
+
     metadata_file = METADATA_DIR / f"{file_id}.json"
     if metadata_file.exists():
         metadata_file.unlink()
 
-    del FILE_REGISTRY[file_id]
+    invalidate_question_cache(f"deleted {data['original_filename']}")
 
     return {
         "status": "success",
@@ -338,22 +909,34 @@ async def delete_file(file_id: str):
         "max_files": MAX_FILES
     }
 
-# =============================== 5. DELETE ALL FILES ===============================
+# =============================== 6. DELETE ALL FILES ===============================
 @router.delete("/files/all")
 async def delete_all_files():
-    """Delete all uploaded files and clear registry."""
+    """Delete all uploaded files and clear registry; files with a running job are skipped and listed."""
     
     logger.info("File deletion request received for all files")
 
     if not FILE_REGISTRY:
-        return {"status": "success", "message": "No files to delete", "deleted_count": 0}
+        return {"status": "success", "message": "No files to delete", "deleted_count": 0, "busy_file_ids": []}
 
-    ids = list(FILE_REGISTRY.keys())
-    for fid in ids:
-        await delete_file(fid)
+    deleted = 0
+    busy_ids = []
+    for fid in list(FILE_REGISTRY.keys()):
+        try:
+            await delete_file(fid)
+        except HTTPException as e:
+            # 404: deleted by a concurrent request in the meantime
+            if e.status_code == 409:
+                busy_ids.append(fid)
+            continue
+        deleted += 1
 
+    message = f"Successfully deleted {deleted} file(s)"
+    if busy_ids:
+        message += f"; skipped {len(busy_ids)} file(s) being updated"
     return {
         "status": "success",
-        "message": f"Successfully deleted {len(ids)} file(s)",
-        "deleted_count": len(ids)
+        "message": message,
+        "deleted_count": deleted,
+        "busy_file_ids": busy_ids
     }
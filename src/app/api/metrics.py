@@ -0,0 +1,33 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Metrics API Endpoint - Cache effectiveness counters.
+
+This module provides:
+- GET /api/metrics: hit rates and saved latency of the question cache, and
+  hit rates and size of the execute_sql result cache
+"""
+
+# =============================== IMPORTS ===============================
+from fastapi import APIRouter
+
+from src.app.utils.question_cache import get_question_cache_stats
+from src.app.utils.result_cache import get_result_cache_stats
+
+router = APIRouter(prefix="/api", tags=["metrics"])
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Counters since the server started.
+
+    `question_cache.saved_seconds` estimates the model time saved: for each
+    hit, the average latency of a cached question's first (model) answer
+    minus the latency of the hit. `result_cache` counts the lookups of this
+    process; its entries and bytes are shared with the MCP server.
+    """
+    return {
+        "status": "success",
+        "question_cache": get_question_cache_stats(),
+        "result_cache": get_result_cache_stats(),
+    }
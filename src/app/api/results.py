@@ -0,0 +1,42 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Results API Endpoint - Pages of large query results.
+
+execute_sql returns the first rows of a large result with a result_id and
+keeps the full result server-side for a while (see utils/result_store); the
+UI reads the remaining rows here, page by page.
+
+This module provides:
+- GET /api/results/{result_id}: one page of a query result
+"""
+
+# =============================== IMPORTS ===============================
+from fastapi import APIRouter, HTTPException, Query
+
+from src.app.configs.logger_config import get_logger
+from src.app.utils.result_store import RESULT_MAX_PAGE_ROWS, RESULT_PREVIEW_ROWS, fetch_result_page
+
+logger = get_logger("Results-Api-Service")
+
+router = APIRouter(prefix="/api", tags=["results"])
+
+
+@router.get("/results/{result_id}")
+async def get_result_page(
+    result_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(RESULT_PREVIEW_ROWS, ge=1, le=RESULT_MAX_PAGE_ROWS)
+):
+    """
+    Rows `offset` to `offset + limit` of a query result.
+
+    `rows` are lists in `columns` order; `next_offset` is null on the last
+    page. Unknown or expired results answer 404 (run the query again).
+    """
+    try:
+        page = fetch_result_page(result_id, offset, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    logger.info(f"Served {len(page['rows'])} row(s) of result '{result_id}' from offset {offset}")
+    return {"status": "success", **page}
@@ -5,7 +5,7 @@ Main Application Entry Point - Initializes the FastAPI application, configures m
 This module provides:
 - FastAPI app initialization
 - CORS middleware configuration
-- Router inclusion (Chat, Schema, File Manager, Health)
+- Router inclusion (Chat, Schema, File Manager, Results, Health)
 - Static file mounting
 - Startup and shutdown event handlers
 """
@@ -19,11 +19,14 @@ from fastapi.staticfiles import StaticFiles
 
 from src.app.api import (
     chat_router,
-    health_router, file_manager_router
+    health_router, file_manager_router, results_router, metrics_router
 )
 from src.app.configs.logger_config import setup_logger
 from src.app.configs.apiKey_config import configure_api_key
 from src.app.api import file_manager
+from src.app.utils.database_manager import close_db_connections
+from src.app.utils.parallel_ingest import shutdown_ingest_pool
+from src.app.utils.upload_jobs import shutdown_upload_jobs
 
 # Setup logger
 logger = setup_logger("Main-Service")
@@ -62,6 +65,8 @@ app.add_middleware(
 
 app.include_router(chat_router)
 app.include_router(file_manager_router)
+app.include_router(results_router)
+app.include_router(metrics_router)
 app.include_router(health_router)
 
 
@@ -98,6 +103,9 @@ async def startup_event():
 async def shutdown_event():
     """Application shutdown event."""
     logger.info("🛑 Shutting down SQL ChatBot API server...")
+    shutdown_upload_jobs()
+    shutdown_ingest_pool()
+    close_db_connections()
 
 
 # =============================== ROOT ENDPOINT ===============================
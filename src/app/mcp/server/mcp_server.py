@@ -9,10 +9,12 @@ from fastmcp import FastMCP
 
 import json
 import sqlite3
-from src.app.utils.database_manager import get_db_connection, get_all_table_names
+from src.app.utils.database_manager import get_db_connection, get_all_table_names, close_db_connections
+from src.app.utils.query_engine import close_query_engine
+from src.app.utils.result_store import RESULT_PREVIEW_ROWS
 from src.app.configs.logger_config import get_logger
 # Import with aliases to avoid naming conflicts with wrapper functions
-from src.app.mcp.tools import execute_sql_query, get_schema_summary
+from src.app.mcp.tools import execute_sql_query, fetch_result_rows, get_schema_summary
 
 logger = get_logger("Mcp-Server")
 
@@ -28,6 +30,13 @@ def execute_sql(query: str) -> str:
     return execute_sql_query(query)  # Call the actual implementation
 
 
+@mcp.tool()
+def fetch_result_page(result_id: str, offset: int = 0, limit: int = RESULT_PREVIEW_ROWS) -> str:
+    '''Read more rows (from offset, limit at a time) of a large execute_sql result by its result_id.'''
+    logger.info("Calling fetch_result_page tool from mcp server")
+    return fetch_result_rows(result_id, offset, limit)  # Call the actual implementation
+
+
 @mcp.tool()
 def get_schema():
     '''Retrieve schemas for all tables currently available in the database.'''
@@ -37,4 +46,8 @@ def get_schema():
 #Run the MCP Server
 if __name__ == "__main__":
     logger.info("Starting SQL Chatbot MCP server on http://127.0.0.1:8001")
-    mcp.run(transport="sse", host="127.0.0.1", port=8001)
+    try:
+        mcp.run(transport="sse", host="127.0.0.1", port=8001)
+    finally:
+        close_query_engine()
+        close_db_connections()
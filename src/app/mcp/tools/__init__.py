@@ -1,2 +1,3 @@
 from .execute_sql import execute_sql_query
+from .fetch_results import fetch_result_rows
 from .get_schema import get_schema_summary
\ No newline at end of file
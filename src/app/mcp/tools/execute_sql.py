@@ -1,10 +1,12 @@
 
 # =============================== IMPORTS ===============================
 import json
-import sqlite3
 
 from src.app.configs.logger_config import get_logger
-from src.app.utils.database_manager import get_db_connection, get_all_table_names
+from src.app.utils.database_manager import get_catalog_version
+from src.app.utils.query_engine import get_query_engine, QueryExecutionError
+from src.app.utils.result_cache import get_cached_result, store_cached_result
+from src.app.utils.result_store import RESULT_PREVIEW_ROWS, execute_with_handle
 
 # =============================== LOGGER ===============================
 logger = get_logger("MCPTool-Service-Execute-SQL")
@@ -16,9 +18,13 @@ def execute_sql_query(query: str) -> str:
     Execute a SQL query on data from the persistent database.
     
     This function:
-    - Connects to the persistent SQLite database
-    - Runs the given SQL query
-    - Returns the result as a JSON string
+    - Runs the given SQL query on the configured engine (SQL_ENGINE: SQLite
+      read-only pooled connections, or DuckDB over the columnar sidecars)
+    - Returns the first RESULT_PREVIEW_ROWS rows as a JSON string; larger
+      results are kept server-side behind a result_id whose later pages are
+      read with fetch_result_page
+    - Serves a query run before from the result cache while the loaded
+      tables are unchanged (see utils/result_cache)
     
     Args:
         query: SQL SELECT query to execute
@@ -27,15 +33,20 @@ def execute_sql_query(query: str) -> str:
         str: JSON string with structure:
              {
                "success": bool,
-               "data": list of dicts (rows),
-               "row_count": int,
+               "data": list of dicts (the first rows),
+               "row_count": int (rows of the whole result),
+               "returned_rows": int (rows in data),
+               "has_more": bool,
+               "result_id": str or null (handle of the whole result),
                "columns": list of column names,
                "error": str (if success is False)
              }
     """
     try:
+        engine = get_query_engine()
+        
         # Check if there are any tables in the database
-        tables = get_all_table_names()
+        tables = engine.list_tables()
         
         if not tables:
             error_msg = "No tables found in database. Please upload at least one Excel or CSV file first."
@@ -48,44 +59,42 @@ def execute_sql_query(query: str) -> str:
                 "columns": [],
             })
         
-        logger.info(f"Executing SQL query...")
-        logger.debug(f"Available tables in database: {tables}")
-        
-        # Get database connection
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        # Read the version before running, so a result is never cached as newer than it is
+        catalog_version = get_catalog_version()
+        cached = get_cached_result(engine.name, query, catalog_version)
+        if cached is not None:
+            logger.info(f"SQL query served from the result cache ({engine.name})")
+            return cached
         
-        # Execute the query
-        cursor.execute(query)
+        logger.info(f"Executing SQL query on {engine.name}...")
+        logger.debug(f"Available tables in database: {tables}")
         
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description] if cursor.description else []
+        handle = execute_with_handle(engine, query, RESULT_PREVIEW_ROWS)
+        columns = handle["columns"]
         
         # Build result rows as list of dicts
-        data = []
-        for row in rows:
-            row_dict = {}
-            for i, col_name in enumerate(columns):
-                value = row[i]
-                row_dict[col_name] = value if value is not None else None
-            data.append(row_dict)
-        
-        conn.close()
+        data = [dict(zip(columns, row)) for row in handle["rows"]]
         
         result = {
             "success": True,
             "data": data,
-            "row_count": len(data),
+            "row_count": handle["row_count"],
+            "returned_rows": len(data),
+            "has_more": handle["result_id"] is not None,
+            "result_id": handle["result_id"],
             "columns": columns,
         }
         
         logger.info(
-            f"SQL query executed successfully. Rows returned: {len(data)}, Columns: {len(columns)}"
+            f"SQL query executed successfully. Rows: {handle['row_count']} "
+            f"(returned {len(data)}), Columns: {len(columns)}"
         )
         
-        return json.dumps(result, indent=2)
+        output = json.dumps(result, indent=2, default=str)
+        store_cached_result(engine.name, query, catalog_version, output)
+        return output
     
-    except sqlite3.Error as e:
+    except QueryExecutionError as e:
         error_msg = f"SQL error while running query: {e}"
         logger.error(error_msg, exc_info=True)
         return json.dumps({
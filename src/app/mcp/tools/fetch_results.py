@@ -0,0 +1,56 @@
+# =============================== IMPORTS ===============================
+import json
+
+from src.app.configs.logger_config import get_logger
+from src.app.utils.result_store import RESULT_PREVIEW_ROWS, fetch_result_page
+
+# =============================== LOGGER ===============================
+logger = get_logger("MCPTool-Service-Fetch-Results")
+
+
+# =============================== MAIN FUNCTION ===============================
+def fetch_result_rows(result_id: str, offset: int = 0, limit: int = RESULT_PREVIEW_ROWS) -> str:
+    """
+    Read more rows of a query result returned by execute_sql.
+    
+    execute_sql returns the first rows of a large result with a result_id;
+    this reads the rows from `offset` on, `limit` at a time.
+    
+    Args:
+        result_id: Handle returned by execute_sql
+        offset: Index of the first row to return
+        limit: Rows to return (capped at RESULT_MAX_PAGE_ROWS)
+        
+    Returns:
+        str: JSON string with structure:
+             {
+               "success": bool,
+               "data": list of dicts (rows),
+               "offset": int,
+               "row_count": int (rows of the whole result),
+               "next_offset": int or null (null on the last page),
+               "columns": list of column names,
+               "error": str (if success is False)
+             }
+    """
+    try:
+        page = fetch_result_page(result_id, offset, limit)
+        columns = page["columns"]
+        logger.info(f"Fetched {len(page['rows'])} row(s) of result '{result_id}' from offset {offset}")
+        return json.dumps({
+            "success": True,
+            "data": [dict(zip(columns, row)) for row in page["rows"]],
+            "offset": page["offset"],
+            "row_count": page["row_count"],
+            "next_offset": page["next_offset"],
+            "columns": columns,
+        }, indent=2)
+    
+    except ValueError as e:
+        logger.warning(f"Cannot fetch result rows: {e}")
+        return json.dumps({"success": False, "error": str(e), "data": [], "columns": []})
+    
+    except Exception as e:
+        error_msg = f"Unexpected error while fetching result rows: {e}"
+        logger.error(error_msg, exc_info=True)
+        return json.dumps({"success": False, "error": error_msg, "data": [], "columns": []})
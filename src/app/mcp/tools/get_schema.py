@@ -34,6 +34,8 @@ def get_schema_summary():
     try:
         # Import the shared registry function that reads from disk
         from src.app.utils.shared_registry import get_file_registry_from_disk
+        from src.app.utils.database_manager import get_physical_table_name
+        from src.app.utils.schema_generator import get_schema_sheet_count
 
         logger.info("Fetching schemas for all tables in the database.")
         
@@ -62,21 +64,27 @@ def get_schema_summary():
                 continue
 
             tables = schema.get("tables", [])
+            sheet_count = get_schema_sheet_count(schema, len(tables))
 
-            if tables:
-                table_info = tables[0]
+            # Multi-sheet workbooks are stored as one table per loaded sheet
+            for table_info in tables:
+                physical_name = get_physical_table_name(table_name, table_info["name"], sheet_count)
 
-                all_schemas[table_name] = {
+                all_schemas[physical_name] = {
                     "file_name": original_filename,
-                    "table_name": table_name,
+                    "table_name": physical_name,
+                    "sheet_name": table_info["name"],
                     "row_count": table_info.get("row_count", 0),
                     "column_count": table_info.get("column_count", 0),
                     "columns": table_info.get("columns", [])
                 }
 
                 columns_str = ", ".join([col["name"] for col in table_info.get("columns", [])])
+                source = f"file: {original_filename}"
+                if sheet_count > 1:
+                    source += f", sheet: {table_info['name']}"
                 table_summaries.append(
-                    f"Table: {table_name} (from file: {original_filename})\n"
+                    f"Table: {physical_name} (from {source})\n"
                     f"  Rows: {table_info.get('row_count', 0)}, Columns: {table_info.get('column_count', 0)}\n"
                     f"  Column Names: {columns_str}"
                 )
@@ -1,17 +1,29 @@
 """Utilities module."""
 from .schema_generator import (
     generate_schema,
+    profile_sheet,
+    profile_frame,
+    profile_sheet_stream,
+    build_schema,
     read_excel_file,
+    clean_column_names,
     analyze_column,
     infer_sql_type,
+    infer_column_types,
     generate_schema_summary
 )
 
 __all__ = [
     "generate_schema",
+    "profile_sheet",
+    "profile_frame",
+    "profile_sheet_stream",
+    "build_schema",
     "read_excel_file",
+    "clean_column_names",
     "analyze_column",
     "infer_sql_type",
+    "infer_column_types",
     "generate_schema_summary"
 ]
 
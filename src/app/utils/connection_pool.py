@@ -0,0 +1,155 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Connection Pool - Reusable, tuned SQLite connections for the chatbot database.
+
+This module provides:
+- One shared write connection per process, serialized by a lock
+- A pool of read-only connections (mode=ro + query_only) for query execution
+- WAL journaling so uploads do not block concurrent readers
+- Connection tuning (mmap, page cache, in-memory temp store, statement cache)
+"""
+
+# =============================== IMPORTS ===============================
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from src.app.configs.logger_config import get_logger
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-Connection-Pool")
+
+# =============================== CONSTANTS ===============================
+READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))
+BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "30000"))
+MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+STATEMENT_CACHE_SIZE = int(os.getenv("SQLITE_STATEMENT_CACHE_SIZE", "256"))
+
+
+# =============================== CONNECTION POOL ===============================
+class SQLiteConnectionPool:
+    """
+    Pool of tuned SQLite connections for one database file.
+
+    Writes go through a single connection guarded by a lock (SQLite allows one
+    writer at a time anyway). Reads check out one of up to READ_POOL_SIZE
+    read-only connections, which in WAL mode keep working while a write runs.
+    """
+
+    def __init__(self, db_path: Path, max_readers: int = READ_POOL_SIZE):
+        self.db_path = Path(db_path)
+        self.max_readers = max_readers
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all_readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+    # --------------------------- connection setup ---------------------------
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        """Open and tune a new connection."""
+        if read_only:
+            uri = f"file:{self.db_path.resolve().as_posix()}?mode=ro"
+            conn = sqlite3.connect(
+                uri,
+                uri=True,
+                timeout=BUSY_TIMEOUT_MS / 1000,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+        else:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=BUSY_TIMEOUT_MS / 1000,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+
+        logger.debug(f"Opened {'read-only' if read_only else 'write'} connection to {self.db_path}")
+        return conn
+
+    def _get_write_conn(self) -> sqlite3.Connection:
+        """Return the shared write connection, opening it on first use."""
+        with self._write_lock:
+            if self._write_conn is None:
+                self._write_conn = self._connect(read_only=False)
+            return self._write_conn
+
+    # --------------------------- public API ---------------------------
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow the write connection for one unit of work.
+
+        Commits on success and rolls back on error.
+        """
+        with self._write_lock:
+            conn = self._get_write_conn()
+            try:
+                yield conn
+                if conn.in_transaction:
+                    conn.commit()
+            except Exception:
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection from the pool."""
+        # The database file (and its WAL files) must exist before opening with mode=ro.
+        # Checked outside the lock so readers never wait on a running write.
+        if self._write_conn is None:
+            self._get_write_conn()
+
+        conn = self._checkout_reader()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    def _checkout_reader(self) -> sqlite3.Connection:
+        """Take an idle reader, open a new one, or wait for one to be returned."""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._readers_lock:
+            if len(self._all_readers) < self.max_readers:
+                conn = self._connect(read_only=True)
+                self._all_readers.append(conn)
+                return conn
+
+        return self._readers.get()
+
+    def close(self) -> None:
+        """Close every connection held by the pool."""
+        with self._readers_lock:
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
+            self._readers = queue.LifoQueue()
+
+        with self._write_lock:
+            if self._write_conn is not None:
+                self._write_conn.close()
+                self._write_conn = None
+
+        logger.info(f"Closed all pooled connections to {self.db_path}")
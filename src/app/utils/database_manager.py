@@ -2,23 +2,55 @@
 """
 Database Manager - Centralized SQLite database management for multi-table support.
 
+Each uploaded file's tables live in their own database file under
+database/files/. The main database (database/chatbot.db) only holds the table
+catalog and the index advisor's bookkeeping; file databases are ATTACHed to
+connections on demand when a query references their tables.
+
 This module provides:
-- Persistent SQLite database connection
+- Pooled, tuned SQLite connections (WAL, read-only query connections)
+- On-demand ATTACH of per-file databases, resynced with the catalog
 - Loading Excel/CSV files as tables
-- Removing tables from database
-- Database cleanup and rebuilding
+- Appending rows to a loaded table in place, skipping rows whose key exists
+- Chunked, bounded-memory streaming ingestion for large CSV (plain, gzipped or
+  zipped) and .xlsx files
+- Bulk loads into a fresh database file that is swapped in by one catalog update
+- Tables created with the declared SQL types inferred by the schema generator
+- Removing tables from database (unlinking the file's database)
+- Database cleanup and parallel rebuilding
+- Table catalog (content hash, row count, load time) for incremental rebuilds
+- Catalog version, bumped by every change to the loaded tables (result cache key)
 - Table listing and management
 """
 
 # =============================== IMPORTS ===============================
+import os
+import re
 import sqlite3
 import hashlib
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import pandas as pd
 
 from src.app.configs.logger_config import get_logger
-from src.app.utils.schema_generator import read_excel_file
+from src.app.utils.connection_pool import SQLiteConnectionPool
+from src.app.utils.file_formats import get_file_extension, is_csv_source, open_csv, uncompressed_size
+from src.app.utils.schema_generator import (
+    clean_column_names,
+    column_filter,
+    get_schema_selection,
+    get_schema_sheet_count,
+    infer_column_types,
+    is_streamed_schema,
+    list_sheet_names,
+)
+from src.app.utils.xlsx_stream import XLSX_BATCH_ROWS, iter_sheet_batches
+from src.app.utils.parallel_ingest import read_sheets
 
 # =============================== LOGGER ===============================
 logger = get_logger("Utils-Service-Database-Manager")
@@ -26,16 +58,85 @@ logger = get_logger("Utils-Service-Database-Manager")
 # =============================== CONSTANTS ===============================
 DB_DIR = Path("database")
 DB_FILE = DB_DIR / "chatbot.db"
+# One database file per uploaded file
+FILE_DB_DIR = DB_DIR / "files"
+
+# Streaming CSV ingestion: rows per chunk, size above which CSVs are streamed,
+# and how many leading chunks are sampled to fix the column types
+CSV_CHUNK_SIZE = int(os.getenv("CSV_CHUNK_SIZE", "50000"))
+CSV_STREAMING_THRESHOLD_MB = int(os.getenv("CSV_STREAMING_THRESHOLD_MB", "100"))
+TYPE_INFERENCE_CHUNKS = int(os.getenv("TYPE_INFERENCE_CHUNKS", "2"))
+
+# Bulk loads: rows per executemany batch and page cache of the database being built
+BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "20000"))
+BULK_LOAD_CACHE_SIZE_KB = int(os.getenv("BULK_LOAD_CACHE_SIZE_KB", str(256 * 1024)))
+
+# Files re-ingested concurrently by rebuild_database
+REBUILD_WORKERS = int(os.getenv("REBUILD_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Bytes hashed between two progress reports of compute_file_hash
+HASH_PROGRESS_BYTES = 16 * 1024 * 1024
+
+# Internal catalog table; names starting with "_" are never user tables
+CATALOG_TABLE = "_table_catalog"
+# Single-row table with the catalog version (see get_catalog_version)
+CATALOG_VERSION_TABLE = "_catalog_version"
+# Schema name prefix of attached file databases
+ATTACH_PREFIX = "file_"
 
-# Create database directory if it doesn't exist
+# Create database directories if they don't exist
 DB_DIR.mkdir(exist_ok=True)
+FILE_DB_DIR.mkdir(exist_ok=True)
 logger.info(f"Database directory ready at: {DB_DIR.resolve()}")
 
 
 # =============================== DATABASE CONNECTION ===============================
+_pool = SQLiteConnectionPool(DB_FILE)
+
+
+@contextmanager
+def write_connection() -> Iterator[sqlite3.Connection]:
+    """
+    Borrow the pooled write connection (commits on success, rolls back on error).
+    
+    Only the main database is guaranteed to be attached; use
+    attach_table_databases() (outside a transaction) to reach file tables.
+    
+    Yields:
+        sqlite3.Connection: The process-wide write connection
+    """
+    with _pool.write() as conn:
+        yield conn
+
+
+@contextmanager
+def read_connection(query: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a pooled read-only connection for running queries.
+    
+    Args:
+        query: SQL about to be run; the databases of the tables it references
+               are attached before the connection is handed out
+    
+    Yields:
+        sqlite3.Connection: A connection opened with mode=ro and query_only
+    """
+    with _pool.read() as conn:
+        sync_attached_databases(conn, query)
+        yield conn
+
+
+def close_db_connections() -> None:
+    """Close all pooled connections (called on application shutdown)."""
+    _pool.close()
+
+
 def get_db_connection() -> sqlite3.Connection:
     """
-    Get connection to persistent SQLite database.
+    Get a standalone connection to the main SQLite database.
+    
+    Prefer read_connection()/write_connection(), which reuse pooled connections.
+    The caller is responsible for closing this one.
     
     Returns:
         sqlite3.Connection: Database connection object
@@ -49,22 +150,194 @@ def get_db_connection() -> sqlite3.Connection:
         raise
 
 
+# =============================== ATTACHED FILE DATABASES ===============================
+_IDENTIFIER_PATTERN = re.compile(r'[A-Za-z_][\w$]*|"(?:[^"]|"")+"|`[^`]+`|\[[^\]]+\]')
+
+
+def get_file_db_path(db_file: str) -> Path:
+    """Path of a per-file database recorded in the catalog."""
+    return FILE_DB_DIR / db_file
+
+
+def get_schema_alias(source_table: str) -> str:
+    """Schema name a file's database is attached under."""
+    return f"{ATTACH_PREFIX}{source_table}"
+
+
+def _max_attached(conn: sqlite3.Connection) -> int:
+    """How many databases can be attached to a connection (SQLITE_LIMIT_ATTACHED)."""
+    if hasattr(conn, "getlimit"):
+        return conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+    return 10
+
+
+def get_table_locations(conn: sqlite3.Connection) -> Dict[str, Tuple[str, str]]:
+    """
+    Map every cataloged table to the database file holding it.
+    
+    Args:
+        conn: Any connection to the main database
+    
+    Returns:
+        Dict[str, Tuple[str, str]]: lower-cased table name -> (source_table, db_file)
+    """
+    try:
+        rows = conn.execute(
+            f"SELECT table_name, source_table, db_file FROM main.{CATALOG_TABLE} WHERE db_file IS NOT NULL"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        # Catalog not created yet (nothing loaded) or pre-migration layout
+        return {}
+    return {table.lower(): (source, db_file) for table, source, db_file in rows}
+
+
+def get_source_versions(conn: sqlite3.Connection) -> Dict[str, str]:
+    """
+    Version of every loaded source: its database file plus its last change.
+    
+    Changes when a source is reloaded into a new database file and when rows
+    are appended to its tables in place.
+    
+    Args:
+        conn: Any connection to the main database
+    
+    Returns:
+        Dict[str, str]: source_table -> version string
+    """
+    try:
+        rows = conn.execute(
+            f"SELECT source_table, db_file, MAX(loaded_at) FROM main.{CATALOG_TABLE} "
+            f"WHERE db_file IS NOT NULL GROUP BY source_table, db_file"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    return {source: f"{db_file}@{loaded_at}" for source, db_file, loaded_at in rows}
+
+
+def _referenced_tables(query: str, locations: Dict[str, Tuple[str, str]]) -> Set[str]:
+    """Cataloged tables whose names appear as identifiers in a query."""
+    text = re.sub(r"'(?:[^']|'')*'", "''", query)
+    names = set()
+    for token in _IDENTIFIER_PATTERN.findall(text):
+        name = token.strip('"`[]').replace('""', '"').lower()
+        if name in locations:
+            names.add(name)
+    return names
+
+
+def _attach(conn: sqlite3.Connection, alias: str, path: Path, read_only: bool) -> None:
+    """ATTACH one file database under a schema alias."""
+    if read_only:
+        target = f"file:{path.resolve().as_posix()}?mode=ro"
+    else:
+        target = str(path)
+    conn.execute("ATTACH DATABASE ? AS " + _quote_identifier(alias), (target,))
+
+
+def _attach_sources(
+    conn: sqlite3.Connection,
+    sources: Dict[str, str],
+    locations: Dict[str, Tuple[str, str]]
+) -> None:
+    """
+    Attach the given sources and detach attachments that are stale or unneeded.
+    
+    An attachment is stale when its source is no longer cataloged or was
+    reloaded into a new database file. Unneeded attachments are only detached
+    when room is required under SQLITE_LIMIT_ATTACHED.
+    
+    Args:
+        conn: Connection outside any transaction
+        sources: source_table -> db_file to attach
+        locations: Current catalog, see get_table_locations
+    """
+    current = {get_schema_alias(source): db_file for source, db_file in locations.values()}
+    wanted = {get_schema_alias(source): db_file for source, db_file in sources.items()}
+    read_only = bool(conn.execute("PRAGMA query_only").fetchone()[0])
+    
+    attached = {}
+    for _, name, file_path in conn.execute("PRAGMA database_list").fetchall():
+        if not name.startswith(ATTACH_PREFIX):
+            continue
+        expected = current.get(name)
+        if expected is None or Path(file_path).name != expected:
+            conn.execute(f"DETACH DATABASE {_quote_identifier(name)}")
+        else:
+            attached[name] = expected
+    
+    missing = [alias for alias in wanted if alias not in attached]
+    if len(wanted) > _max_attached(conn):
+        raise sqlite3.OperationalError(
+            f"Query references tables from {len(wanted)} files; at most "
+            f"{_max_attached(conn)} can be used together"
+        )
+    spare = [alias for alias in attached if alias not in wanted]
+    while missing and len(attached) + len(missing) > _max_attached(conn):
+        alias = spare.pop()
+        conn.execute(f"DETACH DATABASE {_quote_identifier(alias)}")
+        del attached[alias]
+    
+    for alias in missing:
+        _attach(conn, alias, get_file_db_path(wanted[alias]), read_only)
+
+
+def sync_attached_databases(conn: sqlite3.Connection, query: Optional[str] = None) -> None:
+    """
+    Bring a connection's attachments in line with the catalog.
+    
+    Databases of files that were reloaded or deleted are detached, and the
+    databases of the tables a query references are attached.
+    
+    Args:
+        conn: Connection outside any transaction
+        query: SQL about to be run on the connection (None only resyncs)
+    """
+    locations = get_table_locations(conn)
+    needed = _referenced_tables(query, locations) if query else set()
+    _attach_sources(conn, dict(locations[name] for name in needed), locations)
+
+
+def attach_table_databases(conn: sqlite3.Connection, table_names: Iterable[str]) -> Dict[str, str]:
+    """
+    Attach the databases holding the given tables.
+    
+    Args:
+        conn: Connection outside any transaction
+        table_names: Cataloged table names
+    
+    Returns:
+        Dict[str, str]: table name -> schema alias, for the tables that exist
+    """
+    locations = get_table_locations(conn)
+    found = {name: locations[name.lower()] for name in table_names if name.lower() in locations}
+    _attach_sources(conn, dict(found.values()), locations)
+    return {name: get_schema_alias(source) for name, (source, _) in found.items()}
+
+
 # =============================== FILE CONTENT HASH ===============================
-def compute_file_hash(file_path: str) -> str:
+def compute_file_hash(file_path: str, progress: Optional[Callable[[float], None]] = None) -> str:
     """
     Compute SHA-256 hash of file content to detect duplicates.
     
     Args:
         file_path: Path to the file
+        progress: Called with the fraction of the file hashed so far
+                  (every HASH_PROGRESS_BYTES)
         
     Returns:
         str: Hexadecimal hash string
     """
     try:
         sha256_hash = hashlib.sha256()
+        total_size = max(1, os.path.getsize(file_path))
+        hashed = reported = 0
         with open(file_path, "rb") as f:
             for byte_block in iter(lambda: f.read(8192), b""):
                 sha256_hash.update(byte_block)
+                hashed += len(byte_block)
+                if progress is not None and hashed - reported >= HASH_PROGRESS_BYTES:
+                    reported = hashed
+                    progress(hashed / total_size)
         file_hash = sha256_hash.hexdigest()
         logger.debug(f"Computed hash for {file_path}: {file_hash[:16]}...")
         return file_hash
@@ -73,21 +346,742 @@ def compute_file_hash(file_path: str) -> str:
         raise
 
 
+# =============================== TYPED TABLE CREATION ===============================
+def _quote_identifier(name: str) -> str:
+    """Quote an SQL identifier."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def create_typed_table(cursor: sqlite3.Cursor, table_name: str, column_types: Dict[str, str]) -> None:
+    """
+    (Re)create a table with declared column types.
+    
+    Args:
+        cursor: Cursor of the write transaction
+        table_name: Table to create (an existing table is replaced)
+        column_types: Column name -> SQL type from the schema (INTEGER, REAL,
+                      BOOLEAN, DATETIME, TIME, TEXT)
+    """
+    columns_sql = ", ".join(
+        f"{_quote_identifier(col)} {col_type}" for col, col_type in column_types.items()
+    )
+    cursor.execute(f"DROP TABLE IF EXISTS {_quote_identifier(table_name)}")
+    cursor.execute(f"CREATE TABLE {_quote_identifier(table_name)} ({columns_sql})")
+
+
+def _to_iso_datetime(series: pd.Series) -> pd.Series:
+    """
+    Normalize a date/date-time column to sortable ISO-8601 text.
+    
+    Columns holding only dates become 'YYYY-MM-DD', otherwise
+    'YYYY-MM-DD HH:MM:SS'. Values that cannot be parsed are kept as text.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        parsed = series
+    else:
+        parsed = pd.to_datetime(series, errors="coerce", format="mixed")
+    
+    valid = parsed.dropna()
+    is_date_only = valid.empty or bool((valid == valid.dt.normalize()).all())
+    iso = parsed.dt.strftime("%Y-%m-%d" if is_date_only else "%Y-%m-%d %H:%M:%S").astype(object)
+    
+    unparsed = parsed.isna() & series.notna()
+    if unparsed.any():
+        iso[unparsed] = series[unparsed].astype(str)
+    return iso
+
+
+def normalize_frame_for_sql(df: pd.DataFrame, column_types: Dict[str, str]) -> pd.DataFrame:
+    """
+    Convert DataFrame values to the representation stored for each declared type.
+    
+    DATETIME becomes ISO-8601 text, BOOLEAN becomes 0/1, TIME becomes 'HH:MM:SS'
+    and any other non-primitive value (e.g. a date in a TEXT column) becomes text.
+    
+    Args:
+        df: Frame to normalize (not modified)
+        column_types: Column name -> SQL type
+        
+    Returns:
+        pd.DataFrame: Normalized frame with the same columns
+    """
+    df = df.copy(deep=False)
+    for col in df.columns:
+        col_type = column_types.get(str(col), "TEXT")
+        series = df[col]
+        
+        if col_type == "DATETIME":
+            df[col] = _to_iso_datetime(series)
+        elif col_type == "BOOLEAN":
+            if series.dtype == object:
+                df[col] = series.map(lambda v: int(bool(v)), na_action="ignore")
+            else:
+                df[col] = series.astype("Int64")
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            df[col] = _to_iso_datetime(series)
+        elif series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) not in (
+            "string", "empty", "integer", "floating", "mixed-integer-float", "boolean"
+        ):
+            df[col] = series.map(
+                lambda v: v if isinstance(v, (str, int, float, bytes)) else str(v),
+                na_action="ignore"
+            )
+    return df
+
+
+def _frame_to_rows(df: pd.DataFrame) -> Iterable[tuple]:
+    """Convert a DataFrame into sqlite3-ready row tuples (NaN/NaT become NULL)."""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+def insert_frame(
+    cursor: sqlite3.Cursor,
+    table_name: str,
+    df: pd.DataFrame,
+    column_types: Dict[str, str],
+    batch_size: int = BULK_INSERT_BATCH_SIZE,
+    schema: Optional[str] = None
+) -> None:
+    """
+    Insert a DataFrame into a table created by create_typed_table.
+    
+    Args:
+        cursor: Cursor of the write transaction
+        table_name: Target table
+        df: Rows to insert (columns in table order)
+        column_types: Column name -> SQL type used to normalize the values
+        batch_size: Rows passed to each executemany call
+        schema: Schema alias of an attached database holding the table
+    """
+    placeholders = ", ".join("?" for _ in df.columns)
+    target = _quote_identifier(table_name) if schema is None else f"{_quote_identifier(schema)}.{_quote_identifier(table_name)}"
+    statement = f"INSERT INTO {target} VALUES ({placeholders})"
+    
+    # Normalizing in batches keeps the converted copy of the frame small
+    for start in range(0, len(df), batch_size):
+        batch = df.iloc[start:start + batch_size]
+        cursor.executemany(statement, _frame_to_rows(normalize_frame_for_sql(batch, column_types)))
+
+
+def get_schema_column_types(schema: Optional[Dict]) -> Dict[str, Dict[str, str]]:
+    """
+    Extract declared column types from a schema.
+    
+    Returns:
+        Dict[str, Dict[str, str]]: sheet name -> {column name -> SQL type}
+    """
+    return {
+        str(table["name"]): {col["name"]: col["type"] for col in table.get("columns", [])}
+        for table in (schema or {}).get("tables", [])
+    }
+
+
+# =============================== FILE DATABASES ===============================
+_active_loads: Set[str] = set()
+_active_loads_lock = threading.Lock()
+
+
+def _new_db_file_name(source_table: str) -> str:
+    """Unique database file name for one load of a source table."""
+    return f"{source_table}__{time.time_ns():x}.db"
+
+
+def _open_load_database(path: Path) -> sqlite3.Connection:
+    """
+    Open a connection for building a new file database.
+    
+    Nothing reads the file until the catalog points at it, so durability is
+    relaxed entirely (no journal, no fsync, large page cache). A crash only
+    leaves an unreferenced file behind, which sweep_orphan_databases removes.
+    """
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute(f"PRAGMA cache_size=-{BULK_LOAD_CACHE_SIZE_KB}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def _unlink_database(db_file: str) -> bool:
+    """
+    Delete a file database and its journal or WAL files.
+    
+    On Windows a file still attached by a reader cannot be deleted; it is left
+    in place and removed by the next sweep_orphan_databases.
+    """
+    path = get_file_db_path(db_file)
+    try:
+        for suffix in ("", "-journal", "-wal", "-shm"):
+            leftover = path.with_name(path.name + suffix)
+            leftover.unlink(missing_ok=True)
+        return True
+    except OSError as e:
+        logger.warning(f"Could not delete database file '{db_file}' yet: {e}")
+        return False
+
+
+def sweep_orphan_databases() -> int:
+    """
+    Delete file databases the catalog no longer references.
+    
+    Covers files of removed or reloaded uploads that could not be deleted at
+    the time and files of loads that were interrupted.
+    
+    Returns:
+        int: Number of files deleted
+    """
+    referenced = {
+        entry["db_file"]
+        for entries in get_catalog_entries().values()
+        for entry in entries
+        if entry.get("db_file")
+    }
+    with _active_loads_lock:
+        referenced |= _active_loads
+    
+    removed = 0
+    for path in FILE_DB_DIR.glob("*.db"):
+        if path.name not in referenced and _unlink_database(path.name):
+            removed += 1
+    
+    if removed:
+        logger.info(f"Swept {removed} orphaned database file(s)")
+    return removed
+
+
+def _drop_legacy_tables() -> List[str]:
+    """
+    Drop user tables stored in the main database by the single-file layout.
+    
+    Their catalog rows (without a db_file) are removed too, so the files they
+    came from are reloaded into their own databases.
+    """
+    with write_connection() as conn:
+        cursor = conn.cursor()
+        _ensure_catalog(cursor)
+        cursor.execute(
+            "SELECT name FROM main.sqlite_master WHERE type='table' "
+            "AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' "
+            "AND name NOT LIKE '\\_%' ESCAPE '\\'"
+        )
+        legacy = [row[0] for row in cursor.fetchall()]
+        for name in legacy:
+            cursor.execute(f"DROP TABLE IF EXISTS main.{_quote_identifier(name)}")
+        cursor.execute(f"DELETE FROM {CATALOG_TABLE} WHERE db_file IS NULL")
+        
+        from src.app.utils.index_advisor import forget_tables
+        forget_tables(legacy, cursor)
+    
+    if legacy:
+        logger.info(f"Dropped {len(legacy)} table(s) of the single-database layout: {legacy}")
+    return legacy
+
+
+# =============================== STREAMING CSV INGESTION ===============================
+def should_stream_csv(file_path: str) -> bool:
+    """
+    Decide whether a file should be ingested with the chunked CSV loader.
+    
+    Args:
+        file_path: Path to the uploaded file
+    
+    Returns:
+        bool: True for CSV files (plain, gzipped or zipped) whose decompressed
+        size is at or above CSV_STREAMING_THRESHOLD_MB
+    """
+    path = Path(file_path)
+    if not is_csv_source(path) or not path.exists():
+        return False
+    return uncompressed_size(file_path) >= CSV_STREAMING_THRESHOLD_MB * 1024 * 1024
+
+
+def load_csv_to_db_streaming(
+    cursor: sqlite3.Cursor,
+    file_path: str,
+    table_name: str,
+    chunk_size: int = CSV_CHUNK_SIZE,
+    column_types: Optional[Dict[str, str]] = None,
+    columns: Optional[List[str]] = None,
+    sheet_name: str = "Sheet1"
+) -> Tuple[int, int]:
+    """
+    Stream a CSV file into a table chunk by chunk.
+    
+    Column types are fixed from the first TYPE_INFERENCE_CHUNKS chunks (or taken
+    from the schema) so every chunk lands in the same typed table, and all chunks
+    are inserted inside the caller's transaction. Peak memory is bounded by
+    chunk_size, not the file size; gzipped files and zip members are
+    decompressed as the chunks are parsed.
+    
+    Args:
+        cursor: Cursor of the file database being built
+        file_path: Path to the CSV file (.csv, .csv.gz or a .zip of CSVs)
+        table_name: Name to use for the table
+        chunk_size: Number of rows parsed and inserted per chunk
+        column_types: Column name -> SQL type from the schema (inferred if omitted)
+        columns: Cleaned names of the columns to load (None: all)
+        sheet_name: Member to load from a zip archive ("Sheet1" otherwise)
+    
+    Returns:
+        Tuple[int, int]: (row_count, column_count)
+    """
+    start_time = time.perf_counter()
+    usecols = column_filter(columns)
+    logger.info(f"Streaming CSV '{file_path}' into table '{table_name}' (chunk size: {chunk_size})")
+    
+    # Infer stable column types from the leading chunks
+    with open_csv(file_path, sheet_name) as source:
+        raw_columns = pd.read_csv(source, nrows=0, usecols=usecols).columns
+    if column_types is None:
+        with open_csv(file_path, sheet_name) as source:
+            sample_df = clean_column_names(
+                pd.read_csv(source, nrows=chunk_size * TYPE_INFERENCE_CHUNKS, usecols=usecols)
+            )
+        column_types = infer_column_types(sample_df)
+        del sample_df
+    clean_names = list(clean_column_names(pd.DataFrame(columns=raw_columns)).columns)
+    text_columns = [
+        raw for raw, col in zip(raw_columns, clean_names)
+        if column_types.get(col, "TEXT") in ("TEXT", "DATETIME", "TIME")
+    ]
+    
+    total_rows = 0
+    create_typed_table(cursor, table_name, {col: column_types.get(col, "TEXT") for col in clean_names})
+    
+    # Text columns stay text in every chunk, even if a later chunk looks numeric
+    with open_csv(file_path, sheet_name) as source:
+        reader = pd.read_csv(
+            source, chunksize=chunk_size, usecols=usecols, dtype={col: str for col in text_columns}
+        )
+        for chunk in reader:
+            insert_frame(cursor, table_name, clean_column_names(chunk), column_types)
+            total_rows += len(chunk)
+            logger.debug(f"Inserted {total_rows} rows into '{table_name}' so far")
+    
+    elapsed = time.perf_counter() - start_time
+    rows_per_sec = total_rows / elapsed if elapsed > 0 else float(total_rows)
+    logger.info(
+        f"Streamed {total_rows} rows into '{table_name}' in {elapsed:.2f}s "
+        f"({rows_per_sec:,.0f} rows/sec)"
+    )
+    return total_rows, len(clean_names)
+
+
+# =============================== STREAMING XLSX INGESTION ===============================
+def load_xlsx_to_db_streaming(
+    cursor: sqlite3.Cursor,
+    file_path: str,
+    sheet_name: str,
+    table_name: str,
+    batch_rows: int = XLSX_BATCH_ROWS,
+    column_types: Optional[Dict[str, str]] = None,
+    columns: Optional[List[str]] = None
+) -> Tuple[int, int]:
+    """
+    Stream one sheet of an .xlsx workbook into a table batch by batch.
+    
+    Rows come from openpyxl's read-only row iterator (see xlsx_stream), so
+    peak memory is bounded by batch_rows, not the workbook size. Column types
+    are taken from the schema (or inferred from the first batch) and all
+    batches are inserted inside the caller's transaction.
+    
+    Args:
+        cursor: Cursor of the file database being built
+        file_path: Path to the .xlsx file
+        sheet_name: Sheet to load
+        table_name: Name to use for the table
+        batch_rows: Number of rows parsed and inserted per batch
+        column_types: Column name -> SQL type from the schema (inferred if omitted)
+        columns: Cleaned names of the columns to load (None: all)
+    
+    Returns:
+        Tuple[int, int]: (row_count, column_count)
+    """
+    start_time = time.perf_counter()
+    logger.info(f"Streaming sheet '{sheet_name}' of '{file_path}' into table '{table_name}' (batch size: {batch_rows})")
+    
+    total_rows = 0
+    column_count = None
+    for batch in iter_sheet_batches(file_path, sheet_name, batch_rows, usecols=column_filter(columns)):
+        clean_column_names(batch)
+        if column_count is None:
+            column_types = column_types or infer_column_types(batch)
+            column_count = len(batch.columns)
+            create_typed_table(
+                cursor, table_name, {str(col): column_types.get(str(col), "TEXT") for col in batch.columns}
+            )
+        insert_frame(cursor, table_name, batch, column_types)
+        total_rows += len(batch)
+        logger.debug(f"Inserted {total_rows} rows into '{table_name}' so far")
+    
+    elapsed = time.perf_counter() - start_time
+    rows_per_sec = total_rows / elapsed if elapsed > 0 else float(total_rows)
+    logger.info(
+        f"Streamed {total_rows} rows into '{table_name}' in {elapsed:.2f}s "
+        f"({rows_per_sec:,.0f} rows/sec)"
+    )
+    return total_rows, column_count
+
+
+# =============================== APPEND ROWS ===============================
+def _has_index_on(cursor: sqlite3.Cursor, schema: str, table_name: str, columns: List[str]) -> bool:
+    """Whether an index whose leading columns are exactly `columns` exists on a table."""
+    cursor.execute(f"PRAGMA {_quote_identifier(schema)}.index_list({_quote_identifier(table_name)})")
+    for index_name in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f"PRAGMA {_quote_identifier(schema)}.index_info({_quote_identifier(index_name)})")
+        if [row[2] for row in cursor.fetchall()][:len(columns)] == columns:
+            return True
+    return False
+
+
+def _match_existing(
+    cursor: sqlite3.Cursor,
+    schema: str,
+    table_name: str,
+    df: pd.DataFrame,
+    columns: List[str],
+    column_types: Dict[str, str]
+) -> List[int]:
+    """
+    Positions of the rows of df whose values in `columns` already exist in the table.
+    
+    The values are staged in a temporary table and probed with an indexed
+    NOT EXISTS-style join, so the cost follows the size of df.
+    """
+    staged = normalize_frame_for_sql(df[columns], column_types)
+    names = [f"k{i}" for i in range(len(columns))]
+    cursor.execute("DROP TABLE IF EXISTS temp.__append_probe")
+    cursor.execute(f"CREATE TEMP TABLE __append_probe (pos INTEGER, {', '.join(names)})")
+    cursor.executemany(
+        f"INSERT INTO temp.__append_probe VALUES (?, {', '.join('?' for _ in names)})",
+        ((pos, *row) for pos, row in enumerate(_frame_to_rows(staged)))
+    )
+    condition = " AND ".join(
+        f"t.{_quote_identifier(col)} IS p.{name}" for col, name in zip(columns, names)
+    )
+    cursor.execute(
+        f"SELECT p.pos FROM temp.__append_probe AS p WHERE EXISTS ("
+        f"SELECT 1 FROM {_quote_identifier(schema)}.{_quote_identifier(table_name)} AS t WHERE {condition})"
+    )
+    matched = [row[0] for row in cursor.fetchall()]
+    cursor.execute("DROP TABLE temp.__append_probe")
+    return matched
+
+
+def append_rows_to_db(
+    table_name: str,
+    df: pd.DataFrame,
+    column_types: Dict[str, str],
+    key_columns: Optional[List[str]] = None,
+    unique_columns: Iterable[str] = ()
+) -> Tuple[pd.DataFrame, Set[str]]:
+    """
+    Append rows to a loaded table in place, skipping rows whose key already exists.
+    
+    Unlike load_file_to_db, the table's database file is not rebuilt: the
+    rows are inserted into it (attached to the write connection) in one
+    transaction, and the catalog row count is bumped. The insert goes
+    through WAL (databases built before WAL mode are switched first), so
+    queries on the table keep reading the previous rows until the commit.
+    
+    With key_columns, rows whose key is already in the table (or earlier in
+    df) are skipped; the key is indexed on first use, so later appends
+    probe it in O(delta log n).
+    
+    Args:
+        table_name: Cataloged table to append to
+        df: Rows with the table's (cleaned) columns, in table order
+        column_types: Column name -> declared SQL type of the table
+        key_columns: Columns identifying a row (None: append every row)
+        unique_columns: Columns to check for values already in the table
+    
+    Returns:
+        Tuple[pd.DataFrame, Set[str]]: (rows inserted, unique_columns whose
+        inserted values are all absent from the table's previous rows)
+    
+    Raises:
+        ValueError: If the table is not cataloged
+    """
+    start_time = time.perf_counter()
+    with write_connection() as conn:
+        schemas = attach_table_databases(conn, [table_name])
+        if table_name not in schemas:
+            raise ValueError(f"Table '{table_name}' does not exist")
+        schema = schemas[table_name]
+        cursor = conn.cursor()
+        # Persistent; a no-op for databases already in WAL mode
+        cursor.execute(f"PRAGMA {_quote_identifier(schema)}.journal_mode=WAL")
+        
+        if key_columns:
+            df = df.drop_duplicates(subset=key_columns)
+            if not _has_index_on(cursor, schema, table_name, key_columns):
+                index_name = f"idx_{table_name}__append_key"
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote_identifier(schema)}.{_quote_identifier(index_name)} "
+                    f"ON {_quote_identifier(table_name)} ({', '.join(_quote_identifier(col) for col in key_columns)})"
+                )
+                logger.info(f"Indexed append key {key_columns} of '{table_name}'")
+            existing = _match_existing(cursor, schema, table_name, df, key_columns, column_types)
+            if existing:
+                df = df[~pd.RangeIndex(len(df)).isin(existing)]
+        
+        # A single-column key is new by construction
+        still_unique = {
+            col for col in unique_columns
+            if col in df.columns and (
+                key_columns == [col] or not _match_existing(cursor, schema, table_name, df, [col], column_types)
+            )
+        }
+        
+        insert_frame(cursor, table_name, df, column_types, schema=schema)
+        cursor.execute(
+            f"UPDATE {CATALOG_TABLE} SET row_count = row_count + ?, loaded_at = ? WHERE table_name = ?",
+            (len(df), time.time(), table_name)
+        )
+        _bump_catalog_version(cursor)
+    
+    logger.info(
+        f"Appended {len(df)} row(s) to '{table_name}' in {time.perf_counter() - start_time:.2f}s"
+    )
+    return df, still_unique
+
+
+def iter_table_frames(table_name: str, batch_rows: int = CSV_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Read a loaded table back in DataFrames of at most batch_rows rows (values as stored)."""
+    query = f"SELECT * FROM {_quote_identifier(table_name)}"
+    with read_connection(query) as conn:
+        yield from pd.read_sql_query(query, conn, chunksize=batch_rows)
+
+
+# =============================== TABLE CATALOG ===============================
+def _ensure_catalog(cursor: sqlite3.Cursor) -> None:
+    """Create the catalog table if it does not exist yet (adding columns of newer layouts)."""
+    cursor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {CATALOG_TABLE} (
+            table_name TEXT PRIMARY KEY,
+            source_table TEXT NOT NULL,
+            file_hash TEXT,
+            file_size INTEGER,
+            file_mtime REAL,
+            row_count INTEGER,
+            column_count INTEGER,
+            loaded_at REAL,
+            load_seconds REAL,
+            db_file TEXT
+        )
+        """
+    )
+    cursor.execute(f"PRAGMA main.table_info({CATALOG_TABLE})")
+    if "db_file" not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute(f"ALTER TABLE {CATALOG_TABLE} ADD COLUMN db_file TEXT")
+
+
+def _bump_catalog_version(cursor: sqlite3.Cursor) -> None:
+    """Advance the catalog version (call inside the transaction that changes the tables)."""
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS main.{CATALOG_VERSION_TABLE} "
+        f"(id INTEGER PRIMARY KEY CHECK (id = 0), epoch TEXT NOT NULL, version INTEGER NOT NULL)"
+    )
+    cursor.execute(
+        f"INSERT INTO main.{CATALOG_VERSION_TABLE} VALUES (0, ?, 1) "
+        f"ON CONFLICT(id) DO UPDATE SET version = version + 1",
+        (uuid.uuid4().hex,)
+    )
+
+
+def get_catalog_version(conn: Optional[sqlite3.Connection] = None) -> str:
+    """
+    Version of the loaded tables, shared by every process using the database.
+    
+    Changes whenever a file is loaded or reloaded, rows are appended, a table
+    is removed or the database is cleared. The version carries a random epoch
+    chosen when it is first recorded, so a recreated database never repeats
+    an earlier version.
+    
+    Args:
+        conn: Connection to use; a pooled read connection is borrowed if omitted
+    
+    Returns:
+        str: "<epoch>:<counter>" ("0" before anything was loaded)
+    """
+    if conn is None:
+        with read_connection() as pooled_conn:
+            return get_catalog_version(pooled_conn)
+    try:
+        row = conn.execute(f"SELECT epoch, version FROM main.{CATALOG_VERSION_TABLE}").fetchone()
+    except sqlite3.OperationalError:
+        return "0"
+    return f"{row[0]}:{row[1]}" if row else "0"
+
+
+def record_table_load(
+    source_table: str,
+    tables: List[Tuple[str, int, int]],
+    file_path: str,
+    file_hash: str,
+    load_seconds: float,
+    db_file: str
+) -> None:
+    """
+    Point the catalog at a newly built file database.
+    
+    The catalog rows of the source are replaced in one short transaction, so
+    queries see either all old tables or all new ones. The previous database
+    file of the source is deleted afterwards.
+    
+    Args:
+        source_table: Table name derived for the uploaded file
+        tables: (table_name, row_count, column_count) for each table created
+        file_path: Path to the loaded file
+        file_hash: SHA-256 of the file content
+        load_seconds: Wall time the load took
+        db_file: Name of the database file holding the tables
+    """
+    stat = Path(file_path).stat()
+    loaded_names = {name for name, _, _ in tables}
+    
+    with write_connection() as conn:
+        cursor = conn.cursor()
+        _ensure_catalog(cursor)
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        cursor.execute(
+            f"SELECT table_name, db_file FROM {CATALOG_TABLE} WHERE source_table=?",
+            (source_table,)
+        )
+        previous = cursor.fetchall()
+        stale_tables = [name for name, _ in previous if name not in loaded_names]
+        old_files = {old_file for _, old_file in previous if old_file and old_file != db_file}
+        
+        from src.app.utils.index_advisor import forget_tables
+        forget_tables(stale_tables, cursor)
+        cursor.execute(f"DELETE FROM {CATALOG_TABLE} WHERE source_table=?", (source_table,))
+        
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO {CATALOG_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (name, source_table, file_hash, stat.st_size, stat.st_mtime,
+                 rows, columns, time.time(), load_seconds, db_file)
+                for name, rows, columns in tables
+            ]
+        )
+        _bump_catalog_version(cursor)
+    
+    for old_file in old_files:
+        _unlink_database(old_file)
+    if stale_tables:
+        logger.info(f"Dropped stale table(s) {stale_tables} of '{source_table}'")
+    
+    # Record the indexes built with the new tables
+    from src.app.utils.index_advisor import reapply_indexes
+    reapply_indexes(loaded_names)
+
+
+def get_catalog_entries() -> Dict[str, List[Dict]]:
+    """
+    Read the table catalog grouped by source table.
+    
+    Returns:
+        Dict[str, List[Dict]]: source_table -> catalog rows of its tables
+    """
+    with write_connection() as conn:
+        cursor = conn.cursor()
+        _ensure_catalog(cursor)
+        cursor.execute(f"SELECT * FROM {CATALOG_TABLE}")
+        columns = [desc[0] for desc in cursor.description]
+        rows = cursor.fetchall()
+    
+    entries: Dict[str, List[Dict]] = {}
+    for row in rows:
+        entry = dict(zip(columns, row))
+        entries.setdefault(entry["source_table"], []).append(entry)
+    return entries
+
+
+def _is_file_current(entries: List[Dict], file_path: str, file_hash: str) -> bool:
+    """
+    Check whether a file's database matches its current content.
+    
+    A size/mtime match with the catalog is trusted; otherwise the content hash
+    is recomputed and compared before deciding to reload.
+    """
+    if not entries:
+        return False
+    if any(not entry.get("db_file") or not get_file_db_path(entry["db_file"]).exists() for entry in entries):
+        return False
+    
+    catalog_hash = entries[0]["file_hash"]
+    if not catalog_hash or (file_hash and file_hash != catalog_hash):
+        return False
+    
+    stat = Path(file_path).stat()
+    if all(
+        entry["file_size"] == stat.st_size and entry["file_mtime"] == stat.st_mtime
+        for entry in entries
+    ):
+        return True
+    
+    return compute_file_hash(file_path) == catalog_hash
+
+
+# =============================== TABLE NAMING ===============================
+def get_physical_table_name(table_name: str, sheet_name: str, sheet_count: int) -> str:
+    """
+    Name of the database table holding one sheet of an uploaded file.
+    
+    Single-sheet files use the table name as is; multi-sheet workbooks get one
+    table per sheet with the sheet name as suffix.
+    """
+    if sheet_count == 1:
+        return table_name
+    return f"{table_name}_{sheet_name}".replace(" ", "_")
+
+
 # =============================== LOAD FILE TO DATABASE ===============================
-def load_file_to_db(file_path: str, table_name: str) -> Tuple[int, int]:
+def load_file_to_db(
+    file_path: str,
+    table_name: str,
+    streaming: Optional[bool] = None,
+    chunk_size: Optional[int] = None,
+    sheets_data: Optional[Dict[str, pd.DataFrame]] = None,
+    file_hash: Optional[str] = None,
+    schema: Optional[Dict] = None,
+    progress: Optional[Callable[[float], None]] = None
+) -> Tuple[int, int]:
     """
-    Load an Excel/CSV file into the database as a table.
+    Load an Excel/CSV file into its own database file.
+    
+    The tables and their indexes are built in a new database file with relaxed
+    durability; a single catalog update then swaps it in, so concurrent queries
+    never see a missing or half-written table.
     
     Args:
         file_path: Path to the Excel/CSV file
         table_name: Name to use for the table
-        
+        streaming: Force (True) or disable (False) chunked CSV / .xlsx ingestion.
+                   None streams CSVs above CSV_STREAMING_THRESHOLD_MB and
+                   workbooks whose schema was generated by the streaming reader.
+        chunk_size: Rows per chunk in streaming mode (default: CSV_CHUNK_SIZE
+                    for CSVs, XLSX_BATCH_ROWS for workbooks)
+        sheets_data: Already-parsed sheets (e.g. shared with generate_schema).
+                     When given, the file is not read again.
+        file_hash: SHA-256 of the file recorded in the catalog (computed if omitted)
+        schema: Schema from generate_schema; its inferred column types become the
+                declared types of the tables (inferred from the data if omitted),
+                and only the sheets/columns it was generated for are loaded
+        progress: Called with the fraction of the file loaded after each sheet
+                  (sheets weighted by their profiled row counts)
+    
     Returns:
         Tuple[int, int]: (row_count, column_count)
-        
+    
     Raises:
         ValueError: If file cannot be loaded or table name is invalid
     """
+    db_file = _new_db_file_name(table_name)
+    db_path = get_file_db_path(db_file)
+    
     try:
         logger.info(f"Loading file '{file_path}' as table '{table_name}' in database.")
         
@@ -95,64 +1089,127 @@ def load_file_to_db(file_path: str, table_name: str) -> Tuple[int, int]:
         if not table_name.replace("_", "").isalnum():
             raise ValueError(f"Invalid table name: {table_name}. Only alphanumeric and underscores allowed.")
         
-        # Read the file
-        sheets_data = read_excel_file(file_path)
+        from src.app.utils.index_advisor import build_load_indexes, get_index_columns, get_key_index_columns
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        start_time = time.perf_counter()
+        schema_tables = {str(table["name"]): table for table in (schema or {}).get("tables", [])}
+        schema_types = get_schema_column_types(schema)
+        selected_sheets, selected_columns = get_schema_selection(schema)
         
-        total_rows = 0
-        total_columns = 0
+        # Large CSVs and workbooks are streamed in chunks instead of being read in one go
+        file_type = get_file_extension(file_path)
+        csv_source = is_csv_source(file_path)
+        if streaming is None:
+            streaming = sheets_data is None and (should_stream_csv(file_path) or is_streamed_schema(schema))
+        if streaming and not csv_source and file_type != ".xlsx":
+            raise ValueError("Streaming ingestion is only supported for CSV (plain, gzipped or zipped) and .xlsx files")
         
-        # For single-sheet files (CSV or single Excel sheet)
-        if len(sheets_data) == 1:
-            sheet_name, df = list(sheets_data.items())[0]
-            
-            # Clean column names
-            df.columns = df.columns.str.strip().str.replace(" ", "_", regex=False)
-            
-            # Load to database
-            df.to_sql(table_name, conn, index=False, if_exists="replace")
-            
-            total_rows = len(df)
-            total_columns = len(df.columns)
-            
-            logger.info(f"Loaded table '{table_name}' with {total_rows} rows and {total_columns} columns")
+        # Read the file unless the caller already parsed it
+        if not streaming and sheets_data is None:
+            sheets_data = read_sheets(file_path, file_hash, selected_sheets, selected_columns)
         
-        # For multi-sheet Excel files, use sheet names as suffixes
+        # For single-sheet files (CSV or single Excel sheet) the table name is used as is;
+        # for multi-sheet Excel files (even if only some sheets are selected), sheet
+        # names are used as suffixes
+        if not streaming:
+            sheet_names = list(sheets_data)
         else:
+            sheet_names = selected_sheets if selected_sheets is not None else list_sheet_names(file_path)
+        sheet_count = get_schema_sheet_count(schema, len(sheet_names))
+        if sheet_count > 1:
             logger.warning(
-                f"File has {len(sheets_data)} sheets. "
-                f"Loading all sheets with table name prefix '{table_name}_'"
+                f"File has {sheet_count} sheets. "
+                f"Loading {len(sheet_names)} sheet(s) with table name prefix '{table_name}_'"
             )
-            
-            for sheet_name, df in sheets_data.items():
-                # Clean column names
-                df.columns = df.columns.str.strip().str.replace(" ", "_", regex=False)
-                
-                # Create table name with sheet suffix
-                sheet_table_name = f"{table_name}_{sheet_name}".replace(" ", "_")
+        targets = [
+            (get_physical_table_name(table_name, name, sheet_count), name)
+            for name in sheet_names
+        ]
+        index_columns = get_index_columns([name for name, _ in targets])
+        sheet_weights = [
+            max(1, int((schema_tables.get(str(name)) or {}).get("row_count") or 1)) for _, name in targets
+        ]
+        
+        total_rows = 0
+        total_columns = 0
+        loaded_tables: List[Tuple[str, int, int]] = []
+        
+        with _active_loads_lock:
+            _active_loads.add(db_file)
+        conn = _open_load_database(db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            for sheet_table_name, sheet_name in targets:
+                if streaming and csv_source:
+                    rows, columns = load_csv_to_db_streaming(
+                        cursor, file_path, sheet_table_name, chunk_size or CSV_CHUNK_SIZE,
+                        column_types=schema_types.get(str(sheet_name)),
+                        columns=(selected_columns or {}).get(str(sheet_name)),
+                        sheet_name=str(sheet_name)
+                    )
+                elif streaming:
+                    rows, columns = load_xlsx_to_db_streaming(
+                        cursor, file_path, sheet_name, sheet_table_name, chunk_size or XLSX_BATCH_ROWS,
+                        column_types=schema_types.get(str(sheet_name)),
+                        columns=(selected_columns or {}).get(str(sheet_name))
+                    )
+                else:
+                    # Clean column names
+                    df = sheets_data[sheet_name]
+                    clean_column_names(df)
+                    
+                    # Load to database with declared column types
+                    column_types = schema_types.get(str(sheet_name)) or infer_column_types(df)
+                    create_typed_table(cursor, sheet_table_name, column_types)
+                    insert_frame(cursor, sheet_table_name, df, column_types)
+                    rows, columns = len(df), len(df.columns)
                 
-                # Load to database
-                df.to_sql(sheet_table_name, conn, index=False, if_exists="replace")
+                # Indexes are built before the tables go live
+                columns_to_index = list(index_columns.get(sheet_table_name, []))
+                columns_to_index += [
+                    col for col in get_key_index_columns(schema_tables.get(str(sheet_name)))
+                    if col not in columns_to_index
+                ]
+                build_load_indexes(cursor, sheet_table_name, columns_to_index)
                 
-                total_rows += len(df)
-                total_columns += len(df.columns)
+                total_rows += rows
+                total_columns += columns
+                loaded_tables.append((sheet_table_name, rows, columns))
                 
                 logger.info(
                     f"Loaded sheet '{sheet_name}' as table '{sheet_table_name}' "
-                    f"with {len(df)} rows and {len(df.columns)} columns"
+                    f"with {rows} rows and {columns} columns"
                 )
+                if progress is not None:
+                    progress(sum(sheet_weights[:len(loaded_tables)]) / sum(sheet_weights))
+            
+            conn.commit()
+            # Later appends and advisor index builds write through WAL, so readers are never blocked
+            conn.execute("PRAGMA journal_mode=WAL")
+        finally:
+            conn.close()
         
-        conn.commit()
-        conn.close()
+        record_table_load(
+            table_name,
+            loaded_tables,
+            file_path,
+            file_hash or compute_file_hash(file_path),
+            time.perf_counter() - start_time,
+            db_file
+        )
         
         logger.info(f"Successfully loaded file to database. Total: {total_rows} rows, {total_columns} columns")
         return total_rows, total_columns
-        
+    
     except Exception as e:
         logger.error(f"Failed to load file to database: {e}", exc_info=True)
+        _unlink_database(db_file)
         raise ValueError(f"Failed to load file to database: {e}")
+    
+    finally:
+        with _active_loads_lock:
+            _active_loads.discard(db_file)
 
 
 # =============================== REMOVE TABLE ===============================
@@ -160,62 +1217,83 @@ def remove_table_from_db(table_name: str) -> bool:
     """
     Remove a table from the database.
     
+    All tables the catalog records for the file (e.g. one per sheet) are
+    removed with their catalog entries, and the file's database is deleted.
+    
     Args:
         table_name: Name of the table to remove
-        
+    
     Returns:
         bool: True if table was removed, False if it didn't exist
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            _ensure_catalog(cursor)
+            
+            cursor.execute(
+                f"SELECT table_name, db_file FROM {CATALOG_TABLE} WHERE source_table=?",
+                (table_name,)
+            )
+            rows = cursor.fetchall()
+            removed = sorted(name for name, _ in rows)
+            db_files = {db_file for _, db_file in rows if db_file}
+            
+            cursor.execute(f"DELETE FROM {CATALOG_TABLE} WHERE source_table=?", (table_name,))
+            _bump_catalog_version(cursor)
+            
+            from src.app.utils.index_advisor import forget_tables
+            forget_tables(removed, cursor)
         
-        # Check if table exists
-        cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-            (table_name,)
-        )
+        # Deleting the file replaces DROP TABLE (and leaves no free pages behind)
+        for db_file in db_files:
+            _unlink_database(db_file)
         
-        if cursor.fetchone() is None:
+        if not removed:
             logger.warning(f"Table '{table_name}' does not exist in database")
-            conn.close()
             return False
         
-        # Drop the table
-        cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
-        conn.commit()
-        conn.close()
-        
-        logger.info(f"Removed table '{table_name}' from database")
+        logger.info(f"Removed table(s) {removed} from database")
         return True
-        
+    
     except sqlite3.Error as e:
         logger.error(f"Failed to remove table '{table_name}': {e}", exc_info=True)
         raise
 
 
 # =============================== GET ALL TABLES ===============================
-def get_all_table_names() -> List[str]:
+def get_all_table_names(conn: Optional[sqlite3.Connection] = None) -> List[str]:
     """
     Get list of all table names in the database.
     
+    Tables are listed from the catalog, whether or not their file database is
+    currently attached to the connection.
+    
+    Args:
+        conn: Connection to use; a pooled read connection is borrowed if omitted
+    
     Returns:
         List[str]: List of table names
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        if conn is None:
+            with read_connection() as pooled_conn:
+                return get_all_table_names(pooled_conn)
         
-        cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
-        )
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                f"SELECT table_name FROM main.{CATALOG_TABLE} WHERE db_file IS NOT NULL ORDER BY table_name"
+            )
+        except sqlite3.OperationalError:
+            # Nothing has been loaded yet
+            return []
         
         tables = [row[0] for row in cursor.fetchall()]
-        conn.close()
         
         logger.debug(f"Found {len(tables)} tables in database: {tables}")
         return tables
-        
+    
     except sqlite3.Error as e:
         logger.error(f"Failed to get table names: {e}", exc_info=True)
         return []
@@ -230,78 +1308,128 @@ def clear_database() -> int:
         int: Number of tables dropped
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get all table names
-        cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table'"
-        )
-        tables = [row[0] for row in cursor.fetchall()]
-        
-        # Drop each table
-        for table_name in tables:
-            cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
-            logger.debug(f"Dropped table: {table_name}")
+        with write_connection() as conn:
+            tables = get_all_table_names(conn)
+            cursor = conn.cursor()
+            
+            _ensure_catalog(cursor)
+            cursor.execute(f"DELETE FROM {CATALOG_TABLE}")
+            _bump_catalog_version(cursor)
+            
+            from src.app.utils.index_advisor import forget_tables
+            forget_tables(tables, cursor)
         
-        conn.commit()
-        conn.close()
+        # Every file database is now unreferenced
+        sweep_orphan_databases()
+        _drop_legacy_tables()
         
         logger.info(f"Cleared database: dropped {len(tables)} tables")
         return len(tables)
-        
+    
     except sqlite3.Error as e:
         logger.error(f"Failed to clear database: {e}", exc_info=True)
         raise
 
 
 # =============================== REBUILD DATABASE ===============================
-def rebuild_database(file_registry: Dict[str, Dict]) -> int:
+def _load_registered_file(info: Dict) -> Tuple[int, int]:
+    """Load one registered upload, then re-apply the delta files appended to it."""
+    result = load_file_to_db(
+        info["file_path"],
+        info["table_name"],
+        file_hash=info.get("file_hash") or None,
+        schema=info.get("schema")
+    )
+    if info.get("deltas"):
+        from src.app.utils.table_append import replay_deltas
+        replay_deltas(info)
+    return result
+
+
+def rebuild_database(file_registry: Dict[str, Dict], force: bool = False) -> int:
     """
-    Rebuild entire database from file registry.
+    Bring the database in line with the file registry.
+    
+    Files whose database is present and whose content hash matches the catalog
+    are kept as they are; only new, changed or missing files are re-ingested,
+    REBUILD_WORKERS at a time (each into its own database file), followed by
+    the delta files appended to them. Sources no
+    registered file owns and unreferenced database files are removed.
     
     Args:
         file_registry: Dictionary mapping file_id to file metadata
-                      Each entry should have: file_path, table_name
-        
+                      Each entry should have: file_path, table_name, file_hash
+                      (and deltas, for uploads with appended delta files)
+        force: Clear the database and reload every file from scratch
+    
     Returns:
-        int: Number of files successfully loaded
+        int: Number of files available in the database after the rebuild
     """
     try:
-        logger.info(f"Rebuilding database from {len(file_registry)} files")
+        logger.info(f"Rebuilding database from {len(file_registry)} files (force={force})")
         
-        # Clear existing database
-        clear_database()
+        if force:
+            clear_database()
+        _drop_legacy_tables()
         
-        # Load each file
+        catalog = get_catalog_entries()
+        
+        # Find each new or changed file
         loaded_count = 0
+        pending: Dict[str, Dict] = {}
         for file_id, file_info in file_registry.items():
+            file_path = file_info.get("file_path")
+            table_name = file_info.get("table_name")
+            file_hash = file_info.get("file_hash") or None
+            
+            if not file_path or not table_name:
+                logger.warning(f"Skipping file {file_id}: missing file_path or table_name")
+                continue
+            
+            # Check if file exists
+            if not Path(file_path).exists():
+                logger.warning(f"Skipping file {file_id}: file not found at {file_path}")
+                continue
+            
             try:
-                file_path = file_info.get("file_path")
-                table_name = file_info.get("table_name")
-                
-                if not file_path or not table_name:
-                    logger.warning(f"Skipping file {file_id}: missing file_path or table_name")
-                    continue
-                
-                # Check if file exists
-                if not Path(file_path).exists():
-                    logger.warning(f"Skipping file {file_id}: file not found at {file_path}")
+                if _is_file_current(catalog.get(table_name, []), file_path, file_hash):
+                    logger.info(f"Table '{table_name}' is up to date, skipping reload")
+                    loaded_count += 1
                     continue
-                
-                # Load to database
-                load_file_to_db(file_path, table_name)
-                loaded_count += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to load file {file_id} during rebuild: {e}", exc_info=True)
+            except OSError as e:
+                logger.error(f"Failed to check file {file_id} during rebuild: {e}", exc_info=True)
                 continue
+            
+            pending[file_id] = file_info
         
-        logger.info(f"Database rebuild complete. Loaded {loaded_count}/{len(file_registry)} files")
-        return loaded_count
+        # Load them in parallel; each load only touches its own database file
+        reloaded_count = 0
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, REBUILD_WORKERS), thread_name_prefix="rebuild") as executor:
+                futures = {
+                    executor.submit(_load_registered_file, info): file_id
+                    for file_id, info in pending.items()
+                }
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                        loaded_count += 1
+                        reloaded_count += 1
+                    except Exception as e:
+                        logger.error(f"Failed to load file {futures[future]} during rebuild: {e}", exc_info=True)
+        
+        # Remove sources no registered file owns any more
+        registered = {info.get("table_name") for info in file_registry.values()}
+        for source in set(get_catalog_entries()) - registered:
+            remove_table_from_db(source)
+        orphans = sweep_orphan_databases()
         
+        logger.info(
+            f"Database rebuild complete. {loaded_count}/{len(file_registry)} files available, "
+            f"{reloaded_count} reloaded, {orphans} orphaned database file(s) removed"
+        )
+        return loaded_count
+    
     except Exception as e:
         logger.error(f"Failed to rebuild database: {e}", exc_info=True)
         raise
-
-
@@ -0,0 +1,202 @@
+# =============================== FILE PURPOSE ===============================
+"""
+File Formats - Upload formats beyond Excel/CSV: gzipped CSV, zip archives of
+CSVs, Parquet and JSON Lines.
+
+Large raw exports are cheaper to upload and keep compressed or columnar. The
+uploads are stored as sent and read in place: gzip and zip members are
+decompressed as a stream by the CSV parser (never to disk), and Parquet
+columns are read through Arrow without a text round trip.
+
+Sheets of the new formats follow the CSV convention: a single-file upload
+has one sheet, "Sheet1"; every CSV member of a zip archive is a sheet named
+after the member file.
+
+This module provides:
+- SUPPORTED_EXTENSIONS, get_file_extension / get_file_stem: upload file names
+  with compound suffixes (".csv.gz")
+- is_csv_file / is_csv_source: files read with the CSV parser
+- list_zip_members / open_csv: CSV sources of plain, gzipped and zipped files
+- uncompressed_size: decompressed size of an upload (streaming decisions)
+- parquet_column_names / read_parquet_frame: projected Parquet reads
+- jsonl_column_names / read_jsonl_frame: JSON Lines reads
+"""
+
+# =============================== IMPORTS ===============================
+import json
+import os
+import struct
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from src.app.configs.logger_config import get_logger
+
+try:
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    pq = None
+    PARQUET_AVAILABLE = False
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-File-Formats")
+
+# =============================== CONSTANTS ===============================
+# Accepted upload extensions; compound suffixes are matched before single ones
+SUPPORTED_EXTENSIONS = (".xlsx", ".xls", ".csv", ".csv.gz", ".zip", ".parquet", ".jsonl")
+COMPOUND_EXTENSIONS = (".csv.gz",)
+# Files read with the CSV parser by path (pandas and DuckDB decompress .gz themselves)
+CSV_EXTENSIONS = (".csv", ".csv.gz")
+# Leading JSON Lines records read to list the columns of a file
+JSONL_HEADER_ROWS = int(os.getenv("JSONL_HEADER_ROWS", "1000"))
+
+
+# =============================== FILE NAMES ===============================
+def get_file_extension(file_name: Union[str, Path]) -> str:
+    """Lower-case extension of a file name, e.g. ".csv.gz" for "sales.CSV.gz"."""
+    name = Path(file_name).name.lower()
+    for extension in COMPOUND_EXTENSIONS:
+        if name.endswith(extension) and len(name) > len(extension):
+            return extension
+    return Path(name).suffix
+
+
+def get_file_stem(file_name: Union[str, Path]) -> str:
+    """File name without its (possibly compound) extension: "sales.csv.gz" -> "sales"."""
+    name = Path(file_name).name
+    extension = get_file_extension(name)
+    return name[:len(name) - len(extension)] if extension else name
+
+
+def is_csv_file(file_path: Union[str, Path]) -> bool:
+    """Whether a file is one CSV, plain or gzipped."""
+    return get_file_extension(file_path) in CSV_EXTENSIONS
+
+
+def is_csv_source(file_path: Union[str, Path]) -> bool:
+    """Whether a file holds CSV data: one CSV (plain or gzipped) or a zip archive of CSVs."""
+    return is_csv_file(file_path) or get_file_extension(file_path) == ".zip"
+
+
+# =============================== CSV SOURCES ===============================
+def list_zip_members(file_path: str) -> Dict[str, str]:
+    """
+    CSV members of a zip archive by sheet name, in archive order.
+
+    A member's sheet name is its file name without ".csv"; members with the
+    same file name in different folders keep their folder in the name.
+    Folders, hidden files and macOS resource forks are skipped.
+
+    Raises:
+        ValueError: If the archive holds no CSV file
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        members = [
+            info.filename for info in archive.infolist()
+            if not info.is_dir()
+            and info.filename.lower().endswith(".csv")
+            and not info.filename.startswith("__MACOSX/")
+            and not PurePosixPath(info.filename).name.startswith(".")
+        ]
+    if not members:
+        raise ValueError(f"No CSV file found in zip archive {Path(file_path).name}")
+
+    stems = [PurePosixPath(member).stem for member in members]
+    return {
+        stem if stems.count(stem) == 1 else member[:-len(".csv")]: member
+        for stem, member in zip(stems, members)
+    }
+
+
+@contextmanager
+def open_csv(file_path: str, sheet_name: str = "Sheet1") -> Iterator[Union[str, IO[bytes]]]:
+    """
+    Open one CSV of an upload for pd.read_csv.
+
+    Plain and gzipped CSVs are handed over by path (pandas decompresses .gz
+    while parsing); a zip member is opened as a stream, so the archive is
+    never extracted. Keep the context open while a chunked reader runs.
+    """
+    if get_file_extension(file_path) != ".zip":
+        yield file_path
+        return
+
+    members = list_zip_members(file_path)
+    if sheet_name not in members:
+        raise ValueError(f"Sheet '{sheet_name}' not found in zip archive {Path(file_path).name}")
+    with zipfile.ZipFile(file_path) as archive, archive.open(members[sheet_name]) as handle:
+        yield handle
+
+
+def uncompressed_size(file_path: str) -> int:
+    """
+    Size in bytes of an upload's data once decompressed.
+
+    Zip archives record the size of each member; gzip files end with the
+    size modulo 4 GiB, so the stored size is the lower bound for huge files.
+    """
+    path = Path(file_path)
+    extension = get_file_extension(path)
+    if extension == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            return sum(info.file_size for info in archive.infolist())
+    size = path.stat().st_size
+    if extension == ".csv.gz" and size >= 4:
+        with open(path, "rb") as f:
+            f.seek(-4, os.SEEK_END)
+            size = max(size, struct.unpack("<I", f.read(4))[0])
+    return size
+
+
+# =============================== PARQUET ===============================
+def _require_parquet() -> None:
+    if not PARQUET_AVAILABLE:
+        raise ValueError("Parquet uploads require pyarrow, which is not installed")
+
+
+def parquet_column_names(file_path: str) -> List[str]:
+    """Column names of a Parquet file, from its footer (no data is read)."""
+    _require_parquet()
+    return list(pq.read_schema(file_path).names)
+
+
+def read_parquet_frame(file_path: str, usecols: Optional[Callable[[Any], bool]] = None) -> pd.DataFrame:
+    """
+    Read a Parquet file (only the columns usecols accepts) into a DataFrame.
+
+    Unselected columns are never decoded. The file is memory-mapped and the
+    Arrow buffers are released column by column as they are handed to pandas,
+    so numeric columns without nulls are not copied and the Arrow copy of the
+    data never coexists with the whole DataFrame.
+    """
+    _require_parquet()
+    names = parquet_column_names(file_path)
+    selected = [name for name in names if usecols is None or usecols(name)]
+    table = pq.read_table(file_path, columns=selected, memory_map=True)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+# =============================== JSON LINES ===============================
+def _flatten_nested(df: pd.DataFrame) -> pd.DataFrame:
+    """Store nested objects/arrays of JSON records as JSON text (SQLite has no such type)."""
+    for col in df.columns:
+        if df[col].dtype == object and df[col].map(lambda value: isinstance(value, (dict, list))).any():
+            df[col] = df[col].map(lambda value: json.dumps(value) if isinstance(value, (dict, list)) else value)
+    return df
+
+
+def jsonl_column_names(file_path: str) -> List[str]:
+    """Column names of a JSON Lines file, from its first JSONL_HEADER_ROWS records."""
+    return [str(col) for col in pd.read_json(file_path, lines=True, nrows=JSONL_HEADER_ROWS).columns]
+
+
+def read_jsonl_frame(file_path: str, usecols: Optional[Callable[[Any], bool]] = None) -> pd.DataFrame:
+    """Read a JSON Lines file (one record per line) into a DataFrame, keeping the columns usecols accepts."""
+    df = pd.read_json(file_path, lines=True)
+    if usecols is not None:
+        df = df.drop(columns=[col for col in df.columns if not usecols(col)])
+    return _flatten_nested(df)
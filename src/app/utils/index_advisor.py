@@ -0,0 +1,537 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Index Advisor - Creates and retires SQLite indexes based on schema profiles and query usage.
+
+This module provides:
+- Indexes on columns the schema profile flags as potential primary keys
+- A query log of columns used in WHERE/JOIN predicates of executed queries
+- Automatic indexes on columns that are filtered or joined on repeatedly
+- Persistence of index choices across restarts (re-applied after table reloads)
+- Index builds while a file's database is loaded, so reloaded tables go live already indexed
+- Dropping of query-driven indexes that have gone unused (schema key indexes are kept)
+"""
+
+# =============================== IMPORTS ===============================
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.app.configs.logger_config import get_logger
+from src.app.utils.database_manager import write_connection, get_physical_table_name, attach_table_databases
+from src.app.utils.schema_generator import get_schema_sheet_count
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-Index-Advisor")
+
+# =============================== CONSTANTS ===============================
+ADVISOR_TABLE = "_index_advisor"
+QUERY_STATS_TABLE = "_query_column_stats"
+
+# Queries that must filter/join on a column before it gets an index
+INDEX_MIN_QUERY_HITS = int(os.getenv("INDEX_MIN_QUERY_HITS", "3"))
+# Advisor indexes not used for this many days are dropped
+INDEX_IDLE_DAYS = float(os.getenv("INDEX_IDLE_DAYS", "14"))
+# Upper bound on primary-key-driven indexes per table
+MAX_PK_INDEXES_PER_TABLE = int(os.getenv("MAX_PK_INDEXES_PER_TABLE", "2"))
+# Only these inferred types are worth a key index (unique floats rarely are)
+PK_INDEX_TYPES = {"INTEGER", "TEXT"}
+# How often the idle-index sweep runs at most
+IDLE_SWEEP_INTERVAL_SECONDS = 3600
+# Reason recorded for schema-driven key indexes; apply_schema_indexes recreates
+# them on every load, so the idle sweep never drops them
+SCHEMA_INDEX_REASON = "primary_key"
+
+# Identifier on either side of a comparison: col = 'x', t.col IN (...), a.id = b.id
+_IDENT = r'(?:[A-Za-z_][\w]*|"[^"]+"|`[^`]+`|\[[^\]]+\])'
+_QUALIFIED = rf'{_IDENT}(?:\s*\.\s*{_IDENT})?'
+_OPERATOR = r'(?:==|=|!=|<>|<=|>=|<|>|\bNOT\s+IN\b|\bIN\b|\bNOT\s+LIKE\b|\bLIKE\b|\bBETWEEN\b|\bIS\b|\bGLOB\b)'
+_PREDICATE_LEFT = re.compile(rf'({_QUALIFIED})\s*{_OPERATOR}', re.IGNORECASE)
+_PREDICATE_RIGHT = re.compile(rf'(?:==|=|!=|<>|<=|>=|<|>)\s*({_QUALIFIED})', re.IGNORECASE)
+_SQL_KEYWORDS = {"null", "not", "and", "or", "true", "false", "select", "case", "when", "then", "else", "end"}
+
+# =============================== IN-MEMORY QUERY LOG ===============================
+_pending_hits: Counter = Counter()
+_pending_lock = threading.Lock()
+_flush_thread: Optional[threading.Thread] = None
+_last_idle_sweep = 0.0
+
+
+# =============================== TABLE SETUP ===============================
+def _ensure_tables(cursor: sqlite3.Cursor) -> None:
+    """Create the advisor bookkeeping tables if they do not exist yet."""
+    cursor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {ADVISOR_TABLE} (
+            table_name TEXT NOT NULL,
+            column_name TEXT NOT NULL,
+            index_name TEXT NOT NULL,
+            reason TEXT NOT NULL,
+            created_at REAL,
+            last_used_at REAL,
+            PRIMARY KEY (table_name, column_name)
+        )
+        """
+    )
+    cursor.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {QUERY_STATS_TABLE} (
+            table_name TEXT NOT NULL,
+            column_name TEXT NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0,
+            last_seen REAL,
+            PRIMARY KEY (table_name, column_name)
+        )
+        """
+    )
+
+
+# =============================== HELPERS ===============================
+def _quote(identifier: str) -> str:
+    """Quote an SQL identifier."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _index_name(table_name: str, column_name: str) -> str:
+    """Build a deterministic, SQL-safe index name for a column."""
+    return "ix_" + re.sub(r"\W", "_", f"{table_name}__{column_name}")
+
+
+def _table_columns(cursor: sqlite3.Cursor, table_name: str, schema: str = "main") -> Set[str]:
+    """Return the column names of a table (empty if it does not exist)."""
+    cursor.execute(f"PRAGMA {_quote(schema)}.table_info({_quote(table_name)})")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def _find_column_index(cursor: sqlite3.Cursor, table_name: str, column_name: str, schema: str) -> Optional[str]:
+    """Return the name of an existing single-column index on a column, if any."""
+    cursor.execute(f"PRAGMA {_quote(schema)}.index_list({_quote(table_name)})")
+    for index_name in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f"PRAGMA {_quote(schema)}.index_info({_quote(index_name)})")
+        if [row[2] for row in cursor.fetchall()] == [column_name]:
+            return index_name
+    return None
+
+
+def _create_index(
+    cursor: sqlite3.Cursor,
+    table_name: str,
+    column_name: str,
+    reason: str,
+    schema: str
+) -> Optional[str]:
+    """
+    Create an index (or adopt an existing one) and record it in the advisor table.
+
+    The table's file database must be attached under the given schema name. A
+    query-driven index that turns out to be a schema key index is recorded as one.
+    """
+    if column_name not in _table_columns(cursor, table_name, schema):
+        return None
+
+    index_name = _find_column_index(cursor, table_name, column_name, schema) or _index_name(table_name, column_name)
+    start_time = time.perf_counter()
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS {_quote(schema)}.{_quote(index_name)} "
+        f"ON {_quote(table_name)} ({_quote(column_name)})"
+    )
+    now = time.time()
+    cursor.execute(
+        f"""
+        INSERT INTO {ADVISOR_TABLE} VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(table_name, column_name) DO UPDATE SET
+            index_name=excluded.index_name,
+            reason=CASE WHEN excluded.reason = ? THEN excluded.reason ELSE reason END
+        """,
+        (table_name, column_name, index_name, reason, now, now, SCHEMA_INDEX_REASON)
+    )
+    logger.info(
+        f"Index '{index_name}' on {table_name}({column_name}) ready "
+        f"({reason}, {time.perf_counter() - start_time:.2f}s)"
+    )
+    return index_name
+
+
+# =============================== SCHEMA-DRIVEN INDEXES ===============================
+def get_key_index_columns(table_schema: Dict[str, Any]) -> List[str]:
+    """
+    Columns of one schema table that deserve a primary-key index.
+
+    Args:
+        table_schema: One entry of schema["tables"]
+
+    Returns:
+        List[str]: At most MAX_PK_INDEXES_PER_TABLE column names
+    """
+    candidates = [
+        col["name"] for col in (table_schema or {}).get("columns", [])
+        if col.get("is_potential_primary_key") and col.get("type") in PK_INDEX_TYPES
+    ]
+    return candidates[:MAX_PK_INDEXES_PER_TABLE]
+
+
+def apply_schema_indexes(table_name: str, schema: Dict[str, Any]) -> List[str]:
+    """
+    Index the columns the schema profile flags as potential primary keys.
+
+    Args:
+        table_name: Table name derived for the uploaded file
+        schema: Schema produced by generate_schema for that file
+
+    Returns:
+        List[str]: Names of the indexes that exist for those columns
+    """
+    tables = (schema or {}).get("tables", [])
+    created = []
+
+    try:
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            _ensure_tables(cursor)
+
+            sheet_count = get_schema_sheet_count(schema, len(tables))
+            physical_names = {
+                get_physical_table_name(table_name, table["name"], sheet_count): table
+                for table in tables
+            }
+            schemas = attach_table_databases(conn, physical_names)
+
+            for physical_name, table in physical_names.items():
+                if physical_name not in schemas:
+                    continue
+                for column_name in get_key_index_columns(table):
+                    index_name = _create_index(
+                        cursor, physical_name, column_name, SCHEMA_INDEX_REASON, schemas[physical_name]
+                    )
+                    if index_name:
+                        created.append(index_name)
+    except sqlite3.Error as e:
+        logger.error(f"Failed to apply schema indexes for '{table_name}': {e}", exc_info=True)
+
+    return created
+
+
+def reapply_indexes(table_names: Iterable[str]) -> int:
+    """
+    Re-create recorded advisor indexes after tables were (re)loaded.
+
+    Advisor rows whose column no longer exists are discarded.
+
+    Args:
+        table_names: Tables that were just created or replaced
+
+    Returns:
+        int: Number of indexes re-created
+    """
+    table_names = list(table_names)
+    if not table_names:
+        return 0
+
+    restored = 0
+    try:
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            _ensure_tables(cursor)
+
+            placeholders = ", ".join("?" for _ in table_names)
+            cursor.execute(
+                f"SELECT table_name, column_name, reason FROM {ADVISOR_TABLE} "
+                f"WHERE table_name IN ({placeholders})",
+                table_names
+            )
+            recorded = cursor.fetchall()
+            schemas = attach_table_databases(conn, {row[0] for row in recorded})
+
+            for table_name, column_name, reason in recorded:
+                schema = schemas.get(table_name)
+                if schema and _create_index(cursor, table_name, column_name, reason, schema):
+                    restored += 1
+                else:
+                    cursor.execute(
+                        f"DELETE FROM {ADVISOR_TABLE} WHERE table_name=? AND column_name=?",
+                        (table_name, column_name)
+                    )
+    except sqlite3.Error as e:
+        logger.error(f"Failed to re-apply indexes for {table_names}: {e}", exc_info=True)
+
+    return restored
+
+
+def get_index_columns(table_names: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Columns the advisor has indexed, per table.
+
+    Args:
+        table_names: Tables about to be (re)loaded
+
+    Returns:
+        Dict[str, List[str]]: table name -> indexed column names
+    """
+    table_names = list(table_names)
+    columns: Dict[str, List[str]] = {}
+    if not table_names:
+        return columns
+
+    with write_connection() as conn:
+        cursor = conn.cursor()
+        _ensure_tables(cursor)
+        placeholders = ", ".join("?" for _ in table_names)
+        cursor.execute(
+            f"SELECT table_name, column_name FROM {ADVISOR_TABLE} WHERE table_name IN ({placeholders})",
+            table_names
+        )
+        for table_name, column_name in cursor.fetchall():
+            columns.setdefault(table_name, []).append(column_name)
+    return columns
+
+
+def build_load_indexes(cursor: sqlite3.Cursor, table_name: str, columns: Iterable[str]) -> int:
+    """
+    Build indexes on a table of a file database that is still being loaded.
+
+    reapply_indexes adopts these indexes once the catalog points at the new
+    database, so nothing is built while the table is live.
+
+    Args:
+        cursor: Cursor of the file database being built
+        table_name: Table just loaded
+        columns: Columns to index (advisor choices and schema key columns)
+
+    Returns:
+        int: Number of indexes built
+    """
+    available = _table_columns(cursor, table_name)
+    built = 0
+    for column_name in columns:
+        if column_name not in available:
+            continue
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {_quote(_index_name(table_name, column_name))} "
+            f"ON {_quote(table_name)} ({_quote(column_name)})"
+        )
+        built += 1
+
+    if built:
+        logger.info(f"Built {built} index(es) on '{table_name}' before it went live")
+    return built
+
+
+def forget_tables(table_names: Iterable[str], cursor: sqlite3.Cursor) -> None:
+    """
+    Remove advisor and query-log rows of dropped tables.
+
+    Args:
+        table_names: Tables that were dropped
+        cursor: Cursor of the write transaction that dropped them
+    """
+    table_names = list(table_names)
+    if not table_names:
+        return
+
+    _ensure_tables(cursor)
+    placeholders = ", ".join("?" for _ in table_names)
+    for bookkeeping_table in (ADVISOR_TABLE, QUERY_STATS_TABLE):
+        cursor.execute(
+            f"DELETE FROM {bookkeeping_table} WHERE table_name IN ({placeholders})",
+            table_names
+        )
+
+
+# =============================== QUERY LOG ===============================
+def _strip_identifier(identifier: str) -> str:
+    """Drop quoting and any table qualifier from an identifier."""
+    name = identifier.split(".")[-1].strip()
+    return name.strip('"`[]').strip()
+
+
+def extract_predicate_columns(query: str) -> Set[str]:
+    """
+    Find the column names a query compares in WHERE/ON/HAVING predicates.
+
+    Args:
+        query: SQL query text
+
+    Returns:
+        Set[str]: Lower-cased column names (without table qualifiers)
+    """
+    # String literals must not be mistaken for identifiers
+    text = re.sub(r"'(?:[^']|'')*'", "''", query)
+
+    columns = set()
+    for pattern in (_PREDICATE_LEFT, _PREDICATE_RIGHT):
+        for match in pattern.finditer(text):
+            name = _strip_identifier(match.group(1))
+            if name and not name[0].isdigit() and name.lower() not in _SQL_KEYWORDS:
+                columns.add(name.lower())
+    return columns
+
+
+class ColumnReadTracker:
+    """
+    SQLite authorizer that records which (table, column) pairs a statement reads.
+
+    Install it with conn.set_authorizer(tracker) before executing a query and
+    remove it afterwards; it never denies anything.
+    """
+
+    def __init__(self):
+        self.reads: Set[Tuple[str, str]] = set()
+
+    def __call__(self, action, arg1, arg2, db_name, trigger) -> int:
+        if action == sqlite3.SQLITE_READ and arg1 and arg2 and not arg1.startswith(("sqlite_", "_")):
+            self.reads.add((arg1, arg2))
+        return sqlite3.SQLITE_OK
+
+
+def record_query(query: str, column_reads: Set[Tuple[str, str]]) -> None:
+    """
+    Log the predicate columns of an executed query.
+
+    Hits are buffered in memory and flushed by a background thread, which also
+    creates indexes for columns that crossed INDEX_MIN_QUERY_HITS, so query
+    execution never waits on the write connection.
+
+    Args:
+        query: SQL query that was executed
+        column_reads: (table, column) pairs read by the query (see ColumnReadTracker)
+    """
+    predicate_columns = extract_predicate_columns(query)
+    used = [
+        (table_name, column_name)
+        for table_name, column_name in column_reads
+        if column_name.lower() in predicate_columns
+    ]
+    if not used:
+        return
+
+    global _flush_thread
+    with _pending_lock:
+        _pending_hits.update(used)
+        if _flush_thread is None or not _flush_thread.is_alive():
+            _flush_thread = threading.Thread(target=_flush_and_advise, name="index-advisor", daemon=True)
+            _flush_thread.start()
+
+
+def _flush_and_advise() -> None:
+    """Persist buffered query hits, create earned indexes and retire idle ones."""
+    with _pending_lock:
+        hits = dict(_pending_hits)
+        _pending_hits.clear()
+    if not hits:
+        return
+
+    now = time.time()
+    try:
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            _ensure_tables(cursor)
+
+            cursor.executemany(
+                f"""
+                INSERT INTO {QUERY_STATS_TABLE} (table_name, column_name, hits, last_seen)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(table_name, column_name)
+                DO UPDATE SET hits = hits + excluded.hits, last_seen = excluded.last_seen
+                """,
+                [(table, column, count, now) for (table, column), count in hits.items()]
+            )
+            cursor.executemany(
+                f"UPDATE {ADVISOR_TABLE} SET last_used_at=? WHERE table_name=? AND column_name=?",
+                [(now, table, column) for table, column in hits]
+            )
+
+            # Columns that earned an index but do not have one yet
+            cursor.execute(
+                f"""
+                SELECT s.table_name, s.column_name FROM {QUERY_STATS_TABLE} s
+                LEFT JOIN {ADVISOR_TABLE} a
+                  ON a.table_name = s.table_name AND a.column_name = s.column_name
+                WHERE s.hits >= ? AND a.index_name IS NULL
+                """,
+                (INDEX_MIN_QUERY_HITS,)
+            )
+            earned = cursor.fetchall()
+
+            # Databases can only be attached outside a transaction
+            conn.commit()
+            schemas = attach_table_databases(conn, {table_name for table_name, _ in earned})
+            for table_name, column_name in earned:
+                if table_name in schemas:
+                    _create_index(cursor, table_name, column_name, "query", schemas[table_name])
+
+    except sqlite3.Error as e:
+        logger.error(f"Index advisor flush failed: {e}", exc_info=True)
+
+    sweep_idle_indexes()
+
+
+# =============================== IDLE INDEX CLEANUP ===============================
+def sweep_idle_indexes() -> List[str]:
+    """
+    Run drop_unused_indexes unless it ran less than IDLE_SWEEP_INTERVAL_SECONDS ago.
+
+    Called after each query-log flush and on startup, so idle indexes are
+    also retired when no query has been logged since the last sweep.
+
+    Returns:
+        List[str]: Names of the dropped indexes
+    """
+    global _last_idle_sweep
+    now = time.time()
+    if now - _last_idle_sweep < IDLE_SWEEP_INTERVAL_SECONDS:
+        return []
+    _last_idle_sweep = now
+    return drop_unused_indexes()
+
+
+def drop_unused_indexes(max_idle_days: float = INDEX_IDLE_DAYS) -> List[str]:
+    """
+    Drop query-driven indexes whose column has not been queried for max_idle_days.
+
+    The column's query-log hits are reset so it has to earn an index again.
+    Schema key indexes (SCHEMA_INDEX_REASON) are kept: apply_schema_indexes
+    would recreate them on the next startup or reload anyway.
+
+    Args:
+        max_idle_days: Idle time after which an index is dropped
+
+    Returns:
+        List[str]: Names of the dropped indexes
+    """
+    cutoff = time.time() - max_idle_days * 86400
+    dropped = []
+
+    try:
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            _ensure_tables(cursor)
+
+            cursor.execute(
+                f"SELECT table_name, column_name, index_name FROM {ADVISOR_TABLE} "
+                f"WHERE last_used_at < ? AND reason != ?",
+                (cutoff, SCHEMA_INDEX_REASON)
+            )
+            for table_name, column_name, index_name in cursor.fetchall():
+                # One table at a time: attaching needs the previous transaction committed
+                conn.commit()
+                schemas = attach_table_databases(conn, [table_name])
+                if table_name in schemas:
+                    cursor.execute(f"DROP INDEX IF EXISTS {_quote(schemas[table_name])}.{_quote(index_name)}")
+                cursor.execute(
+                    f"DELETE FROM {ADVISOR_TABLE} WHERE table_name=? AND column_name=?",
+                    (table_name, column_name)
+                )
+                cursor.execute(
+                    f"UPDATE {QUERY_STATS_TABLE} SET hits=0 WHERE table_name=? AND column_name=?",
+                    (table_name, column_name)
+                )
+                dropped.append(index_name)
+    except sqlite3.Error as e:
+        logger.error(f"Failed to drop unused indexes: {e}", exc_info=True)
+
+    if dropped:
+        logger.info(f"Dropped {len(dropped)} unused index(es): {dropped}")
+    return dropped
@@ -0,0 +1,133 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Memory Usage - Peak resident memory of an operation, such as one upload.
+
+On Linux the kernel keeps the process's resident high-water mark (VmHWM in
+/proc/self/status) and lets the process reset it, which gives the true peak
+of an operation, including memory that numpy/Arrow allocate outside Python's
+allocator. Elsewhere the peak since process start (ru_maxrss) is the best
+available upper bound.
+
+The high-water mark is per process: operations running at the same time
+share it, and memory of ingestion worker processes is not included.
+
+This module provides:
+- PeakMemoryTracker: measure the peak RSS between start() and stop()
+- release_unused_memory: return memory cached by Arrow's allocator to the OS
+"""
+
+# =============================== IMPORTS ===============================
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.app.configs.logger_config import get_logger
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    PYARROW_AVAILABLE = False
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-Memory-Usage")
+
+# =============================== CONSTANTS ===============================
+PROC_STATUS = Path("/proc/self/status")
+PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+
+# =============================== HELPERS ===============================
+def _read_status_mb(field: str) -> Optional[float]:
+    """A memory field of /proc/self/status (e.g. VmRSS, VmHWM) in MB, or None."""
+    try:
+        with open(PROC_STATUS, "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _reset_peak() -> bool:
+    """Reset the process's resident high-water mark to its current RSS (Linux)."""
+    try:
+        with open(PROC_CLEAR_REFS, "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _max_rss_mb() -> Optional[float]:
+    """Peak RSS since process start (ru_maxrss: KB on Linux, bytes on macOS)."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def release_unused_memory() -> None:
+    """
+    Hand memory that Arrow's allocator keeps cached back to the OS.
+
+    Parsing builds and drops many Arrow buffers (e.g. string columns); the
+    pool otherwise keeps the freed pages for reuse, which stays in RSS.
+    """
+    if PYARROW_AVAILABLE:
+        pa.default_memory_pool().release_unused()
+
+
+# =============================== TRACKER ===============================
+class PeakMemoryTracker:
+    """
+    Peak resident memory of the process while an operation runs.
+
+    Usage:
+        tracker = PeakMemoryTracker("upload of sales.xlsx").start()
+        ...
+        report = tracker.stop()   # {"start_rss_mb", "peak_rss_mb", "peak_increase_mb", "source"}
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+        self.start_rss_mb: Optional[float] = None
+        self.exact = False
+        self.report: Optional[Dict[str, Optional[float]]] = None
+
+    def start(self) -> "PeakMemoryTracker":
+        self.exact = _reset_peak() and _read_status_mb("VmHWM") is not None
+        self.start_rss_mb = _read_status_mb("VmRSS")
+        return self
+
+    def stop(self) -> Dict[str, Optional[float]]:
+        """Report the peak RSS since start() in MB (rounded to 0.1)."""
+        peak_mb = _read_status_mb("VmHWM") if self.exact else _max_rss_mb()
+        increase_mb = (
+            peak_mb - self.start_rss_mb
+            if peak_mb is not None and self.start_rss_mb is not None else None
+        )
+        report = {
+            "start_rss_mb": None if self.start_rss_mb is None else round(self.start_rss_mb, 1),
+            "peak_rss_mb": None if peak_mb is None else round(peak_mb, 1),
+            "peak_increase_mb": None if increase_mb is None else round(increase_mb, 1),
+            "source": "VmHWM" if self.exact else "ru_maxrss",
+        }
+        logger.info(
+            f"Peak memory of {self.label}: {report['peak_rss_mb']} MB RSS "
+            f"(+{report['peak_increase_mb']} MB, {report['source']})"
+        )
+        return report
+
+    def __enter__(self) -> "PeakMemoryTracker":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.report = self.stop()
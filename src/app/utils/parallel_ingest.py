@@ -0,0 +1,218 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Parallel Ingest - Parses and profiles the sheets of a workbook across a process pool.
+
+Parsing a sheet with openpyxl and profiling its columns is CPU-bound pandas
+work that holds the GIL, so threads do not help. Each sheet is handed to a
+worker process that parses it and builds its schema entry; the parent collects
+the DataFrames and remains the single writer to the database.
+
+This module provides:
+- read_and_profile: parse + profile the selected sheets of a file (parallel
+  for multi-sheet workbooks, in-process otherwise)
+- read_sheets: parse the selected sheets (sidecar first, then parallel for workbooks)
+- shutdown_ingest_pool: stop the worker processes on application shutdown
+"""
+
+# =============================== IMPORTS ===============================
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.app.configs.logger_config import get_logger
+from src.app.utils.schema_cache import store_cached_tables
+from src.app.utils.schema_generator import (
+    EXCEL_ENGINES,
+    build_schema,
+    clean_column_names,
+    column_filter,
+    compact_frame,
+    get_cached_schema,
+    list_sheet_names,
+    profile_settings,
+    profile_sheet,
+    read_excel_file,
+    select_sheets,
+)
+from src.app.utils.sidecar_cache import read_sidecar
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-Parallel-Ingest")
+
+# =============================== CONSTANTS ===============================
+# Worker processes for sheet parsing/profiling (0 or 1 disables the pool)
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", str(os.cpu_count() or 1)))
+# Workbooks with fewer sheets are parsed in-process
+PARALLEL_MIN_SHEETS = int(os.getenv("PARALLEL_MIN_SHEETS", "2"))
+
+# =============================== WORKER POOL ===============================
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the shared worker pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking the multi-threaded API process is not safe
+            _pool = ProcessPoolExecutor(
+                max_workers=INGEST_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Started ingestion pool with {INGEST_WORKERS} worker process(es)")
+        return _pool
+
+
+def shutdown_ingest_pool() -> None:
+    """Stop the worker processes (called on application shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+# =============================== WORKERS ===============================
+def _parse_sheet(
+    file_path: str,
+    sheet_name: str,
+    profile: bool,
+    columns: Optional[List[str]] = None
+) -> Tuple[pd.DataFrame, Optional[Dict[str, Any]]]:
+    """Worker: parse one sheet (optionally only some columns) and optionally profile it."""
+    engine = EXCEL_ENGINES[Path(file_path).suffix.lower()]
+    df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine, usecols=column_filter(columns))
+    # Compact before profiling and before the frame is pickled back to the parent
+    df = compact_frame(clean_column_names(df))
+    return df, profile_sheet(sheet_name, df) if profile else None
+
+
+# =============================== HELPERS ===============================
+def _parallel_sheet_names(file_path: str, sheets: Optional[List[str]] = None) -> Optional[List[str]]:
+    """Names of the (selected) sheets if the file should be parsed by the pool, else None."""
+    if INGEST_WORKERS <= 1 or Path(file_path).suffix.lower() not in EXCEL_ENGINES:
+        return None
+    sheet_names = sheets if sheets is not None else list_sheet_names(file_path)
+    return sheet_names if len(sheet_names) >= PARALLEL_MIN_SHEETS else None
+
+
+def _run_parallel(
+    file_path: str,
+    sheet_names: List[str],
+    profile: bool,
+    columns: Optional[Dict[str, List[str]]] = None
+) -> Tuple[Dict[str, pd.DataFrame], List[Dict[str, Any]]]:
+    """Fan the sheets out to the pool and collect them in workbook order."""
+    start_time = time.perf_counter()
+    pool = _get_pool()
+    futures = [
+        pool.submit(_parse_sheet, file_path, name, profile, (columns or {}).get(name))
+        for name in sheet_names
+    ]
+
+    sheets_data: Dict[str, pd.DataFrame] = {}
+    tables: List[Dict[str, Any]] = []
+    for name, future in zip(sheet_names, futures):
+        df, table = future.result()
+        sheets_data[name] = df
+        if table is not None:
+            tables.append(table)
+
+    logger.info(
+        f"Parsed {len(sheet_names)} sheet(s) of {Path(file_path).name} across "
+        f"{min(INGEST_WORKERS, len(sheet_names))} process(es) in {time.perf_counter() - start_time:.2f}s"
+    )
+    return sheets_data, tables
+
+
+# =============================== PUBLIC API ===============================
+def read_and_profile(
+    file_path: str,
+    file_hash: Optional[str] = None,
+    sheets: Optional[List[str]] = None,
+    columns: Optional[Dict[str, List[str]]] = None
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]:
+    """
+    Parse the (selected) sheets of an uploaded file and generate their schema.
+
+    Multi-sheet workbooks are parsed and profiled in worker processes, one
+    sheet per task; other files are handled in-process. When the schema of
+    the same content is cached, the sheets are only parsed for the load.
+
+    Args:
+        file_path: Path to the uploaded Excel/CSV file
+        file_hash: SHA-256 of the file (schema cache and sidecar key)
+        sheets: Sheets to ingest (None: all)
+        columns: Sheet name -> cleaned column names to ingest (None: all)
+
+    Returns:
+        Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]: (sheets_data, schema)
+    """
+    cached_schema = get_cached_schema(file_path, file_hash, sheets, columns)
+    if cached_schema is not None:
+        sheets_data = read_sheets(file_path, file_hash, sheets, columns)
+        return {name: clean_column_names(df) for name, df in sheets_data.items()}, cached_schema
+
+    sheet_names = _parallel_sheet_names(file_path, sheets)
+    if sheet_names is None:
+        sheets_data = read_excel_file(file_path, sheets=sheets, columns=columns)
+        tables = [profile_sheet(name, df) for name, df in sheets_data.items()]
+    else:
+        sheets_data, tables = _run_parallel(file_path, sheet_names, profile=True, columns=columns)
+    store_cached_tables(file_hash, profile_settings(sheets, columns), tables)
+
+    available_sheets = list_sheet_names(file_path) if sheets is not None else None
+    return sheets_data, build_schema(file_path, tables, available_sheets, columns)
+
+
+def read_sheets(
+    file_path: str,
+    file_hash: Optional[str] = None,
+    sheets: Optional[List[str]] = None,
+    columns: Optional[Dict[str, List[str]]] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Parse the (selected) sheets of a file for loading into the database.
+
+    Sheets held by the columnar sidecar are read from it; the others (e.g.
+    sheets selected after the upload) are parsed, by the worker processes
+    for multi-sheet workbooks.
+
+    Args:
+        file_path: Path to the uploaded Excel/CSV file
+        file_hash: SHA-256 of the file (to find its sidecar)
+        sheets: Sheets to read (None: all)
+        columns: Sheet name -> cleaned column names to read (None: all)
+
+    Returns:
+        Dict[str, pd.DataFrame]: Sheets in selection (or workbook) order
+    """
+    sidecar_data = read_sidecar(file_hash)
+    reused: Dict[str, pd.DataFrame] = {}
+    if sidecar_data is not None:
+        selected = select_sheets(sidecar_data, sheets, columns)
+        if selected is not None:
+            return selected
+        if sheets is not None:
+            for name in sheets:
+                sheet = select_sheets(sidecar_data, [name], columns)
+                if sheet is not None:
+                    reused.update(sheet)
+
+    missing = [name for name in sheets if name not in reused] if sheets is not None else None
+    parallel_names = _parallel_sheet_names(file_path, missing)
+    if parallel_names is None:
+        parsed = read_excel_file(file_path, sheets=missing, columns=columns)
+    else:
+        parsed = _run_parallel(file_path, parallel_names, profile=False, columns=columns)[0]
+
+    if not reused:
+        return parsed
+    return {name: reused[name] if name in reused else parsed[name] for name in sheets}
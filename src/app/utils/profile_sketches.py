@@ -0,0 +1,209 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Profile Sketches - Fixed-size summaries of a column for approximate profiling.
+
+Exact distinct counts need a hash table as large as the column's distinct
+values; on tall tables that dominates schema generation time and memory.
+The sketches here answer the same profiling questions from a few kilobytes of
+state, are built with vectorized numpy passes and can be merged, so a column
+profiled in chunks (or appended to later) is summarized by merging sketches.
+
+This module provides:
+- hash_values: stable 64-bit hashes of a column's values
+- HyperLogLog: mergeable, serializable distinct-count estimator
+- ReservoirSample: mergeable uniform sample of a column's values
+- estimate_distinct_from_sample: distinct count of a column from a row sample
+  (for text columns, whose values are too slow to hash in full)
+"""
+
+# =============================== IMPORTS ===============================
+import base64
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# =============================== CONSTANTS ===============================
+# 2**precision registers; relative standard error is about 1.04 / sqrt(2**precision)
+DEFAULT_HLL_PRECISION = 12
+MIN_HLL_PRECISION = 4
+MAX_HLL_PRECISION = 18
+# Rows hashed at a time, so sketching a column needs a few MB whatever its length
+SKETCH_CHUNK_ROWS = 1 << 18
+
+
+# =============================== HASHING ===============================
+def hash_values(series: pd.Series) -> np.ndarray:
+    """
+    Hash the values of a column to uint64 (stable across processes).
+
+    categorize=False hashes every value directly instead of factorizing the
+    column first, which would cost as much as an exact distinct count.
+    Floats are hashed as float64, so a value hashes the same whether its
+    column was stored as float32 or float64 (integers already do).
+    """
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind == "f":
+        series = series.astype(np.float64)
+    return pd.util.hash_pandas_object(series, index=False, categorize=False).to_numpy(dtype=np.uint64)
+
+
+def _trailing_zeros(values: np.ndarray) -> np.ndarray:
+    """Count the trailing zero bits of uint64 values (64 for zero)."""
+    # ~v & (v - 1) keeps exactly the trailing zero bits of v, set to one
+    trailing_mask = ~values & (values - np.uint64(1))
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return np.bitwise_count(trailing_mask)
+    # Older numpy: (mask >> 1) + 1 is a power of two, whose float64 exponent is exact
+    counts = np.frexp(((trailing_mask >> np.uint64(1)) + np.uint64(1)).astype(np.float64))[1]
+    return np.where(trailing_mask == 0, 0, counts)
+
+
+# =============================== HYPERLOGLOG ===============================
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch over 64-bit hashes.
+
+    Sketches with the same precision merge by taking the register-wise max,
+    which equals the sketch of the combined values.
+    """
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION, registers: Optional[np.ndarray] = None):
+        if not MIN_HLL_PRECISION <= precision <= MAX_HLL_PRECISION:
+            raise ValueError(f"HyperLogLog precision must be between {MIN_HLL_PRECISION} and {MAX_HLL_PRECISION}")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8) if registers is None else registers
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of the estimate."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add_hashes(self, hashes: np.ndarray) -> "HyperLogLog":
+        """Add pre-computed uint64 hashes (see hash_values)."""
+        if len(hashes) == 0:
+            return self
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        # The top `precision` bits pick a register, the rest give the rank
+        low_bits = 64 - self.precision
+        index = (hashes >> np.uint64(low_bits)).astype(np.intp)
+        remainder = hashes & np.uint64((1 << low_bits) - 1)
+
+        rank = (np.minimum(_trailing_zeros(remainder), low_bits) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def add_series(self, series: pd.Series) -> "HyperLogLog":
+        """Add the non-null values of a column."""
+        for start in range(0, len(series), SKETCH_CHUNK_ROWS):
+            chunk = series.iloc[start:start + SKETCH_CHUNK_ROWS]
+            self.add_hashes(hash_values(chunk.dropna()))
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Fold another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> int:
+        """Estimated number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form of the sketch."""
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(self.registers.tobytes()).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        """Rebuild a sketch serialized with to_dict."""
+        registers = np.frombuffer(base64.b64decode(data["registers"]), dtype=np.uint8).copy()
+        return cls(int(data["precision"]), registers)
+
+
+# =============================== RESERVOIR SAMPLE ===============================
+class ReservoirSample:
+    """
+    Uniform sample of up to `size` values of a column.
+
+    Every value gets a random key and the sample keeps the values with the
+    smallest keys (bottom-k sampling), which is equivalent to reservoir
+    sampling but runs vectorized per chunk and merges across chunks.
+    Seeded, so profiling the same data gives the same samples.
+    """
+
+    def __init__(self, size: int, seed: int = 0):
+        self.size = size
+        self._rng = np.random.default_rng(seed)
+        self._keys = np.empty(0, dtype=np.float64)
+        self._values: List[Any] = []
+
+    def add(self, values: pd.Series) -> "ReservoirSample":
+        """Offer the non-null values of a column (or chunk of one)."""
+        values = values.dropna()
+        count = min(self.size, len(values))
+        if count == 0:
+            return self
+        # The `count` smallest of len(values) uniform keys, drawn in order in
+        # O(count), paired with `count` distinct random positions
+        keys = np.empty(count)
+        low = 0.0
+        for i, draw in enumerate(self._rng.random(count)):
+            low += (1.0 - low) * (1.0 - draw ** (1.0 / (len(values) - i)))
+            keys[i] = low
+        positions = self._rng.choice(len(values), size=count, replace=False)
+        return self._combine(keys, values.iloc[positions].tolist())
+
+    def merge(self, other: "ReservoirSample") -> "ReservoirSample":
+        """Fold another sample into this one."""
+        return self._combine(other._keys, other._values)
+
+    def _combine(self, keys: np.ndarray, values: List[Any]) -> "ReservoirSample":
+        all_keys = np.concatenate([self._keys, keys])
+        all_values = self._values + list(values)
+        order = np.argsort(all_keys, kind="stable")[:self.size]
+        self._keys = all_keys[order]
+        self._values = [all_values[i] for i in order]
+        return self
+
+    @property
+    def values(self) -> List[Any]:
+        """The sampled values."""
+        return list(self._values)
+
+
+# =============================== SAMPLE-BASED DISTINCT COUNT ===============================
+def estimate_distinct_from_sample(sample: pd.Series, population: int) -> int:
+    """
+    Estimate the distinct non-null values of a column from a uniform row sample.
+
+    Uses the guaranteed-error estimator (GEE): values seen once in the sample
+    are scaled up by sqrt(population / sample size), values seen more often are
+    counted once.
+
+    Args:
+        sample: Uniform sample of the column's non-null values
+        population: Number of non-null values in the full column
+
+    Returns:
+        int: Estimated distinct count (between the sample's and the population's)
+    """
+    if sample.empty:
+        return 0
+    frequencies = sample.value_counts(sort=False).to_numpy()
+    frequencies = frequencies[frequencies > 0]  # categoricals also count absent categories
+    singletons = int(np.count_nonzero(frequencies == 1))
+    repeated = len(frequencies) - singletons
+    estimate = math.sqrt(population / len(sample)) * singletons + repeated
+    return int(min(population, max(len(frequencies), round(estimate))))
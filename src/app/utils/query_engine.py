@@ -0,0 +1,536 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Query Engine - Pluggable execution backends for the execute_sql tool.
+
+The backend is chosen per deployment with SQL_ENGINE:
+- "sqlite" (default): pooled read-only connections to the per-file SQLite
+  databases, with the index advisor's query log
+- "duckdb": an embedded columnar engine running vectorized, multi-core scans
+  directly over the uploads' Arrow sidecars (or the uploaded CSV / gzipped
+  CSV / Parquet files; streamed workbooks are copied into DuckDB batch by batch)
+
+Both engines expose the same tables (from the catalog) with the same column
+names and value conventions (DATETIME columns compare with ISO strings,
+BOOLEAN columns hold 0/1), so the generated SQL does not depend on the backend.
+duckdb is optional; without it the SQLite engine is used.
+
+The SQL comes from a model, so both engines only read the uploaded tables:
+SQLite queries run under sql_guard's catalog-only authorizer, and the DuckDB
+connection can only read files in the uploads directory (its configuration is
+locked) and rejects queries that call table functions such as read_csv(...).
+"""
+
+# =============================== IMPORTS ===============================
+import datetime
+import decimal
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from src.app.configs.logger_config import get_logger
+from src.app.utils.database_manager import (
+    read_connection,
+    get_all_table_names,
+    get_source_versions,
+    iter_table_frames,
+    get_physical_table_name,
+    get_schema_column_types,
+    normalize_frame_for_sql,
+)
+from src.app.utils.file_formats import get_file_extension, is_csv_file
+from src.app.utils.index_advisor import ColumnReadTracker, record_query
+from src.app.utils.schema_generator import (
+    read_excel_file,
+    clean_column_names,
+    column_filter,
+    get_schema_selection,
+    get_schema_sheet_count,
+    is_streamed_schema,
+    list_sheet_names,
+)
+from src.app.utils.sidecar_cache import read_sidecar_tables
+from src.app.utils.sql_guard import ReadOnlyAuthorizer
+from src.app.utils.xlsx_stream import iter_sheet_batches
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    duckdb = None
+    DUCKDB_AVAILABLE = False
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-Query-Engine")
+
+# =============================== CONSTANTS ===============================
+SQL_ENGINE = os.getenv("SQL_ENGINE", "sqlite").lower()
+DUCKDB_THREADS = int(os.getenv("DUCKDB_THREADS", str(os.cpu_count() or 1)))
+DUCKDB_MEMORY_LIMIT = os.getenv("DUCKDB_MEMORY_LIMIT", "")
+# The only directory DuckDB may read files from (uploaded CSV/Parquet files)
+UPLOAD_DIR = Path("uploads")
+
+QueryResult = Tuple[List[str], List[tuple]]
+
+# DuckDB column types of streamed sheets, by declared SQL type (values as stored in SQLite)
+_DUCKDB_TYPES = {"INTEGER": "BIGINT", "REAL": "DOUBLE", "BOOLEAN": "INTEGER"}
+# Marks a sheet that is read with the streaming XLSX reader
+_STREAMED = object()
+
+
+# =============================== ERRORS ===============================
+class QueryExecutionError(Exception):
+    """A query was rejected or failed inside the execution engine."""
+
+
+# =============================== ENGINE INTERFACE ===============================
+class QueryEngine:
+    """Backend that runs read-only SQL over the uploaded tables."""
+
+    name = "base"
+
+    def list_tables(self) -> List[str]:
+        """Names of the tables queries can use."""
+        raise NotImplementedError
+
+    def execute(self, query: str) -> QueryResult:
+        """
+        Run a query.
+
+        Returns:
+            QueryResult: (column names, rows as tuples of JSON-serializable values)
+
+        Raises:
+            QueryExecutionError: If the engine rejects or fails the query
+        """
+        raise NotImplementedError
+
+    def execute_batches(self, query: str, batch_size: int) -> Iterator[QueryResult]:
+        """
+        Run a query and yield its rows in batches, without holding the whole result.
+
+        Every batch carries the column names; the first batch is yielded even
+        for an empty result. The engine's connection stays borrowed until the
+        iterator is exhausted or closed.
+
+        Raises:
+            QueryExecutionError: If the engine rejects or fails the query
+        """
+        columns, rows = self.execute(query)
+        for start in range(0, max(1, len(rows)), batch_size):
+            yield columns, rows[start:start + batch_size]
+
+    def close(self) -> None:
+        """Release the engine's connections."""
+
+
+# =============================== SQLITE ENGINE ===============================
+class SQLiteEngine(QueryEngine):
+    """
+    Runs queries on pooled read-only SQLite connections.
+
+    Every statement is prepared under sql_guard's ReadOnlyAuthorizer, so it can
+    only read cataloged tables (not sqlite_master or the internal catalog,
+    advisor and version tables), whichever path the query comes from.
+    """
+
+    name = "sqlite"
+
+    def list_tables(self) -> List[str]:
+        return get_all_table_names()
+
+    def _execute_authorized(self, conn: sqlite3.Connection, query: str) -> Tuple[sqlite3.Cursor, set]:
+        """
+        Execute a query under the catalog-only authorizer, tracking which columns it reads.
+
+        Returns:
+            Tuple[sqlite3.Cursor, set]: The executed cursor and its (table, column) reads
+
+        Raises:
+            QueryExecutionError: If the authorizer denied the query
+        """
+        guard = ReadOnlyAuthorizer(get_all_table_names(conn))
+        tracker = ColumnReadTracker()
+
+        def authorize(action, arg1, arg2, db_name, trigger) -> int:
+            verdict = guard(action, arg1, arg2, db_name, trigger)
+            if verdict == sqlite3.SQLITE_OK:
+                tracker(action, arg1, arg2, db_name, trigger)
+            return verdict
+
+        cursor = conn.cursor()
+        conn.set_authorizer(authorize)
+        try:
+            cursor.execute(query)
+        except sqlite3.DatabaseError as e:
+            if guard.reason:
+                raise QueryExecutionError(guard.reason) from e
+            raise
+        finally:
+            conn.set_authorizer(None)
+        return cursor, tracker.reads
+
+    def execute(self, query: str) -> QueryResult:
+        try:
+            with read_connection(query) as conn:
+                cursor, reads = self._execute_authorized(conn, query)
+                rows = cursor.fetchall()
+                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+        except sqlite3.Error as e:
+            raise QueryExecutionError(str(e)) from e
+
+        record_query(query, reads)
+        return columns, rows
+
+    def execute_batches(self, query: str, batch_size: int) -> Iterator[QueryResult]:
+        try:
+            with read_connection(query) as conn:
+                cursor, reads = self._execute_authorized(conn, query)
+                record_query(query, reads)
+
+                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                rows = cursor.fetchmany(batch_size)
+                yield columns, rows
+                while len(rows) == batch_size:
+                    rows = cursor.fetchmany(batch_size)
+                    if rows:
+                        yield columns, rows
+        except sqlite3.Error as e:
+            raise QueryExecutionError(str(e)) from e
+
+
+# =============================== DUCKDB ENGINE ===============================
+def _quote(identifier: str) -> str:
+    """Quote an SQL identifier."""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def _to_json_value(value: Any) -> Any:
+    """Convert DuckDB result values to the representation SQLite would return."""
+    if isinstance(value, datetime.datetime):
+        if value.time() == datetime.time(0):
+            return value.strftime("%Y-%m-%d")
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return value
+
+
+def _find_table_function(node: Any) -> Optional[str]:
+    """Name of the first table function called in a json_serialize_sql tree, if any."""
+    if isinstance(node, dict):
+        if node.get("type") == "TABLE_FUNCTION":
+            return str((node.get("function") or {}).get("function_name") or "table function")
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    for child in children:
+        found = _find_table_function(child)
+        if found is not None:
+            return found
+    return None
+
+
+class DuckDBEngine(QueryEngine):
+    """
+    Runs queries in an in-memory DuckDB database.
+
+    Every cataloged table is exposed as a view over its source: the memory-mapped
+    Arrow sidecar when there is one, otherwise the uploaded CSV (scanned by
+    DuckDB) or the parsed sheets; files with appended rows are read back from
+    their SQLite tables. Views are refreshed whenever the catalog points a
+    source at a new database file or rows are appended, i.e. after every
+    (re)load, append or delete.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, threads: int = DUCKDB_THREADS, memory_limit: str = DUCKDB_MEMORY_LIMIT):
+        self._conn = duckdb.connect(":memory:")
+        self._conn.execute(f"SET threads TO {max(1, threads)}")
+        if memory_limit:
+            self._conn.execute(f"SET memory_limit = '{memory_limit}'")
+        # Views scan uploads in place; no other file (or extension) is reachable,
+        # and the generated SQL cannot change these settings back
+        self._conn.execute("SET allowed_directories = ?", [[UPLOAD_DIR.resolve().as_posix() + "/"]])
+        self._conn.execute("SET enable_external_access = false")
+        self._conn.execute("SET lock_configuration = true")
+        # One connection holds the registered sources; DuckDB parallelizes each query itself
+        self._lock = threading.Lock()
+        self._loaded: Dict[str, str] = {}
+        self._views: Dict[str, List[str]] = {}
+
+    # --------------------------- catalog sync ---------------------------
+    def _sync(self) -> None:
+        """Register new or reloaded sources and drop deleted ones."""
+        with read_connection() as conn:
+            current = get_source_versions(conn)
+        if current == self._loaded:
+            return
+
+        from src.app.utils.shared_registry import get_file_registry_from_disk
+        registry = {info.get("table_name"): info for info in get_file_registry_from_disk().values()}
+
+        for source in list(self._loaded):
+            if current.get(source) != self._loaded[source]:
+                self._drop_source(source)
+
+        for source, version in current.items():
+            if source in self._loaded:
+                continue
+            info = registry.get(source)
+            if info is None:
+                logger.warning(f"No registry entry for table '{source}'; not available to DuckDB")
+            else:
+                try:
+                    self._register_source(source, info)
+                except Exception as e:
+                    logger.error(f"Failed to register '{source}' with DuckDB: {e}", exc_info=True)
+            self._loaded[source] = version
+
+    def _drop_source(self, source: str) -> None:
+        """Remove the views (and registered data) of one source."""
+        for view in self._views.pop(source, []):
+            self._conn.execute(f"DROP VIEW IF EXISTS {_quote(view)}")
+            # Registered DataFrames go first: DuckDB sees them as views, not tables
+            try:
+                self._conn.unregister(f"__raw_{view}")
+            except Exception:
+                pass
+            self._conn.execute(f"DROP TABLE IF EXISTS {_quote(f'__raw_{view}')}")
+        self._loaded.pop(source, None)
+
+    def _register_source(self, source: str, info: Dict[str, Any]) -> None:
+        """Create one view per loaded sheet of an uploaded file."""
+        file_path = info.get("file_path", "")
+        schema = info.get("schema")
+        column_types = get_schema_column_types(schema)
+        selected_sheets, selected_columns = get_schema_selection(schema)
+        selected_columns = selected_columns or {}
+
+        sheets: Optional[Dict[str, Any]] = None
+        origin = "sidecar"
+        if info.get("deltas"):
+            # The upload alone lacks the appended rows: read the loaded tables back
+            names = selected_sheets or list_sheet_names(file_path)
+            sheet_count = get_schema_sheet_count(schema, len(names))
+            sheets = {
+                name: pd.concat(
+                    list(iter_table_frames(get_physical_table_name(source, name, sheet_count))), ignore_index=True
+                )
+                for name in names
+            }
+            origin = "appended tables"
+        else:
+            sheets = read_sidecar_tables(info.get("file_hash") or None)
+        if sheets is not None and selected_sheets is not None and origin == "sidecar":
+            sheets = {name: sheets[name] for name in selected_sheets} if set(selected_sheets) <= set(sheets) else None
+        if sheets is None and (is_csv_file(file_path) or get_file_extension(file_path) == ".parquet"):
+            sheets = {"Sheet1": Path(file_path)}
+            origin = get_file_extension(file_path)[1:]
+        elif sheets is None and is_streamed_schema(schema):
+            sheets = {name: _STREAMED for name in selected_sheets or list_sheet_names(file_path)}
+            origin = "streamed workbook"
+        elif sheets is None:
+            sheets = {
+                name: clean_column_names(df)
+                for name, df in read_excel_file(file_path, sheets=selected_sheets, columns=selected_columns).items()
+            }
+            origin = "parsed file"
+
+        sheet_count = get_schema_sheet_count(schema, len(sheets))
+        views = []
+        for sheet_name, data in sheets.items():
+            view = get_physical_table_name(source, sheet_name, sheet_count)
+            if isinstance(data, Path) and get_file_extension(data) == ".parquet":
+                # Parquet columns are scanned in place, typed as stored
+                relation = f"read_parquet({self._literal(data.resolve().as_posix())})"
+            elif isinstance(data, Path):
+                relation = f"read_csv({self._literal(data.resolve().as_posix())}, header = true)"
+            elif data is _STREAMED:
+                relation = _quote(f"__raw_{view}")
+                self._copy_streamed_sheet(
+                    file_path, str(sheet_name), f"__raw_{view}",
+                    column_types.get(str(sheet_name), {}), selected_columns.get(str(sheet_name))
+                )
+            else:
+                relation = _quote(f"__raw_{view}")
+                self._conn.register(f"__raw_{view}", data)
+
+            described = self._conn.execute(f"DESCRIBE SELECT * FROM {relation}").fetchall()
+            declared = column_types.get(str(sheet_name), {})
+            keep = column_filter(selected_columns.get(str(sheet_name))) or (lambda name: True)
+            expressions = [
+                self._column_expression(raw_name, duck_type, declared)
+                for raw_name, duck_type, *_ in described
+                if keep(raw_name)
+            ]
+            self._conn.execute(
+                f"CREATE OR REPLACE VIEW {_quote(view)} AS SELECT {', '.join(expressions)} FROM {relation}"
+            )
+            views.append(view)
+
+        self._views[source] = views
+        logger.info(f"Registered {views} with DuckDB from {origin}")
+
+    def _copy_streamed_sheet(
+        self,
+        file_path: str,
+        sheet_name: str,
+        table: str,
+        declared: Dict[str, str],
+        columns: Optional[List[str]]
+    ) -> None:
+        """
+        Copy a sheet read with the streaming XLSX reader into a DuckDB table.
+
+        Batches are normalized like SQLite loads and cast to the declared
+        types, so batches whose inferred dtypes differ land in one table.
+        """
+        self._conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+        created = False
+        for batch in iter_sheet_batches(file_path, sheet_name, usecols=column_filter(columns)):
+            batch = normalize_frame_for_sql(clean_column_names(batch), declared)
+            names = [str(col) for col in batch.columns]
+            types = [_DUCKDB_TYPES.get(declared.get(name, "TEXT"), "VARCHAR") for name in names]
+            if not created:
+                created = True
+                self._conn.execute(
+                    f"CREATE TABLE {_quote(table)} ("
+                    + ", ".join(f"{_quote(name)} {duck_type}" for name, duck_type in zip(names, types)) + ")"
+                )
+            self._conn.register("__stream_batch", batch)
+            try:
+                self._conn.execute(
+                    f"INSERT INTO {_quote(table)} SELECT "
+                    + ", ".join(
+                        f"TRY_CAST({_quote(name)} AS {duck_type})" for name, duck_type in zip(names, types)
+                    )
+                    + " FROM __stream_batch"
+                )
+            finally:
+                self._conn.unregister("__stream_batch")
+
+    @staticmethod
+    def _literal(text: str) -> str:
+        """Quote an SQL string literal."""
+        return "'" + text.replace("'", "''") + "'"
+
+    @staticmethod
+    def _column_expression(raw_name: str, duck_type: str, declared: Dict[str, str]) -> str:
+        """
+        Select one source column under its cleaned name with SQLite-compatible values.
+
+        DATETIME columns read as text become timestamps (ISO strings still
+        compare against them); BOOLEAN columns become 0/1 like in SQLite.
+        """
+        clean_name = str(raw_name).strip().replace(" ", "_")
+        expression = _quote(raw_name)
+        declared_type = declared.get(clean_name)
+        if declared_type == "BOOLEAN" and duck_type != "INTEGER":
+            expression = f"TRY_CAST({expression} AS INTEGER)"
+        elif declared_type == "DATETIME" and not duck_type.startswith(("TIMESTAMP", "DATE")):
+            expression = f"TRY_CAST({expression} AS TIMESTAMP)"
+        return f"{expression} AS {_quote(clean_name)}"
+
+    def _check_query(self, query: str) -> None:
+        """
+        Reject anything but SELECT statements over the registered tables.
+
+        Table functions (read_csv, read_text, glob, duckdb_settings, ...) would
+        reach past the views, so queries calling them are rejected.
+        """
+        statements = self._conn.extract_statements(query)
+        if any(statement.type != duckdb.StatementType.SELECT for statement in statements):
+            raise QueryExecutionError("Only SELECT statements are allowed")
+        tree = json.loads(self._conn.execute("SELECT json_serialize_sql(?)", [query]).fetchone()[0])
+        function = _find_table_function(tree)
+        if function is not None:
+            raise QueryExecutionError(f"Table function '{function}' is not allowed; query the loaded tables")
+
+    # --------------------------- public API ---------------------------
+    def list_tables(self) -> List[str]:
+        with self._lock:
+            self._sync()
+            return sorted(view for views in self._views.values() for view in views)
+
+    def execute(self, query: str) -> QueryResult:
+        with self._lock:
+            try:
+                self._sync()
+                self._check_query(query)
+
+                cursor = self._conn.execute(query)
+                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                rows = [tuple(_to_json_value(value) for value in row) for row in cursor.fetchall()]
+            except duckdb.Error as e:
+                raise QueryExecutionError(str(e)) from e
+        return columns, rows
+
+    def execute_batches(self, query: str, batch_size: int) -> Iterator[QueryResult]:
+        with self._lock:
+            try:
+                self._sync()
+                self._check_query(query)
+
+                cursor = self._conn.execute(query)
+                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                first = True
+                while True:
+                    batch = cursor.fetchmany(batch_size)
+                    if batch or first:
+                        yield columns, [tuple(_to_json_value(value) for value in row) for row in batch]
+                    if len(batch) < batch_size:
+                        break
+                    first = False
+            except duckdb.Error as e:
+                raise QueryExecutionError(str(e)) from e
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+            self._views.clear()
+            self._loaded.clear()
+
+
+# =============================== ENGINE SELECTION ===============================
+_engine: Optional[QueryEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_query_engine() -> QueryEngine:
+    """
+    Return the process-wide engine selected by SQL_ENGINE.
+
+    Falls back to SQLite when duckdb is requested but not installed.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            if SQL_ENGINE == "duckdb" and DUCKDB_AVAILABLE:
+                _engine = DuckDBEngine()
+            else:
+                if SQL_ENGINE == "duckdb":
+                    logger.warning("SQL_ENGINE=duckdb but duckdb is not installed; using SQLite")
+                elif SQL_ENGINE != "sqlite":
+                    logger.warning(f"Unknown SQL_ENGINE '{SQL_ENGINE}'; using SQLite")
+                _engine = SQLiteEngine()
+            logger.info(f"Query engine: {_engine.name}")
+        return _engine
+
+
+def close_query_engine() -> None:
+    """Close the process-wide engine (called on shutdown)."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.close()
+            _engine = None
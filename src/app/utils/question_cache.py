@@ -0,0 +1,206 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Question Cache - Reuses the SQL generated for a question asked before.
+
+Asking "show all employees" again, or "Show all employees.", goes through the
+orchestrator, SQL generation and validation model calls every time although
+the SQL would be the same. This cache maps a question to the output of the
+SQL generation agent (queries plus explanation), so a repeated question runs
+its cached SQL directly, without any model call.
+
+The key is the normalized question plus a fingerprint of the catalog (table
+names, sheet columns and upload hashes): once the uploads change, earlier
+SQL may reference tables or columns that no longer exist, so uploads and
+deletions also clear the cache. The SQL is re-run on every hit, so the rows
+are always current (appended rows included).
+
+Only answers to self-contained questions are stored: the first question of
+a session that the local SQL executor answered itself, every query having
+run (when the validator model answers, it may have repaired the SQL). A
+follow-up such as "and their ages?" depends on the conversation: it is
+neither cached nor looked up, even when its text matches a cached question.
+
+The cache is a bounded LRU (QUESTION_CACHE_SIZE entries; 0 disables it).
+Its hit rate and the model latency it saved are reported by GET /api/metrics.
+
+This module provides:
+- normalize_question: the question part of a cache key
+- catalog_fingerprint: the catalog part of a cache key
+- lookup_cached_sql / store_cached_sql / discard_cached_sql: cache access
+- record_llm_answer / record_cache_hit: latency accounting
+- invalidate_question_cache: drop every entry (uploads and deletions)
+- get_question_cache_stats: counters for the metrics endpoint
+"""
+
+# =============================== IMPORTS ===============================
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from src.app.configs.logger_config import get_logger
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-Question-Cache")
+
+# =============================== CONSTANTS ===============================
+# Questions kept (least recently used first out); 0 disables the cache
+QUESTION_CACHE_SIZE = int(os.getenv("QUESTION_CACHE_SIZE", "256"))
+
+# Quoted literals keep their case: 'Ira' and 'ira' are different values
+_QUOTED_PATTERN = re.compile(r"('[^']*'|\"[^\"]*\")")
+_EDGE_PUNCTUATION = " \t\n.?!;,"
+
+# =============================== CACHE STATE ===============================
+_entries: "OrderedDict[tuple[str, str], str]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "stores": 0,
+    "evictions": 0,
+    "discards": 0,
+    "invalidations": 0,
+    "llm_answers": 0,
+    "llm_seconds": 0.0,
+    "hit_seconds": 0.0,
+    "saved_seconds": 0.0,
+}
+
+
+# =============================== KEYS ===============================
+def normalize_question(question: str) -> str:
+    """
+    Question text as it is keyed: case, spacing and trailing punctuation do not matter.
+
+    Text inside quotes is kept as written, since it usually ends up as a
+    literal in the SQL.
+    """
+    text = unicodedata.normalize("NFKC", question or "").strip(_EDGE_PUNCTUATION)
+    parts = _QUOTED_PATTERN.split(text)
+    # Odd parts are the quoted literals
+    normalized = "".join(part if i % 2 else re.sub(r"\s+", " ", part.lower()) for i, part in enumerate(parts))
+    return normalized.strip()
+
+
+def catalog_fingerprint(registry: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Fingerprint of the loaded tables: names, sheet columns and upload hashes.
+
+    Args:
+        registry: File registry (file_id -> info with table_name, file_hash, schema)
+
+    Returns:
+        str: Hex digest; changes whenever a file is uploaded, reloaded or deleted
+    """
+    catalog = sorted(
+        (
+            info.get("table_name") or "",
+            info.get("file_hash") or "",
+            sorted(
+                (str(table.get("name")), [col.get("name") for col in table.get("columns", [])])
+                for table in (info.get("schema") or {}).get("tables", [])
+            ),
+        )
+        for info in registry.values()
+    )
+    return hashlib.sha256(json.dumps(catalog, default=str).encode("utf-8")).hexdigest()
+
+
+# =============================== CACHE ACCESS ===============================
+def lookup_cached_sql(question: str, fingerprint: str) -> Optional[str]:
+    """
+    Generated SQL cached for a question on this catalog (None on a miss).
+
+    A found entry is not a hit yet: it counts as one once its answer is
+    served (record_cache_hit), or as a miss if it is discarded.
+    """
+    if QUESTION_CACHE_SIZE <= 0:
+        return None
+    key = (normalize_question(question), fingerprint)
+    with _lock:
+        generated_sql = _entries.get(key)
+        if generated_sql is None:
+            _stats["misses"] += 1
+            return None
+        _entries.move_to_end(key)
+        return generated_sql
+
+
+def store_cached_sql(question: str, fingerprint: str, generated_sql: str) -> None:
+    """Cache the generated SQL of a question, evicting the least recently used entry if full."""
+    if QUESTION_CACHE_SIZE <= 0 or not generated_sql:
+        return
+    key = (normalize_question(question), fingerprint)
+    with _lock:
+        _entries[key] = generated_sql
+        _entries.move_to_end(key)
+        _stats["stores"] += 1
+        while len(_entries) > QUESTION_CACHE_SIZE:
+            _entries.popitem(last=False)
+            _stats["evictions"] += 1
+
+
+def discard_cached_sql(question: str, fingerprint: str) -> None:
+    """Forget a cached question whose SQL no longer runs (it is answered by the models instead)."""
+    with _lock:
+        # The lookup found the entry but nothing was served from it
+        _stats["misses"] += 1
+        if _entries.pop((normalize_question(question), fingerprint), None) is not None:
+            _stats["discards"] += 1
+
+
+def invalidate_question_cache(reason: str = "") -> None:
+    """Drop every cached question (called when files are uploaded or deleted)."""
+    with _lock:
+        if not _entries:
+            return
+        count = len(_entries)
+        _entries.clear()
+        _stats["invalidations"] += 1
+    logger.info(f"Cleared {count} cached question(s){f': {reason}' if reason else ''}")
+
+
+# =============================== METRICS ===============================
+def record_llm_answer(seconds: float) -> None:
+    """Record the latency of a question answered through the models (and cached)."""
+    with _lock:
+        _stats["llm_answers"] += 1
+        _stats["llm_seconds"] += seconds
+
+
+def record_cache_hit(seconds: float) -> None:
+    """Record a question answered from the cache: a hit, its latency and the time it saved."""
+    with _lock:
+        _stats["hits"] += 1
+        _stats["hit_seconds"] += seconds
+        if _stats["llm_answers"]:
+            average_llm = _stats["llm_seconds"] / _stats["llm_answers"]
+            _stats["saved_seconds"] += max(0.0, average_llm - seconds)
+
+
+def get_question_cache_stats() -> Dict[str, Any]:
+    """Counters of the question cache, with its hit rate and average latencies."""
+    with _lock:
+        stats = dict(_stats)
+        entries = len(_entries)
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        "enabled": QUESTION_CACHE_SIZE > 0,
+        "entries": entries,
+        "capacity": QUESTION_CACHE_SIZE,
+        "hits": stats["hits"],
+        "misses": stats["misses"],
+        "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+        "stores": stats["stores"],
+        "evictions": stats["evictions"],
+        "discards": stats["discards"],
+        "invalidations": stats["invalidations"],
+        "avg_llm_answer_seconds": round(stats["llm_seconds"] / stats["llm_answers"], 3) if stats["llm_answers"] else None,
+        "avg_hit_seconds": round(stats["hit_seconds"] / stats["hits"], 3) if stats["hits"] else None,
+        "saved_seconds": round(stats["saved_seconds"], 3),
+    }
@@ -4,10 +4,139 @@ Response Parser Utility - Parses structured agent responses into clean dictionar
 
 This module provides:
 - parse_agent_response function: Extracts Explanation, Query Result, SQL, and Error sections from agent output
+- extract_tool_payload function: Reads the JSON an MCP tool returned from an ADK function response
+- extract_generated_queries function: Lists the named queries of the SQL generation agent's output
+- build_query_result function: Builds the query_result JSON from the captured execute_sql responses
 """
 
+# =============================== IMPORTS ===============================
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
 
+# =============================== CONSTANTS ===============================
+_QUERY_BLOCK_PATTERN = re.compile(r"<<<QUERY:\s*(.+?)\s*>>>(.*?)(?=<<<|$)", re.DOTALL)
+_SQL_BLOCK_PATTERN = re.compile(r"<<<SQL>>>(.*?)(?=<<<|$)", re.DOTALL)
+# Name of the result of a single (unnamed) query
+SINGLE_QUERY_NAME = "result"
 
+
+# =============================== TOOL RESPONSES ===============================
+def extract_tool_payload(response: Any) -> Optional[Dict[str, Any]]:
+    """
+    Read the JSON object an MCP tool returned from an ADK function response.
+
+    McpToolset hands back the MCP CallToolResult as a dict: the tool's text is
+    in "structuredContent" -> "result" and/or in the "content" text parts
+    (plain {"result": ...} when the tool result was not a dict).
+
+    Args:
+        response: FunctionResponse.response of the tool call
+
+    Returns:
+        Optional[Dict[str, Any]]: The decoded tool output (None if it is not a JSON object)
+    """
+    if not isinstance(response, dict):
+        return None
+
+    candidates = []
+    structured = response.get("structuredContent")
+    if isinstance(structured, dict):
+        candidates.append(structured.get("result", structured))
+    for part in response.get("content") or []:
+        if isinstance(part, dict) and part.get("type", "text") == "text":
+            candidates.append(part.get("text"))
+    candidates.append(response.get("result"))
+
+    for candidate in candidates:
+        if isinstance(candidate, dict) and "success" in candidate:
+            return candidate
+        if isinstance(candidate, str):
+            try:
+                payload = json.loads(candidate)
+            except ValueError:
+                continue
+            if isinstance(payload, dict):
+                return payload
+    return None
+
+
+def _normalize_sql(query: str) -> str:
+    return " ".join((query or "").split()).rstrip(";").strip().lower()
+
+
+def _strip_code_fence(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    return text.strip()
+
+
+def extract_generated_queries(generated_sql: Optional[str]) -> List[Tuple[str, str]]:
+    """
+    List the queries of the SQL generation agent's output.
+
+    Args:
+        generated_sql: Output with <<<QUERY: name>>> blocks (multi-query) or
+                       one <<<SQL>>> block (single query)
+
+    Returns:
+        List[Tuple[str, str]]: (query name, SQL) in order; a single query is
+                               named SINGLE_QUERY_NAME; empty if there are none
+    """
+    text = generated_sql or ""
+    queries = [
+        (name, _strip_code_fence(sql))
+        for name, sql in _QUERY_BLOCK_PATTERN.findall(text)
+    ]
+    if not queries:
+        match = _SQL_BLOCK_PATTERN.search(text)
+        if match:
+            queries = [(SINGLE_QUERY_NAME, _strip_code_fence(match.group(1)))]
+    return [(name, sql) for name, sql in queries if sql]
+
+
+def build_query_result(
+    executions: List[Tuple[str, Dict[str, Any]]],
+    generated_sql: Optional[str] = None
+) -> Optional[str]:
+    """
+    Build the query_result JSON of a chat response from execute_sql tool responses.
+
+    The rows come straight from the tool, so the model no longer repeats them
+    in its answer. Each result is named after the <<<QUERY: name>>> block of
+    the generated SQL it ran (a single query is named SINGLE_QUERY_NAME); a
+    query run several times keeps its last result.
+
+    Args:
+        executions: (sql, execute_sql output) in the order the calls were made
+        generated_sql: Output of the SQL generation agent (state["generated_sql"])
+
+    Returns:
+        Optional[str]: JSON object {query_name: execute_sql output + "sql"}, or
+                       None when no query was executed
+    """
+    if not executions:
+        return None
+
+    names = {_normalize_sql(sql): name for name, sql in extract_generated_queries(generated_sql)}
+
+    results: Dict[str, Dict[str, Any]] = {}
+    by_sql: Dict[str, str] = {}
+    for sql, payload in executions:
+        key = _normalize_sql(sql)
+        name = by_sql.get(key) or names.get(key)
+        if name is None:
+            name = SINGLE_QUERY_NAME if len(executions) == 1 else f"query_{len(results) + 1}"
+        by_sql[key] = name
+        results[name] = {**payload, "sql": sql}
+
+    return json.dumps(results, default=str)
+
+
+# =============================== AGENT RESPONSE ===============================
 def parse_agent_response(response_text: str) -> dict:
     """
     Parse the structured agent response into clean sections.
@@ -26,7 +155,8 @@ def parse_agent_response(response_text: str) -> dict:
         return result
     
     # List of all known delimiters
-    delimiters = ["<<<EXPLANATION>>>", "<<<QUERY_RESULT>>>", "<<<SQL>>>", "<<<ERROR>>>", "<<<SUGGESTIONS>>>", "<<<STRUCTURED_RESPONSE>>>", "<<<INVALID>>>", "<<<END>>>"]
+    # (<<<QUERY: name>>> and <<<SCHEMA>>> blocks come from the SQL generation agent's output)
+    delimiters = ["<<<EXPLANATION>>>", "<<<QUERY_RESULT>>>", "<<<SQL>>>", "<<<ERROR>>>", "<<<SUGGESTIONS>>>", "<<<STRUCTURED_RESPONSE>>>", "<<<INVALID>>>", "<<<QUERY:", "<<<SCHEMA>>>", "<<<END>>>"]
 
     def get_section_content(marker):
         if marker not in response_text:
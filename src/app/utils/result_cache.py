@@ -0,0 +1,250 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Result Cache - Reuses execute_sql results while the loaded data is unchanged.
+
+Dashboards and follow-up questions run the same SELECT many times against
+data that has not changed, and each run scans the tables again. The output of
+execute_sql is cached under the normalized SQL, the engine and the catalog
+version (see database_manager.get_catalog_version); every load, append,
+removal or clear bumps the version, so cached results are never stale.
+
+execute_sql runs both in the MCP server and in the API process (the local
+SQL executor), so the cache is a SQLite database shared by both processes,
+database/result_cache.db (WAL, like the main database):
+- an output larger than RESULT_CACHE_MAX_ENTRY_BYTES is not cached (large
+  results already keep only a preview plus a result handle),
+- the outputs together stay under RESULT_CACHE_MAX_BYTES; the least recently
+  used entries are evicted first, and entries of older catalog versions go
+  as soon as a result of the new version is stored,
+- a cached result with a result handle is served only while the handle is
+  alive (serving it keeps the handle alive, like reading a page).
+
+RESULT_CACHE_MAX_BYTES=0 disables the cache.
+
+This module provides:
+- normalize_sql: the SQL part of a cache key
+- get_cached_result: cached execute_sql output of a query, if any
+- store_cached_result: cache an execute_sql output
+- clear_result_cache: drop every entry
+- get_result_cache_stats: counters for the metrics endpoint
+"""
+
+# =============================== IMPORTS ===============================
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.app.configs.logger_config import get_logger
+from src.app.utils.connection_pool import SQLiteConnectionPool
+from src.app.utils.database_manager import DB_DIR, get_catalog_version
+from src.app.utils.result_store import touch_result
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-Result-Cache")
+
+# =============================== CONSTANTS ===============================
+RESULT_CACHE_DB = DB_DIR / "result_cache.db"
+# Total size of the cached outputs (0 disables the cache)
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Largest single output that is cached
+RESULT_CACHE_MAX_ENTRY_BYTES = int(os.getenv("RESULT_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024)))
+
+_RESULT_ID_PATTERN = re.compile(r'"result_id":\s*"([0-9a-f]{32})"')
+# Literals and quoted identifiers keep their spacing
+_QUOTED_PATTERN = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+
+# =============================== CACHE STATE ===============================
+_pool = SQLiteConnectionPool(RESULT_CACHE_DB, max_readers=2)
+_schema_ready = False
+_schema_lock = threading.Lock()
+_stats_lock = threading.Lock()
+# Counters of this process (the entries themselves are shared)
+_stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "too_large": 0}
+
+
+def _count(name: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def _ensure_schema() -> None:
+    """Create the cache table on first use."""
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if _schema_ready:
+            return
+        with _pool.write() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    cache_key TEXT PRIMARY KEY,
+                    catalog_version TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    output TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_used ON results (last_used)")
+        _schema_ready = True
+
+
+# =============================== KEYS ===============================
+def normalize_sql(query: str) -> str:
+    """SQL as it is keyed: spacing and trailing semicolons do not matter (outside quotes)."""
+    parts = _QUOTED_PATTERN.split((query or "").strip().rstrip(";").strip())
+    # Odd parts are the quoted literals and identifiers
+    return "".join(part if i % 2 else re.sub(r"\s+", " ", part) for i, part in enumerate(parts)).strip()
+
+
+def _cache_key(engine_name: str, query: str) -> str:
+    return hashlib.sha256(f"{engine_name}\0{normalize_sql(query)}".encode("utf-8")).hexdigest()
+
+
+# =============================== PUBLIC API ===============================
+def get_cached_result(engine_name: str, query: str, catalog_version: str) -> Optional[str]:
+    """
+    Cached execute_sql output of a query on this catalog version.
+
+    Args:
+        engine_name: Query engine the output came from
+        query: SQL query
+        catalog_version: Current catalog version
+
+    Returns:
+        Optional[str]: The execute_sql output JSON (None on a miss)
+    """
+    if RESULT_CACHE_MAX_BYTES <= 0:
+        return None
+    key = _cache_key(engine_name, query)
+    try:
+        _ensure_schema()
+        with _pool.read() as conn:
+            row = conn.execute(
+                "SELECT output FROM results WHERE cache_key = ? AND catalog_version = ?",
+                (key, catalog_version)
+            ).fetchone()
+        if row is not None:
+            result_id = _RESULT_ID_PATTERN.search(row[0])
+            alive = not result_id or touch_result(result_id.group(1))
+            with _pool.write() as conn:
+                if alive:
+                    conn.execute(
+                        "UPDATE results SET last_used = ?, hits = hits + 1 WHERE cache_key = ?",
+                        (time.time(), key)
+                    )
+                else:
+                    # The full result behind the preview has expired
+                    conn.execute("DELETE FROM results WHERE cache_key = ?", (key,))
+                    row = None
+    except sqlite3.Error as e:
+        logger.warning(f"Result cache lookup failed: {e}")
+        return None
+
+    _count("misses" if row is None else "hits")
+    return None if row is None else row[0]
+
+
+def store_cached_result(engine_name: str, query: str, catalog_version: str, output: str) -> bool:
+    """
+    Cache the execute_sql output of a query, evicting least recently used entries to fit.
+
+    Args:
+        engine_name: Query engine the output came from
+        query: SQL query
+        catalog_version: Catalog version read before the query ran
+        output: execute_sql output JSON
+
+    Returns:
+        bool: True if the output was cached (not if the tables changed while the query ran)
+    """
+    if RESULT_CACHE_MAX_BYTES <= 0:
+        return False
+    size = len(output.encode("utf-8"))
+    if size > min(RESULT_CACHE_MAX_ENTRY_BYTES, RESULT_CACHE_MAX_BYTES):
+        _count("too_large")
+        return False
+
+    now = time.time()
+    try:
+        if get_catalog_version() != catalog_version:
+            return False
+        _ensure_schema()
+        with _pool.write() as conn:
+            # Results of earlier catalog versions can never be served again
+            evicted = conn.execute(
+                "DELETE FROM results WHERE catalog_version != ?", (catalog_version,)
+            ).rowcount
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                (_cache_key(engine_name, query), catalog_version, normalize_sql(query), output, size, now, now)
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > RESULT_CACHE_MAX_BYTES:
+                rows = conn.execute("SELECT cache_key, size FROM results ORDER BY last_used").fetchall()
+                stale = []
+                for key, entry_size in rows:
+                    if total <= RESULT_CACHE_MAX_BYTES:
+                        break
+                    stale.append((key,))
+                    total -= entry_size
+                conn.executemany("DELETE FROM results WHERE cache_key = ?", stale)
+                evicted += len(stale)
+    except sqlite3.Error as e:
+        logger.warning(f"Result cache store failed: {e}")
+        return False
+
+    _count("stores")
+    if evicted:
+        _count("evictions", evicted)
+    return True
+
+
+def clear_result_cache() -> None:
+    """Drop every cached result."""
+    try:
+        _ensure_schema()
+        with _pool.write() as conn:
+            conn.execute("DELETE FROM results")
+    except sqlite3.Error as e:
+        logger.warning(f"Result cache clear failed: {e}")
+
+
+def get_result_cache_stats() -> Dict[str, Any]:
+    """Counters of this process, with the size of the shared cache."""
+    with _stats_lock:
+        stats = dict(_stats)
+    entries, total_bytes, shared_hits = 0, 0, 0
+    if RESULT_CACHE_MAX_BYTES > 0:
+        try:
+            _ensure_schema()
+            with _pool.read() as conn:
+                entries, total_bytes, shared_hits = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM results"
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache stats failed: {e}")
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        "enabled": RESULT_CACHE_MAX_BYTES > 0,
+        "entries": entries,
+        "bytes": total_bytes,
+        "max_bytes": RESULT_CACHE_MAX_BYTES,
+        "max_entry_bytes": RESULT_CACHE_MAX_ENTRY_BYTES,
+        "hits": stats["hits"],
+        "misses": stats["misses"],
+        "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+        "stores": stats["stores"],
+        "evictions": stats["evictions"],
+        "too_large": stats["too_large"],
+        "entry_hits_all_processes": shared_hits,
+    }
@@ -0,0 +1,274 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Result Store - Server-side handles for large query results.
+
+execute_sql used to hand every row of a result to the model, which had to
+echo them back: a 50k-row result overflows the context window and takes
+minutes to generate. Instead a query returns its first RESULT_PREVIEW_ROWS
+rows, the total row count and, when there are more rows, a result_id. The
+full result is spilled to disk while it is read (the rows are never all in
+memory), and later pages are read back by offset, by the fetch_result_page
+MCP tool or by GET /api/results/{result_id}.
+
+The MCP server runs queries and the API serves pages from another process,
+so handles live on disk, under cache/results:
+- {result_id}.jsonl: one JSON array per row
+- {result_id}.json: columns, row count, the query and the byte offset of
+  every RESULT_INDEX_STEP-th row (a page read seeks, then reads at most
+  RESULT_INDEX_STEP - 1 rows before its first row); written last, so a
+  result is visible only once it is complete
+
+A handle expires RESULT_TTL_SECONDS after it was last read; expired handles
+are evicted whenever a new result is spilled.
+
+This module provides:
+- execute_with_handle: run a query, keep a preview and spill the rest
+- fetch_result_page: read a page of a spilled result
+- evict_expired_results: delete handles that expired
+- touch_result: keep a handle alive (when its preview is served again from cache)
+"""
+
+# =============================== IMPORTS ===============================
+import json
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.app.configs.logger_config import get_logger
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-Result-Store")
+
+# =============================== CONSTANTS ===============================
+RESULT_DIR = Path("cache") / "results"
+# Rows returned with the query itself (and the default page size)
+RESULT_PREVIEW_ROWS = int(os.getenv("RESULT_PREVIEW_ROWS", "100"))
+# Largest page a caller can fetch at once
+RESULT_MAX_PAGE_ROWS = int(os.getenv("RESULT_MAX_PAGE_ROWS", "1000"))
+# Rows kept on disk per result; larger results are counted but not kept beyond this
+RESULT_MAX_ROWS = int(os.getenv("RESULT_MAX_ROWS", "1000000"))
+# Idle time after which a handle is evicted
+RESULT_TTL_SECONDS = int(os.getenv("RESULT_TTL_SECONDS", "3600"))
+# Rows fetched from the engine at a time, and rows between two indexed offsets
+RESULT_FETCH_BATCH_ROWS = 5000
+RESULT_INDEX_STEP = 1000
+
+_RESULT_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+# =============================== HELPERS ===============================
+def _rows_path(result_id: str) -> Path:
+    return RESULT_DIR / f"{result_id}.jsonl"
+
+
+def _meta_path(result_id: str) -> Path:
+    return RESULT_DIR / f"{result_id}.json"
+
+
+def _encode_row(row: tuple) -> bytes:
+    """One row as a line of JSON (values JSON cannot hold, e.g. BLOBs, as text)."""
+    return (json.dumps(list(row), default=str) + "\n").encode("utf-8")
+
+
+def _load_meta(result_id: str) -> Dict[str, Any]:
+    """
+    Metadata of a live result.
+
+    Raises:
+        ValueError: If the result id is malformed, unknown or expired
+    """
+    if not _RESULT_ID_PATTERN.fullmatch(result_id or ""):
+        raise ValueError(f"Invalid result id '{result_id}'")
+    path = _meta_path(result_id)
+    try:
+        if time.time() - path.stat().st_mtime > RESULT_TTL_SECONDS:
+            raise ValueError(f"Result '{result_id}' has expired; run the query again")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        raise ValueError(f"Result '{result_id}' not found or expired; run the query again")
+
+
+# =============================== EVICTION ===============================
+def evict_expired_results() -> int:
+    """
+    Delete result handles idle for more than RESULT_TTL_SECONDS.
+
+    Row files without metadata (a spill that was interrupted) are deleted
+    after the same time.
+
+    Returns:
+        int: Number of results removed
+    """
+    if not RESULT_DIR.exists():
+        return 0
+
+    cutoff = time.time() - RESULT_TTL_SECONDS
+    removed = 0
+    for path in RESULT_DIR.iterdir():
+        result_id = path.name.split(".", 1)[0]
+        meta_path = _meta_path(result_id)
+        try:
+            last_used = (meta_path if meta_path.exists() else path).stat().st_mtime
+        except OSError:
+            continue
+        if last_used < cutoff:
+            path.unlink(missing_ok=True)
+            removed += path.suffix == ".json"
+
+    if removed:
+        logger.info(f"Evicted {removed} expired query result(s)")
+    return removed
+
+
+# =============================== PUBLIC API ===============================
+def execute_with_handle(engine: Any, query: str, preview_rows: int = RESULT_PREVIEW_ROWS) -> Dict[str, Any]:
+    """
+    Run a query, keeping its first rows and spilling the full result if there are more.
+
+    Args:
+        engine: QueryEngine to run the query on
+        query: SQL SELECT query
+        preview_rows: Rows returned directly
+
+    Returns:
+        Dict[str, Any]: {
+            "columns": column names,
+            "rows": the first preview_rows rows (tuples),
+            "row_count": total rows of the result,
+            "result_id": handle of the full result (None when every row is in "rows"),
+            "stored_rows": rows kept behind the handle (RESULT_MAX_ROWS at most)
+        }
+
+    Raises:
+        QueryExecutionError: If the engine rejects or fails the query
+    """
+    columns: List[str] = []
+    preview: List[tuple] = []
+    row_count = 0
+    result_id: Optional[str] = None
+    spill = None
+    offsets: List[int] = []
+    written = 0
+
+    try:
+        for columns, batch in engine.execute_batches(query, RESULT_FETCH_BATCH_ROWS):
+            seen = row_count
+            row_count += len(batch)
+            if len(preview) < preview_rows:
+                preview.extend(batch[:preview_rows - len(preview)])
+
+            if spill is None:
+                if row_count <= preview_rows:
+                    continue
+                RESULT_DIR.mkdir(parents=True, exist_ok=True)
+                result_id = uuid.uuid4().hex
+                spill = open(_rows_path(result_id), "wb")
+                # Every row before this batch is in the preview
+                pending = preview + batch[len(preview) - seen:]
+            else:
+                pending = batch
+
+            for row in pending[:max(0, RESULT_MAX_ROWS - written)]:
+                if written % RESULT_INDEX_STEP == 0:
+                    offsets.append(spill.tell())
+                spill.write(_encode_row(row))
+                written += 1
+
+        if spill is not None:
+            spill.close()
+            spill = None
+            meta = {
+                "result_id": result_id,
+                "query": query,
+                "columns": columns,
+                "row_count": row_count,
+                "stored_rows": written,
+                "offsets": offsets,
+                "created_at": time.time(),
+            }
+            temp_path = _meta_path(result_id).with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            temp_path.replace(_meta_path(result_id))
+            logger.info(f"Spilled {written} of {row_count} result row(s) as result '{result_id}'")
+            evict_expired_results()
+    finally:
+        if spill is not None:
+            spill.close()
+            _rows_path(result_id).unlink(missing_ok=True)
+
+    return {
+        "columns": columns,
+        "rows": preview,
+        "row_count": row_count,
+        "result_id": result_id,
+        "stored_rows": written if result_id else row_count,
+    }
+
+
+def touch_result(result_id: str) -> bool:
+    """
+    Keep a result handle alive, as a page read would.
+
+    Returns:
+        bool: False if the handle is unknown or has expired
+    """
+    try:
+        _load_meta(result_id)
+        os.utime(_meta_path(result_id))
+    except (ValueError, OSError):
+        return False
+    return True
+
+
+def fetch_result_page(result_id: str, offset: int = 0, limit: int = RESULT_PREVIEW_ROWS) -> Dict[str, Any]:
+    """
+    Read a page of a spilled result.
+
+    A page starting at or past the last stored row is empty (its
+    next_offset is None), so a caller can page until next_offset is None.
+
+    Args:
+        result_id: Handle returned with the query's first rows
+        offset: Index of the first row of the page
+        limit: Rows to read (at most RESULT_MAX_PAGE_ROWS)
+
+    Returns:
+        Dict[str, Any]: {"result_id", "columns", "rows" (lists), "offset",
+                         "row_count", "stored_rows", "next_offset" (None on the last page)}
+
+    Raises:
+        ValueError: If the handle is unknown or expired, offset is negative or limit is below 1
+    """
+    meta = _load_meta(result_id)
+    if offset < 0 or limit < 1:
+        raise ValueError("offset must be >= 0 and limit >= 1")
+    limit = min(limit, RESULT_MAX_PAGE_ROWS)
+    stored_rows = meta["stored_rows"]
+
+    rows: List[list] = []
+    if offset < stored_rows:
+        step_index = offset // RESULT_INDEX_STEP
+        with open(_rows_path(result_id), "rb") as f:
+            f.seek(meta["offsets"][step_index])
+            for _ in range(offset - step_index * RESULT_INDEX_STEP):
+                f.readline()
+            for _ in range(min(limit, stored_rows - offset)):
+                rows.append(json.loads(f.readline()))
+
+    # Reading a result keeps it alive
+    os.utime(_meta_path(result_id))
+    next_offset = offset + len(rows)
+    return {
+        "result_id": result_id,
+        "columns": meta["columns"],
+        "rows": rows,
+        "offset": offset,
+        "row_count": meta["row_count"],
+        "stored_rows": stored_rows,
+        "next_offset": next_offset if next_offset < stored_rows else None,
+    }
@@ -0,0 +1,137 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Schema Cache - Profiled schemas of uploaded files, keyed by content hash.
+
+Profiling a file means parsing every sheet and scanning every column. The
+result only depends on the file's content (and the profiling settings), so
+it is stored as cache/schemas/<SHA-256>.json; re-uploading the same content
+after a delete, or in another workspace sharing the cache directory, reuses
+it without parsing the file for its schema.
+
+The cache is bounded by SCHEMA_CACHE_MAX_MB and evicts the least recently
+used entries (a hit refreshes an entry's modification time).
+
+This module provides:
+- get_cached_tables: profiled tables of a file hash, if cached with the same settings
+- store_cached_tables: cache the profiled tables of a file hash
+- clear_schema_cache: remove every entry
+"""
+
+# =============================== IMPORTS ===============================
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.app.configs.logger_config import get_logger
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-Schema-Cache")
+
+# =============================== CONSTANTS ===============================
+SCHEMA_CACHE_DIR = Path(os.getenv("SCHEMA_CACHE_DIR", str(Path("cache") / "schemas")))
+SCHEMA_CACHE_ENABLED = os.getenv("SCHEMA_CACHE_ENABLED", "true").lower() == "true"
+SCHEMA_CACHE_MAX_MB = float(os.getenv("SCHEMA_CACHE_MAX_MB", "64"))
+# Bump when the layout of profiled tables changes, to ignore older entries
+SCHEMA_CACHE_VERSION = 1
+
+_evict_lock = threading.Lock()
+
+
+# =============================== HELPERS ===============================
+def _entry_path(file_hash: str) -> Path:
+    return SCHEMA_CACHE_DIR / f"{file_hash}.json"
+
+
+def _evict() -> None:
+    """Delete least recently used entries until the cache fits its size bound."""
+    max_bytes = SCHEMA_CACHE_MAX_MB * 1024 * 1024
+    with _evict_lock:
+        entries = []
+        for path in SCHEMA_CACHE_DIR.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+                logger.info(f"Evicted cached schema {path.stem[:16]}...")
+            except OSError:
+                continue
+
+
+# =============================== PUBLIC API ===============================
+def get_cached_tables(file_hash: Optional[str], settings: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Look up the profiled tables of a file.
+
+    Args:
+        file_hash: SHA-256 of the file
+        settings: Profiling settings the tables must have been produced with
+
+    Returns:
+        Optional[List[Dict[str, Any]]]: Schema table entries, or None on a miss
+    """
+    if not SCHEMA_CACHE_ENABLED or not file_hash:
+        return None
+
+    path = _entry_path(file_hash)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cached schema {file_hash[:16]}...: {e}")
+        return None
+
+    if entry.get("version") != SCHEMA_CACHE_VERSION or entry.get("settings") != settings:
+        return None
+
+    try:
+        os.utime(path)  # mark as recently used
+    except OSError:
+        pass
+    logger.info(f"Schema cache hit for {file_hash[:16]}...")
+    return entry["tables"]
+
+
+def store_cached_tables(file_hash: Optional[str], settings: Dict[str, Any], tables: List[Dict[str, Any]]) -> None:
+    """
+    Cache the profiled tables of a file (atomically replaces any older entry).
+
+    Args:
+        file_hash: SHA-256 of the file
+        settings: Profiling settings the tables were produced with
+        tables: Schema table entries
+    """
+    if not SCHEMA_CACHE_ENABLED or not file_hash:
+        return
+
+    path = _entry_path(file_hash)
+    temp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+    try:
+        SCHEMA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": SCHEMA_CACHE_VERSION, "settings": settings, "tables": tables}, f)
+        temp_path.replace(path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Failed to cache schema {file_hash[:16]}...: {e}")
+        temp_path.unlink(missing_ok=True)
+        return
+
+    _evict()
+
+
+def clear_schema_cache() -> None:
+    """Remove every cached schema."""
+    for path in SCHEMA_CACHE_DIR.glob("*.json"):
+        path.unlink(missing_ok=True)
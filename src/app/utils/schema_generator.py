@@ -15,78 +15,285 @@ a clean, machine-readable schema describing:
 
 What this file does
 -------------------
-- Reads Excel/CSV files and loads them into DataFrames.
+- Reads Excel/CSV files and loads them into DataFrames (parsed once and
+  shared with the database load), optionally only selected sheets/columns.
+- Lists the sheets and columns of a file without parsing its data.
+- Reuses schemas cached for the same file content (see schema_cache).
 - Detects table structure, column types, and potential primary keys.
-- Builds a schema describing rows, columns, and inferred SQL types.
+- Builds a schema describing rows, columns, and inferred SQL types, profiling
+  all columns of a sheet in a few vectorized passes.
 - Produces a human-readable schema summary.
 - Converts numpy values to safe Python types for JSON output.
+- Profiles tall tables approximately (HyperLogLog distinct counts and
+  reservoir-sampled values) above a row threshold; see PROFILE_MODE.
+- Profiles large .xlsx workbooks batch by batch from the streaming reader
+  (see xlsx_stream), and large CSVs chunk by chunk, without holding a sheet
+  in memory.
+- Checks rows appended to a loaded sheet against its profile and updates the
+  profile from the appended rows alone (see table_append).
+- Stores parsed sheets compactly (INGEST_MEMORY_MODE=compact): downcast
+  numbers, categorical low-cardinality text, Arrow-backed strings.
+- Reads gzipped CSVs, zip archives of CSVs (one sheet per member), Parquet
+  and JSON Lines files (see file_formats).
 
 """
 
 
 # =============================== IMPORTS ===============================
+import os
+import re
+import datetime
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from src.app.configs.logger_config import get_logger
+from src.app.utils.file_formats import (
+    get_file_extension,
+    is_csv_source,
+    jsonl_column_names,
+    list_zip_members,
+    open_csv,
+    parquet_column_names,
+    read_jsonl_frame,
+    read_parquet_frame,
+)
+from src.app.utils.memory_usage import release_unused_memory
+from src.app.utils.profile_sketches import (
+    DEFAULT_HLL_PRECISION,
+    HyperLogLog,
+    ReservoirSample,
+    estimate_distinct_from_sample,
+)
+from src.app.utils.schema_cache import get_cached_tables, store_cached_tables
+from src.app.utils.sidecar_cache import PYARROW_AVAILABLE, read_sidecar
+from src.app.utils.xlsx_stream import iter_sheet_batches, should_stream_xlsx
 
 # =============================== LOGGER ===============================
 logger = get_logger("Utils-Service-Excel-Schema")
 
+# =============================== CONSTANTS ===============================
+# Date / date-time strings recognized in text columns (ISO, 2024/01/31, 31-01-2024, ...)
+DATETIME_PATTERN = re.compile(
+    r"^\s*(\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4})"
+    r"([ T]\d{1,2}:\d{2}(:\d{2}(\.\d+)?)?)?\s*$"
+)
+DATETIME_SAMPLE_SIZE = 200
+EXCEL_ENGINES = {".xlsx": "openpyxl", ".xls": "xlrd"}
+# Formats holding a single table, exposed as one sheet named "Sheet1" like CSV files
+SINGLE_SHEET_EXTENSIONS = (".csv", ".csv.gz", ".parquet", ".jsonl")
+SAMPLE_VALUE_COUNT = 3
+
+# Column profiling: "exact", "approx" (sketches), or "auto" (exact up to EXACT_PROFILE_MAX_ROWS rows)
+PROFILE_MODE = os.getenv("PROFILE_MODE", "auto").lower()
+EXACT_PROFILE_MAX_ROWS = int(os.getenv("EXACT_PROFILE_MAX_ROWS", "200000"))
+# Accuracy/speed trade-off of approximate distinct counts: 2**precision registers,
+# about 1.04 / sqrt(2**precision) relative error (12 -> 1.6%, 14 -> 0.8%)
+PROFILE_HLL_PRECISION = int(os.getenv("PROFILE_HLL_PRECISION", str(DEFAULT_HLL_PRECISION)))
+# Exact frame profiling: columns sorted per block, leading rows scanned for sample values
+PROFILE_BLOCK_COLUMNS = 64
+PROFILE_SAMPLE_SCAN_ROWS = 64
+# Text values are slow to hash in full; their distinct counts come from a row sample this size
+PROFILE_SAMPLE_ROWS = int(os.getenv("PROFILE_SAMPLE_ROWS", "100000"))
+
+# Parsed sheets: "compact" (downcast numbers, categorical / Arrow-backed text) or "standard"
+INGEST_MEMORY_MODE = os.getenv("INGEST_MEMORY_MODE", "compact").lower()
+# Text columns with at most this share of distinct values are stored as categoricals
+CATEGORY_MAX_UNIQUE_RATIO = float(os.getenv("CATEGORY_MAX_UNIQUE_RATIO", "0.5"))
+# Frames shorter than this are left as parsed (nothing worth saving)
+COMPACT_MIN_ROWS = 1000
+# Text columns are first probed on this many evenly spaced rows; mostly-unique
+# ones are kept as strings without hashing the whole column
+CATEGORY_PROBE_ROWS = 10000
+CATEGORY_PROBE_MAX_RATIO = 0.9
+# Leading CSV rows used to plan the dtypes of text columns before the full read
+CSV_DTYPE_SAMPLE_ROWS = 10000
+# Compact CSV reads parse this many rows at a time (bounds the parser's own buffers)
+CSV_READ_CHUNK_ROWS = int(os.getenv("CSV_READ_CHUNK_ROWS", "100000"))
+
 
 # =============================== SCHEMA GENERATION ===============================
-def generate_schema(file_path: str) -> Dict[str, Any]:
-    """Generate a complete schema for an uploaded Excel/CSV file."""
+def generate_schema(
+    file_path: str,
+    sheets_data: Optional[Dict[str, pd.DataFrame]] = None,
+    file_hash: Optional[str] = None,
+    sheets: Optional[List[str]] = None,
+    columns: Optional[Dict[str, List[str]]] = None,
+    reader: Optional[str] = None,
+    csv_chunk_rows: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Generate a complete schema for an uploaded Excel/CSV file.
+
+    Pass the already-parsed sheets_data to reuse one parse for schema
+    generation and the database load; otherwise the file is read here
+    (from its columnar sidecar when file_hash has one). With file_hash, a
+    schema cached for the same content is returned without reading the file.
+    sheets/columns restrict the schema to selected sheets and (cleaned)
+    column names per sheet; None selects everything. reader picks the
+    XLSX reader ("pandas", "streaming" or "auto", see xlsx_stream); streamed
+    workbooks are profiled batch by batch and marked in the schema, so the
+    database load streams them as well. csv_chunk_rows profiles a CSV
+    (plain, gzipped or zipped) csv_chunk_rows rows at a time instead of
+    parsing it whole, for CSVs the database load streams too.
+    """
     try:
         file_path_obj = Path(file_path)
         file_name = file_path_obj.name
+        streamed = sheets_data is None and should_stream_xlsx(file_path, reader)
+        chunked_csv = sheets_data is None and csv_chunk_rows is not None and is_csv_source(file_path)
+
+        cached_schema = get_cached_schema(file_path, file_hash, sheets, columns, streamed, chunked_csv)
+        if cached_schema is not None:
+            return cached_schema
 
         logger.info(f"Starting schema generation for uploaded file: {file_name}")
 
-        sheets_data = read_excel_file(file_path)
+        if streamed or chunked_csv:
+            tables = []
+            for sheet_name in (sheets if sheets is not None else list_sheet_names(file_path)):
+                usecols = column_filter((columns or {}).get(sheet_name))
+                batches = (
+                    iter_csv_batches(file_path, sheet_name, usecols, csv_chunk_rows) if chunked_csv
+                    else iter_sheet_batches(file_path, sheet_name, usecols=usecols)
+                )
+                tables.append(profile_sheet_stream(sheet_name, batches))
+        else:
+            if sheets_data is None:
+                sheets_data = read_excel_file(file_path, file_hash, sheets, columns)
+            tables = [profile_sheet(sheet_name, df) for sheet_name, df in sheets_data.items()]
+        store_cached_tables(file_hash, profile_settings(sheets, columns, streamed, chunked_csv), tables)
 
-        tables = []
-        total_rows = 0
-        total_columns = 0
+        return build_schema(file_path, tables, _available_sheets(file_path, sheets), columns, streamed)
 
-        for sheet_name, df in sheets_data.items():
-            df.columns = df.columns.str.strip().str.replace(" ", "_", regex=False)
+    except Exception as e:
+        logger.error(f"Failed to generate schema for {file_path}: {e}", exc_info=True)
+        raise ValueError(f"Failed to generate schema: {e}")
 
-            columns = []
-            for col_name in df.columns:
-                columns.append(analyze_column(df[col_name], col_name))
 
-            tables.append({
-                "name": sheet_name,
-                "row_count": int(len(df)),
-                "column_count": int(len(df.columns)),
-                "columns": columns,
-            })
+def profile_sheet(sheet_name: str, df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Profile one sheet into its schema table entry (JSON-ready).
 
-            total_rows += len(df)
-            total_columns += len(df.columns)
+    Column names of df are cleaned in place. Runs in ingestion worker
+    processes as well, so it only depends on the DataFrame.
+    """
+    clean_column_names(df)
+    mode = resolve_profile_mode(len(df))
 
-        schema = {
-            "file_path": str(file_path),
-            "file_name": file_name,
-            "file_type": file_path_obj.suffix.lower(),
-            "tables": tables,
-            "summary": {
-                "total_tables": len(tables),
-                "total_rows": total_rows,
-                "total_columns": total_columns,
-            },
-        }
+    return {
+        "name": sheet_name,
+        "row_count": int(len(df)),
+        "column_count": int(len(df.columns)),
+        "profile_mode": mode,
+        "columns": profile_frame(df, mode),
+    }
 
-        schema = convert_numpy_types(schema)
 
-        return schema
+def profile_settings(
+    sheets: Optional[List[str]] = None,
+    columns: Optional[Dict[str, List[str]]] = None,
+    streamed: bool = False,
+    chunked_csv: bool = False
+) -> Dict[str, Any]:
+    """Settings that affect profiling results (part of the schema cache key)."""
+    settings = {
+        "mode": PROFILE_MODE,
+        "exact_max_rows": EXACT_PROFILE_MAX_ROWS,
+        "hll_precision": PROFILE_HLL_PRECISION,
+        "sample_rows": PROFILE_SAMPLE_ROWS,
+        "sheets": sheets,
+        "columns": columns,
+    }
+    if streamed:
+        settings["reader"] = "streaming"
+    if chunked_csv:
+        settings["csv_reader"] = "chunked"
+    return settings
 
-    except Exception as e:
-        logger.error(f"Failed to generate schema for {file_path}: {e}", exc_info=True)
-        raise ValueError(f"Failed to generate schema: {e}")
+
+def get_cached_schema(
+    file_path: str,
+    file_hash: Optional[str],
+    sheets: Optional[List[str]] = None,
+    columns: Optional[Dict[str, List[str]]] = None,
+    streamed: bool = False,
+    chunked_csv: bool = False
+) -> Optional[Dict[str, Any]]:
+    """Schema of file_path from the content-hash cache, or None on a miss."""
+    tables = get_cached_tables(file_hash, profile_settings(sheets, columns, streamed, chunked_csv))
+    if tables is None:
+        return None
+    return build_schema(file_path, tables, _available_sheets(file_path, sheets), columns, streamed)
+
+
+def build_schema(
+    file_path: str,
+    tables: List[Dict[str, Any]],
+    available_sheets: Optional[List[str]] = None,
+    columns: Optional[Dict[str, List[str]]] = None,
+    streamed: bool = False
+) -> Dict[str, Any]:
+    """
+    Assemble the schema of a file from its profiled sheets.
+
+    available_sheets lists every sheet of the workbook (loaded or not) and
+    columns records a column projection; both default to what tables holds.
+    streamed marks a workbook read with the streaming XLSX reader.
+    """
+    file_path_obj = Path(file_path)
+    if available_sheets is None:
+        available_sheets = [str(table["name"]) for table in tables]
+    schema = {
+        "file_path": str(file_path),
+        "file_name": file_path_obj.name,
+        "file_type": get_file_extension(file_path_obj),
+        "tables": tables,
+        "available_sheets": available_sheets,
+        "selected_columns": columns,
+        "summary": {
+            "total_tables": len(tables),
+            "total_rows": sum(table["row_count"] for table in tables),
+            "total_columns": sum(table["column_count"] for table in tables),
+        },
+    }
+    if streamed:
+        schema["reader"] = "streaming"
+    return schema
+
+
+def _available_sheets(file_path: str, sheets: Optional[List[str]]) -> Optional[List[str]]:
+    """All sheet names of a workbook when only some sheets are selected (else None)."""
+    return list_sheet_names(file_path) if sheets is not None else None
+
+
+def get_schema_selection(schema: Optional[Dict[str, Any]]) -> Tuple[Optional[List[str]], Optional[Dict[str, List[str]]]]:
+    """
+    The sheets and columns a schema was generated for, as (sheets, columns).
+
+    Schemas without a recorded selection select everything (None, None).
+    """
+    if not schema or "available_sheets" not in schema:
+        return None, None
+    sheets = [str(table["name"]) for table in schema.get("tables", [])]
+    return sheets, schema.get("selected_columns")
+
+
+def is_streamed_schema(schema: Optional[Dict[str, Any]]) -> bool:
+    """Whether a schema belongs to a workbook ingested with the streaming XLSX reader."""
+    return (schema or {}).get("reader") == "streaming"
+
+
+def get_schema_sheet_count(schema: Optional[Dict[str, Any]], default: int) -> int:
+    """
+    Number of sheets of the workbook a schema describes (for table naming).
+
+    Counts unloaded sheets too, so loading more sheets later never renames
+    the tables of the sheets already loaded.
+    """
+    available = (schema or {}).get("available_sheets")
+    return len(available) if available else default
 
 
 # =============================== SCHEMA SUMMARY ===============================
@@ -142,10 +349,17 @@ def convert_numpy_types(obj: Any) -> Any:
 # =============================== SQL TYPE INFERENCE ===============================
 def infer_sql_type(pandas_dtype: str, series: pd.Series) -> str:
     """Decide the SQL type based on pandas datatype and column values."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Compact frames store text as categoricals: decide on the categories
+        categories = series.cat.categories
+        return infer_sql_type(str(categories.dtype), pd.Series(categories))
+
     dtype_str = str(pandas_dtype).lower()
 
     if "int" in dtype_str:
-        if series.nunique() == 2 and set(series.dropna().unique()).issubset({0, 1}):
+        # Only 0 and 1 present <=> min 0 and max 1 (two vectorized reductions, no hashing)
+        low, high = series.min(), series.max()
+        if not pd.isna(low) and low == 0 and high == 1:
             return "BOOLEAN"
         return "INTEGER"
 
@@ -161,30 +375,77 @@ def infer_sql_type(pandas_dtype: str, series: pd.Series) -> str:
     if "time" in dtype_str:
         return "TIME"
 
+    if dtype_str in ("object", "str", "string") and _looks_like_datetime(series):
+        return "DATETIME"
+
     return "TEXT"
 
 
+def _looks_like_datetime(series: pd.Series) -> bool:
+    """Check whether a text/object column holds only dates or date-times."""
+    sample = series.dropna().head(DATETIME_SAMPLE_SIZE)
+    if sample.empty:
+        return False
+    for value in sample:
+        if isinstance(value, (datetime.datetime, datetime.date, pd.Timestamp)):
+            continue
+        if not isinstance(value, str) or not DATETIME_PATTERN.match(value):
+            return False
+    return True
+
+
+def infer_column_types(df: pd.DataFrame) -> Dict[str, str]:
+    """Infer the SQL type of every column of a DataFrame."""
+    return {str(col): infer_sql_type(str(df[col].dtype), df[col]) for col in df.columns}
+
+
 # =============================== COLUMN ANALYSIS ===============================
-def analyze_column(series: pd.Series, column_name: str) -> Dict[str, Any]:
-    """Analyze one column and return key information about it."""
+def resolve_profile_mode(row_count: int, mode: Optional[str] = None) -> str:
+    """Pick "exact" or "approx" profiling for a table of row_count rows."""
+    mode = (mode or PROFILE_MODE).lower()
+    if mode in ("exact", "approx"):
+        return mode
+    if mode != "auto":
+        logger.warning(f"Unknown PROFILE_MODE '{mode}'; using auto")
+    return "exact" if row_count <= EXACT_PROFILE_MAX_ROWS else "approx"
+
+
+def analyze_column(series: pd.Series, column_name: str, mode: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Analyze one column and return key information about it.
+
+    In "approx" mode distinct counts are estimated (see _approximate_profile)
+    and sample values are a reservoir sample; null counts stay exact.
+    """
     sql_type = infer_sql_type(str(series.dtype), series)
+    mode = resolve_profile_mode(len(series), mode)
 
     total_count = len(series)
     null_count = int(series.isna().sum())
-    null_percentage = (null_count / total_count * 100) if total_count > 0 else 0
-    unique_count = int(series.nunique())
 
-    # Collect up to 3 sample values
-    sample_values = []
-    non_null_series = series.dropna()
-    if len(non_null_series) > 0:
-        sample_values = non_null_series.iloc[:min(3, len(non_null_series))].tolist()
+    if mode == "exact":
+        unique_count = int(series.nunique())
+        is_potential_pk = (
+            unique_count == total_count and null_count == 0 and total_count > 0
+        )
+
+        # Collect up to 3 sample values
+        sample_values = []
+        non_null_series = series.dropna()
+        if len(non_null_series) > 0:
+            sample_values = non_null_series.iloc[:min(SAMPLE_VALUE_COUNT, len(non_null_series))].tolist()
+    else:
+        unique_count, is_potential_pk = _approximate_profile(series, sql_type, null_count)
+        sample_values = ReservoirSample(SAMPLE_VALUE_COUNT).add(series).values
 
-    is_potential_pk = (
-        unique_count == total_count and null_count == 0 and total_count > 0
+    return _column_entry(
+        column_name, sql_type, total_count, null_count, unique_count,
+        _clean_sample_values(sample_values), is_potential_pk,
     )
 
-    # Clean sample values
+
+def _clean_sample_values(sample_values: List[Any]) -> List[str]:
+    """Render sample values as strings, skipping nulls."""
     cleaned_samples = []
     for val in sample_values:
         if pd.isna(val):
@@ -195,7 +456,20 @@ def analyze_column(series: pd.Series, column_name: str) -> Dict[str, Any]:
             cleaned_samples.append(str(val))
         except Exception:
             continue
+    return cleaned_samples
+
 
+def _column_entry(
+    column_name: Any,
+    sql_type: str,
+    total_count: int,
+    null_count: int,
+    unique_count: int,
+    sample_values: List[str],
+    is_potential_pk: bool
+) -> Dict[str, Any]:
+    """Assemble the schema entry of one column from plain Python values."""
+    null_percentage = (null_count / total_count * 100) if total_count > 0 else 0
     return {
         "name": str(column_name),
         "type": sql_type,
@@ -204,30 +478,680 @@ def analyze_column(series: pd.Series, column_name: str) -> Dict[str, Any]:
         "null_percentage": round(null_percentage, 2),
         "unique_count": unique_count,
         "total_count": total_count,
-        "sample_values": cleaned_samples,
-        "is_potential_primary_key": is_potential_pk,
+        "sample_values": sample_values,
+        "is_potential_primary_key": bool(is_potential_pk),
     }
 
 
+def _approximate_profile(series: pd.Series, sql_type: str, null_count: int) -> Tuple[int, bool]:
+    """
+    Estimate the distinct count of a column and decide whether it can be a key.
+
+    Text columns are estimated from a row sample (hashing every string costs
+    more than an exact count); other columns feed a HyperLogLog sketch.
+    Only INTEGER and TEXT columns are considered as keys, and a candidate is
+    confirmed exactly, so is_potential_primary_key never reports a false key.
+
+    Returns:
+        Tuple[int, bool]: (estimated distinct count, is potential primary key)
+    """
+    total_count = len(series)
+    non_null_count = total_count - null_count
+
+    if sql_type == "TEXT":
+        sample = series.sample(n=PROFILE_SAMPLE_ROWS, random_state=0) if total_count > PROFILE_SAMPLE_ROWS else series
+        sample = sample.dropna()
+        unique_count = estimate_distinct_from_sample(sample, non_null_count)
+        candidate = sample.is_unique
+    else:
+        sketch = HyperLogLog(PROFILE_HLL_PRECISION).add_series(series)
+        unique_count = min(sketch.estimate(), non_null_count)
+        # Within 3 standard errors of the row count
+        candidate = unique_count >= total_count * (1 - 3 * sketch.relative_error)
+
+    if not (candidate and null_count == 0 and total_count > 0 and sql_type in ("INTEGER", "TEXT")):
+        return unique_count, False
+
+    # Sorted id columns are confirmed with one vectorized pass, the rest with a hash check
+    is_unique = (
+        (series.is_monotonic_increasing and bool((np.diff(series.to_numpy()) != 0).all()))
+        if sql_type == "INTEGER" else False
+    ) or bool(series.is_unique)
+    return (total_count, True) if is_unique else (unique_count, False)
+
+
+# =============================== FRAME PROFILING ===============================
+def profile_frame(df: pd.DataFrame, mode: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Profile every column of a DataFrame at once (same entries as analyze_column).
+
+    Null counts come from one isna pass over the frame. In "exact" mode the
+    distinct counts of numeric columns come from sorting whole same-dtype
+    blocks instead of hashing column by column, and sample values are read
+    from the first rows of the frame. Entries hold plain Python types, ready
+    for JSON.
+    """
+    total_count = len(df)
+    mode = resolve_profile_mode(total_count, mode)
+    null_counts = [int(count) for count in df.isna().sum().to_numpy()]
+
+    if mode == "exact":
+        unique_counts = _frame_distinct_counts(df, null_counts)
+        samples = _frame_sample_values(df)
+
+    columns = []
+    for position, col_name in enumerate(df.columns):
+        series = df.iloc[:, position]
+        sql_type = infer_sql_type(str(series.dtype), series)
+        null_count = null_counts[position]
+
+        if mode == "exact":
+            unique_count = unique_counts[position]
+            is_potential_pk = unique_count == total_count and null_count == 0 and total_count > 0
+            sample_values = samples[position]
+        else:
+            unique_count, is_potential_pk = _approximate_profile(series, sql_type, null_count)
+            sample_values = _clean_sample_values(ReservoirSample(SAMPLE_VALUE_COUNT).add(series).values)
+
+        columns.append(_column_entry(
+            col_name, sql_type, total_count, null_count, unique_count, sample_values, is_potential_pk
+        ))
+    return columns
+
+
+def _frame_distinct_counts(df: pd.DataFrame, null_counts: List[int]) -> List[int]:
+    """Exact distinct non-null counts of every column of a frame."""
+    total_count = len(df)
+    counts: List[Optional[int]] = [None] * len(df.columns)
+
+    # Numeric columns: sort each same-dtype block and count value changes per column
+    blocks: Dict[np.dtype, List[int]] = {}
+    for position, dtype in enumerate(df.dtypes):
+        if isinstance(dtype, np.dtype) and dtype.kind in "biuf" and total_count > 0:
+            blocks.setdefault(dtype, []).append(position)
+
+    pair_index = np.arange(total_count - 1)[None, :]
+    for dtype, positions in blocks.items():
+        for start in range(0, len(positions), PROFILE_BLOCK_COLUMNS):
+            chunk = positions[start:start + PROFILE_BLOCK_COLUMNS]
+            values = df.iloc[:, chunk].to_numpy(dtype=dtype).T
+            if dtype.kind in "iu":
+                # Integers over a narrow range: count occupied bins instead of sorting
+                low, high = values.min(axis=1), values.max(axis=1)
+                narrow = (high.astype(np.float64) - low.astype(np.float64)) <= 2 * total_count
+                # int64 arithmetic wraps consistently, so offsets stay exact within a narrow range
+                low = low.astype(np.int64)
+                for row in np.flatnonzero(narrow):
+                    occupied = np.bincount(values[row].astype(np.int64) - low[row])
+                    counts[chunk[row]] = int(np.count_nonzero(occupied))
+                values, chunk = values[~narrow], [p for p, is_narrow in zip(chunk, narrow) if not is_narrow]
+                if not chunk:
+                    continue
+
+            values = np.sort(values, axis=1)
+            nulls = np.array([null_counts[p] for p in chunk])[:, None]
+            changes = values[:, 1:] != values[:, :-1]
+            if dtype.kind == "f":
+                # NaNs sort last; only compare pairs within the non-null prefix
+                changes &= pair_index + 1 < total_count - nulls
+            distinct = changes.sum(axis=1) + (nulls[:, 0] < total_count)
+            for position, count in zip(chunk, distinct.tolist()):
+                counts[position] = int(count)
+
+    # Text, dates and extension types: hashing is faster than sorting
+    for position, count in enumerate(counts):
+        if count is None:
+            counts[position] = int(df.iloc[:, position].nunique())
+    return counts
+
+
+def _frame_sample_values(df: pd.DataFrame) -> List[List[str]]:
+    """The first SAMPLE_VALUE_COUNT non-null values of every column, as strings."""
+    head = df.head(PROFILE_SAMPLE_SCAN_ROWS)
+    head_values = head.to_numpy(dtype=object)
+    head_present = head.notna().to_numpy()
+
+    samples = []
+    for position in range(len(df.columns)):
+        rows = np.flatnonzero(head_present[:, position])[:SAMPLE_VALUE_COUNT]
+        if len(rows) < SAMPLE_VALUE_COUNT and len(df) > len(head):
+            # Mostly-null leading rows: scan the whole column
+            values = df.iloc[:, position].dropna().iloc[:SAMPLE_VALUE_COUNT].tolist()
+        else:
+            values = head_values[rows, position].tolist()
+        samples.append(_clean_sample_values(values))
+    return samples
+
+
+# =============================== STREAMED PROFILING ===============================
+def _widen_sql_type(current: Optional[str], observed: str) -> str:
+    """Common SQL type of a column whose batches were inferred as current and observed."""
+    if current is None or current == observed:
+        return observed
+    numeric = ("BOOLEAN", "INTEGER", "REAL")
+    if current in numeric and observed in numeric:
+        return numeric[max(numeric.index(current), numeric.index(observed))]
+    return "TEXT"
+
+
+def profile_sheet_stream(sheet_name: str, batches: Iterable[pd.DataFrame]) -> Dict[str, Any]:
+    """
+    Profile one sheet read in row batches (see xlsx_stream and
+    iter_csv_batches), in bounded memory.
+
+    Column types are inferred per batch and widened across batches (BOOLEAN
+    -> INTEGER -> REAL, anything else mixed -> TEXT). Distinct counts come
+    from HyperLogLog sketches merged over the batches and sample values are
+    the first non-null values. Proving uniqueness exactly would mean keeping
+    every value, so only INTEGER columns that strictly increase over the
+    whole sheet are reported as potential primary keys.
+    """
+    column_names: List[str] = []
+    sql_types: List[Optional[str]] = []
+    sketches: List[HyperLogLog] = []
+    null_counts: List[int] = []
+    samples: List[List[Any]] = []
+    increasing: List[bool] = []
+    last_values: List[Any] = []
+    total_count = 0
+
+    for batch in batches:
+        clean_column_names(batch)
+        if not column_names:
+            column_names = list(batch.columns)
+            sql_types = [None] * len(column_names)
+            sketches = [HyperLogLog(PROFILE_HLL_PRECISION) for _ in column_names]
+            null_counts = [0] * len(column_names)
+            samples = [[] for _ in column_names]
+            increasing = [True] * len(column_names)
+            last_values = [None] * len(column_names)
+
+        batch_nulls = batch.isna().sum().to_numpy()
+        for position in range(len(column_names)):
+            series = batch.iloc[:, position]
+            null_count = int(batch_nulls[position])
+            null_counts[position] += null_count
+            if null_count < len(series):
+                sql_types[position] = _widen_sql_type(
+                    sql_types[position], infer_sql_type(str(series.dtype), series)
+                )
+                sketches[position].add_series(series)
+            if len(samples[position]) < SAMPLE_VALUE_COUNT:
+                samples[position] += series.dropna().iloc[:SAMPLE_VALUE_COUNT - len(samples[position])].tolist()
+
+            if increasing[position] and len(series):
+                values = series.to_numpy()
+                increasing[position] = (
+                    null_count == 0
+                    and values.dtype.kind in "iu"
+                    and bool((values[1:] > values[:-1]).all())
+                    and (last_values[position] is None or values[0] > last_values[position])
+                )
+                last_values[position] = values[-1]
+        total_count += len(batch)
+
+    columns = []
+    for position, col_name in enumerate(column_names):
+        sql_type = sql_types[position] or "TEXT"
+        null_count = null_counts[position]
+        is_potential_pk = increasing[position] and sql_type == "INTEGER" and total_count > 0
+        unique_count = (
+            total_count if is_potential_pk
+            else min(sketches[position].estimate(), total_count - null_count)
+        )
+        columns.append(_column_entry(
+            col_name, sql_type, total_count, null_count, unique_count,
+            _clean_sample_values(samples[position]), is_potential_pk,
+        ))
+
+    return {
+        "name": sheet_name,
+        "row_count": total_count,
+        "column_count": len(column_names),
+        "profile_mode": "stream",
+        "columns": columns,
+    }
+
+
+# =============================== INCREMENTAL PROFILE ===============================
+def check_rows_against_profile(table: Dict[str, Any], df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Check rows to append to a profiled sheet against its schema entry.
+
+    df must have exactly the sheet's (cleaned) columns, in any order, and
+    every column's values must fit its profiled type: the type inferred for
+    the new values may only be narrower (e.g. INTEGER values in a REAL
+    column, anything in a TEXT column).
+
+    Returns:
+        pd.DataFrame: df with its columns in the sheet's order
+
+    Raises:
+        ValueError: Describing the missing, unexpected or mistyped columns
+    """
+    clean_column_names(df)
+    expected = [str(col["name"]) for col in table.get("columns", [])]
+    missing = [col for col in expected if col not in df.columns]
+    unexpected = [str(col) for col in df.columns if str(col) not in expected]
+    if missing or unexpected:
+        problems = []
+        if missing:
+            problems.append(f"missing column(s): {', '.join(missing)}")
+        if unexpected:
+            problems.append(f"unexpected column(s): {', '.join(unexpected)}")
+        raise ValueError(f"Columns do not match sheet '{table.get('name')}': {'; '.join(problems)}")
+
+    mistyped = []
+    for col in table["columns"]:
+        series = df[col["name"]]
+        if series.notna().any():
+            observed = infer_sql_type(str(series.dtype), series)
+            if _widen_sql_type(col["type"], observed) != col["type"]:
+                mistyped.append(f"{col['name']} ({observed}, expected {col['type']})")
+    if mistyped:
+        raise ValueError(f"Values do not match the column types of sheet '{table.get('name')}': {', '.join(mistyped)}")
+    return df[expected]
+
+
+def sketch_values(series: pd.Series, sql_type: str) -> pd.Series:
+    """
+    Non-null values of a column in the form they are stored in the database.
+
+    Sketches of rows read back from SQLite and of rows about to be inserted
+    must hash equal values identically, whatever dtype each side was parsed
+    with. Pass values normalized with normalize_frame_for_sql.
+    """
+    series = series.dropna()
+    if sql_type in ("INTEGER", "BOOLEAN", "REAL"):
+        numbers = pd.to_numeric(series, errors="coerce").dropna()
+        return numbers.astype(np.float64 if sql_type == "REAL" else np.int64)
+    return series.astype(str)
+
+
+def update_profile_with_rows(
+    table: Dict[str, Any],
+    rows: pd.DataFrame,
+    stored_rows: pd.DataFrame,
+    sketches: Dict[str, HyperLogLog],
+    still_unique: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """
+    Update a sheet's schema entry for appended rows, without the rows already profiled.
+
+    Row and null counts add up; distinct counts come from the column
+    sketches (which must already cover the previous rows and are updated in
+    place); sample values are kept. A potential primary key stays one only
+    if its new values are non-null, distinct, and listed in still_unique
+    (absent from the previous rows).
+
+    Args:
+        table: Schema entry of the sheet before the append
+        rows: Appended rows as parsed (columns in the sheet's order)
+        stored_rows: The same rows normalized for storage (see sketch_values)
+        sketches: Column name -> HyperLogLog of the column's stored values
+        still_unique: Key candidates whose new values were not in the table
+
+    Returns:
+        Dict[str, Any]: New schema entry of the sheet
+    """
+    still_unique = set(still_unique)
+    total_count = int(table["row_count"]) + len(rows)
+    new_nulls = rows.isna().sum()
+
+    columns = []
+    for col in table["columns"]:
+        name = col["name"]
+        series = rows[name]
+        sketches[name].add_series(sketch_values(stored_rows[name], col["type"]))
+        null_count = int(col["null_count"]) + int(new_nulls[name])
+        is_potential_pk = bool(
+            col.get("is_potential_primary_key")
+            and name in still_unique
+            and new_nulls[name] == 0
+            and series.is_unique
+        )
+        unique_count = (
+            total_count if is_potential_pk
+            else min(sketches[name].estimate(), total_count - null_count)
+        )
+        sample_values = list(col.get("sample_values") or [])
+        if len(sample_values) < SAMPLE_VALUE_COUNT:
+            sample_values += _clean_sample_values(series.dropna().iloc[:SAMPLE_VALUE_COUNT - len(sample_values)].tolist())
+        columns.append(_column_entry(
+            name, col["type"], total_count, null_count, unique_count, sample_values, is_potential_pk
+        ))
+
+    return {
+        **table,
+        "row_count": total_count,
+        # Distinct counts are sketch estimates from now on
+        "profile_mode": "incremental",
+        "columns": columns,
+    }
+
+
+# =============================== COLUMN NAME CLEANUP ===============================
+def clean_column_name(name: Any) -> str:
+    """Cleaned form of one column name (see clean_column_names)."""
+    return str(name).strip().replace(" ", "_")
+
+
+def clean_column_names(df: pd.DataFrame) -> pd.DataFrame:
+    """Strip column names and replace spaces with underscores (in place, idempotent)."""
+    df.columns = df.columns.astype(str).str.strip().str.replace(" ", "_", regex=False)
+    return df
+
+
+# =============================== COMPACT FRAMES ===============================
+def _is_low_cardinality(series: pd.Series) -> bool:
+    """Whether a text column has at most CATEGORY_MAX_UNIQUE_RATIO distinct values per row."""
+    if len(series) > 2 * CATEGORY_PROBE_ROWS:
+        probe = series.iloc[::len(series) // CATEGORY_PROBE_ROWS]
+        probe_ratio = probe.nunique() / len(probe)
+        # A sample's distinct ratio is, in expectation, no lower than the column's
+        if probe_ratio <= CATEGORY_MAX_UNIQUE_RATIO:
+            return True
+        if probe_ratio >= CATEGORY_PROBE_MAX_RATIO:
+            return False
+    return series.nunique() <= len(series) * CATEGORY_MAX_UNIQUE_RATIO
+
+
+def _compact_series(series: pd.Series) -> pd.Series:
+    """Smallest lossless representation of one column (the column itself if none is smaller)."""
+    dtype = series.dtype
+
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu":
+        return pd.to_numeric(series, downcast="integer" if dtype.kind == "i" else "unsigned")
+
+    if isinstance(dtype, np.dtype) and dtype.kind == "f" and dtype.itemsize > 4:
+        values = series.to_numpy()
+        narrowed = values.astype(np.float32)
+        # Only when every value survives the round trip (e.g. 0.5, 12.25, whole numbers)
+        if np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True):
+            return pd.Series(narrowed, index=series.index, name=series.name)
+        return series
+
+    is_text = pd.api.types.is_string_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype)
+    if not is_text or (dtype == object and pd.api.types.infer_dtype(series, skipna=True) != "string"):
+        return series
+    if _is_low_cardinality(series):
+        return series.astype("category")
+    if dtype == object and PYARROW_AVAILABLE:
+        return series.astype("string[pyarrow]")
+    return series
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a parsed sheet in place (INGEST_MEMORY_MODE=compact).
+
+    Integers are downcast to the narrowest width holding their range, floats
+    to float32 when no value changes, text columns with few distinct values
+    become categoricals and other all-text object columns Arrow-backed
+    strings. Values, and therefore profiles and loaded rows, are unchanged;
+    each replaced column is freed as soon as its compact copy exists.
+    """
+    if INGEST_MEMORY_MODE != "compact" or len(df) < COMPACT_MIN_ROWS:
+        return df
+    for position in range(len(df.columns)):
+        series = df.iloc[:, position]
+        compacted = _compact_series(series)
+        if compacted is not series:
+            df.isetitem(position, compacted)
+    return df
+
+
+def csv_dtype_plan(
+    file_path: str,
+    usecols: Optional[Callable[[Any], bool]] = None,
+    sheet_name: str = "Sheet1"
+) -> Optional[Dict[str, str]]:
+    """
+    Dtypes for the text columns of a CSV, planned from its leading rows.
+
+    Parsing low-cardinality text straight into categoricals avoids building
+    (and then converting) a Python string object per cell.
+    """
+    if INGEST_MEMORY_MODE != "compact":
+        return None
+    with open_csv(file_path, sheet_name) as source:
+        sample = pd.read_csv(source, nrows=CSV_DTYPE_SAMPLE_ROWS, usecols=usecols, low_memory=False)
+    if len(sample) < min(COMPACT_MIN_ROWS, CSV_DTYPE_SAMPLE_ROWS):
+        return None
+
+    plan = {}
+    for col in sample.columns:
+        series = sample[col]
+        if not pd.api.types.is_string_dtype(series.dtype) or pd.api.types.infer_dtype(series, skipna=True) != "string":
+            continue
+        if series.nunique() <= len(series) * CATEGORY_MAX_UNIQUE_RATIO:
+            plan[col] = "category"
+    return plan or None
+
+
+def read_csv_compact(
+    file_path: str,
+    usecols: Optional[Callable[[Any], bool]] = None,
+    sheet_name: str = "Sheet1"
+) -> pd.DataFrame:
+    """
+    Read a CSV into a compact frame, CSV_READ_CHUNK_ROWS rows at a time.
+
+    Low-cardinality text columns (planned from the leading rows) are parsed
+    straight into categoricals and numbers are downcast per chunk, so only
+    one chunk is ever held in the parser's wide representation. Values are
+    the same as a single pd.read_csv(low_memory=False) pass; in the rare case
+    a column parses as numbers in some chunks and as text in others, the file
+    is re-read in one pass to keep that guarantee. sheet_name picks the
+    member of a zip archive (see file_formats.open_csv).
+    """
+    plan = csv_dtype_plan(file_path, usecols, sheet_name)
+    # Column name -> the column's part of every chunk (chunk frames are not kept)
+    parts: Dict[str, List[pd.Series]] = {}
+    with open_csv(file_path, sheet_name) as source:
+        reader = pd.read_csv(source, usecols=usecols, dtype=plan, chunksize=CSV_READ_CHUNK_ROWS, low_memory=False)
+        for chunk in reader:
+            for position, col in enumerate(chunk.columns):
+                series = chunk.iloc[:, position]
+                if isinstance(series.dtype, np.dtype) and series.dtype.kind in "iuf":
+                    series = _compact_series(series)
+                parts.setdefault(col, []).append(series)
+            del chunk
+
+    if not parts:  # header-only file
+        return read_csv_sheet(file_path, sheet_name, usecols, compact=False)
+
+    for col, column in parts.items():
+        numeric = {isinstance(part.dtype, np.dtype) and part.dtype.kind in "iufb" for part in column}
+        if len(numeric) > 1:
+            logger.info(f"Column '{col}' of {file_path} changes type between chunks; re-reading in one pass")
+            parts.clear()
+            with open_csv(file_path, sheet_name) as source:
+                return compact_frame(pd.read_csv(source, low_memory=False, usecols=usecols, dtype=plan))
+
+    data = {}
+    for col in list(parts):
+        column = parts.pop(col)  # each column's chunks are freed once merged
+        if len(column) == 1:
+            data[col] = column[0]
+        elif isinstance(column[0].dtype, pd.CategoricalDtype):
+            data[col] = pd.Series(pd.api.types.union_categoricals(column, sort_categories=True), name=col)
+        else:
+            data[col] = pd.concat(column, ignore_index=True)
+        del column
+    frame = compact_frame(pd.DataFrame(data))
+    # The parser's chunk buffers stay cached in Arrow's pool otherwise
+    release_unused_memory()
+    return frame
+
+
 # =============================== FILE READER ===============================
-def read_excel_file(file_path: str) -> Dict[str, pd.DataFrame]:
-    """Read a CSV or Excel file and return all sheets as DataFrames."""
-    file_ext = Path(file_path).suffix.lower()
+def list_sheet_names(file_path: str) -> List[str]:
+    """
+    Sheet names of a file without parsing any sheet.
 
-    if file_ext == ".csv":
-        logger.info(f"Reading CSV file: {file_path}")
-        df = pd.read_csv(file_path, low_memory=False)
-        return {"Sheet1": df}
+    Single-table formats (CSV, Parquet, JSON Lines) have one, "Sheet1"; a zip
+    archive has one per CSV member.
+    """
+    file_ext = get_file_extension(file_path)
+    if file_ext in SINGLE_SHEET_EXTENSIONS:
+        return ["Sheet1"]
+    if file_ext == ".zip":
+        return list(list_zip_members(file_path))
+    if file_ext not in EXCEL_ENGINES:
+        raise ValueError(f"Unsupported file type: {file_ext}")
+    with pd.ExcelFile(file_path, engine=EXCEL_ENGINES[file_ext]) as workbook:
+        return [str(name) for name in workbook.sheet_names]
 
-    if file_ext in [".xlsx", ".xls"]:
-        logger.info(f"Reading Excel file: {file_path}")
-        engine = "openpyxl" if file_ext == ".xlsx" else "xlrd"
-        return pd.read_excel(file_path, sheet_name=None, engine=engine)
 
-    raise ValueError(f"Unsupported file type: {file_ext}")
+def list_sheets(file_path: str) -> List[Dict[str, Any]]:
+    """
+    List the sheets of a file with their (cleaned) column names.
+
+    Only the header row of each sheet is read, so this stays cheap for
+    workbooks with very large sheets.
+    """
+    file_ext = get_file_extension(file_path)
+    if is_csv_source(file_path):
+        sheets = []
+        for name in list_sheet_names(file_path):
+            with open_csv(file_path, name) as source:
+                header = pd.read_csv(source, nrows=0)
+            sheets.append({"name": name, "columns": list(clean_column_names(header).columns)})
+        return sheets
+    if file_ext in (".parquet", ".jsonl"):
+        names = parquet_column_names(file_path) if file_ext == ".parquet" else jsonl_column_names(file_path)
+        header = pd.DataFrame(columns=names)
+        return [{"name": "Sheet1", "columns": list(clean_column_names(header).columns)}]
+    if file_ext not in EXCEL_ENGINES:
+        raise ValueError(f"Unsupported file type: {file_ext}")
+    with pd.ExcelFile(file_path, engine=EXCEL_ENGINES[file_ext]) as workbook:
+        return [
+            {"name": str(name), "columns": list(clean_column_names(workbook.parse(name, nrows=0)).columns)}
+            for name in workbook.sheet_names
+        ]
+
 
+def read_csv_sheet(
+    file_path: str,
+    sheet_name: str = "Sheet1",
+    usecols: Optional[Callable[[Any], bool]] = None,
+    compact: Optional[bool] = None
+) -> pd.DataFrame:
+    """
+    Parse one CSV sheet of a file: a plain or gzipped CSV, or a zip archive member.
 
+    compact defaults to INGEST_MEMORY_MODE == "compact" (see read_csv_compact).
+    """
+    if compact is None:
+        compact = INGEST_MEMORY_MODE == "compact"
+    if compact:
+        return read_csv_compact(file_path, usecols, sheet_name)
+    with open_csv(file_path, sheet_name) as source:
+        return pd.read_csv(source, low_memory=False, usecols=usecols)
 
 
+def iter_csv_batches(
+    file_path: str,
+    sheet_name: str = "Sheet1",
+    usecols: Optional[Callable[[Any], bool]] = None,
+    chunk_rows: int = CSV_READ_CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    """
+    Parse one CSV sheet chunk_rows rows at a time, holding one chunk in memory.
 
+    A header-only sheet yields a single empty frame, so its columns are
+    still profiled.
+    """
+    with open_csv(file_path, sheet_name) as source:
+        yield from pd.read_csv(source, usecols=usecols, chunksize=chunk_rows, low_memory=False)
 
+
+def column_filter(columns: Optional[List[str]]) -> Optional[Callable[[Any], bool]]:
+    """usecols callable keeping the columns whose cleaned name is in columns (None keeps all)."""
+    if columns is None:
+        return None
+    wanted = set(columns)
+    return lambda name: clean_column_name(name) in wanted
+
+
+def select_sheets(
+    sheets_data: Dict[str, pd.DataFrame],
+    sheets: Optional[List[str]] = None,
+    columns: Optional[Dict[str, List[str]]] = None
+) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    Project parsed sheets to a sheet/column selection.
+
+    Returns:
+        Optional[Dict[str, pd.DataFrame]]: Selected sheets in selection order,
+        or None if a selected sheet or column is not in sheets_data
+    """
+    if sheets is None and columns is None:
+        return sheets_data
+
+    selected = {}
+    for name in (sheets if sheets is not None else list(sheets_data)):
+        if name not in sheets_data:
+            return None
+        df = sheets_data[name]
+        wanted = (columns or {}).get(name)
+        if wanted is not None:
+            keep = [col for col in df.columns if clean_column_name(col) in set(wanted)]
+            if len(keep) < len(set(wanted)):
+                return None
+            df = df[keep]
+        selected[name] = df
+    return selected
+
+
+def read_excel_file(
+    file_path: str,
+    file_hash: Optional[str] = None,
+    sheets: Optional[List[str]] = None,
+    columns: Optional[Dict[str, List[str]]] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Read an uploaded file (Excel, CSV, gzipped CSV, zip of CSVs, Parquet or
+    JSON Lines) and return its sheets as DataFrames.
+
+    When file_hash is given and a columnar sidecar holding the selection exists
+    for it, the sheets are memory-mapped from the sidecar instead of parsing
+    the original file. sheets limits the sheets that are parsed and columns
+    (sheet name -> cleaned column names) the columns of each sheet; unselected
+    sheets and columns are never materialized.
+    """
+    sidecar_data = read_sidecar(file_hash)
+    if sidecar_data is not None:
+        selected = select_sheets(sidecar_data, sheets, columns)
+        if selected is not None:
+            logger.info(f"Reading sheets of {file_path} from columnar sidecar")
+            return selected
+
+    file_ext = get_file_extension(file_path)
+    columns = columns or {}
+
+    if is_csv_source(file_path):
+        logger.info(f"Reading CSV file: {file_path}")
+        names = sheets if sheets is not None else list_sheet_names(file_path)
+        return {name: read_csv_sheet(file_path, name, column_filter(columns.get(name))) for name in names}
+
+    if file_ext == ".parquet":
+        logger.info(f"Reading Parquet file: {file_path}")
+        return {"Sheet1": compact_frame(read_parquet_frame(file_path, column_filter(columns.get("Sheet1"))))}
+
+    if file_ext == ".jsonl":
+        logger.info(f"Reading JSON Lines file: {file_path}")
+        return {"Sheet1": compact_frame(read_jsonl_frame(file_path, column_filter(columns.get("Sheet1"))))}
+
+    if file_ext in EXCEL_ENGINES:
+        logger.info(f"Reading Excel file: {file_path}")
+        with pd.ExcelFile(file_path, engine=EXCEL_ENGINES[file_ext]) as workbook:
+            names = sheets if sheets is not None else [str(name) for name in workbook.sheet_names]
+            # Each sheet is compacted right after parsing, before the next one is read
+            return {
+                name: compact_frame(workbook.parse(name, usecols=column_filter(columns.get(name))))
+                for name in names
+            }
+
+    raise ValueError(f"Unsupported file type: {file_ext}")
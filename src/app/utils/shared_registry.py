@@ -10,6 +10,7 @@ import json
 from pathlib import Path
 from typing import Dict
 from src.app.configs.logger_config import get_logger
+from src.app.utils.file_formats import get_file_stem
 
 logger = get_logger("Shared-Registry")
 
@@ -47,7 +48,7 @@ def get_file_registry_from_disk() -> Dict[str, Dict]:
     logger.debug(f"Found {len(files)} file(s) on disk, reconstructing registry...")
     
     for file_path in files:
-        file_id = file_path.stem
+        file_id = get_file_stem(file_path)
         metadata_file = METADATA_DIR / f"{file_id}.json"
         
         if not metadata_file.exists():
@@ -74,7 +75,8 @@ def get_file_registry_from_disk() -> Dict[str, Dict]:
                 "file_path": str(file_path),
                 "file_hash": metadata.get("file_hash", ""),
                 "schema": schema,
-                "uploaded_at": metadata.get("uploaded_at")
+                "uploaded_at": metadata.get("uploaded_at"),
+                "deltas": metadata.get("deltas", [])
             }
             
             logger.debug(
@@ -0,0 +1,243 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Sidecar Cache - Columnar Arrow IPC copies of uploaded files, keyed by content hash.
+
+Parsing .xlsx files with openpyxl is by far the slowest step of ingestion. At
+upload time the parsed sheets are written once as uncompressed Arrow IPC files;
+later reads (schema generation, database rebuilds) memory-map them instead of
+re-parsing the original upload.
+
+This module provides:
+- write_sidecar: store parsed sheets for a file hash
+- read_sidecar: memory-map the sheets back into DataFrames
+- read_sidecar_tables: memory-map the sheets as Arrow tables (for columnar engines)
+- remove_sidecar / prune_sidecars: eviction when uploads are deleted
+
+pyarrow is optional; without it every function is a no-op and callers fall
+back to parsing the original file.
+"""
+
+# =============================== IMPORTS ===============================
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+from src.app.configs.logger_config import get_logger
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    PYARROW_AVAILABLE = False
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-Sidecar-Cache")
+
+# =============================== CONSTANTS ===============================
+SIDECAR_DIR = Path("cache") / "sidecars"
+SIDECAR_ENABLED = os.getenv("SIDECAR_ENABLED", "true").lower() == "true"
+MANIFEST_FILE = "manifest.json"
+
+if not PYARROW_AVAILABLE:
+    logger.warning("pyarrow is not installed; columnar sidecar cache is disabled")
+
+
+# =============================== HELPERS ===============================
+def _is_enabled() -> bool:
+    return SIDECAR_ENABLED and PYARROW_AVAILABLE
+
+
+def get_sidecar_dir(file_hash: str) -> Path:
+    """Directory holding the sidecar files of one upload."""
+    return SIDECAR_DIR / file_hash
+
+
+def has_sidecar(file_hash: Optional[str]) -> bool:
+    """Check whether a complete sidecar exists for a file hash."""
+    return bool(file_hash) and _is_enabled() and (get_sidecar_dir(file_hash) / MANIFEST_FILE).exists()
+
+
+def _to_arrow_table(df: pd.DataFrame) -> "pa.Table":
+    """
+    Convert a DataFrame to an Arrow table.
+
+    Object columns mixing incompatible Python types (e.g. text and dates in one
+    Excel column) cannot be represented in Arrow; those are stored as text,
+    which is how they end up in the database anyway.
+    """
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+        df = df.copy(deep=False)
+        for col in df.columns:
+            if df[col].dtype != object:
+                continue
+            try:
+                pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+                df[col] = df[col].map(str, na_action="ignore")
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+
+# =============================== WRITE ===============================
+def write_sidecar(file_hash: str, sheets_data: Dict[str, pd.DataFrame]) -> bool:
+    """
+    Store parsed sheets as Arrow IPC files for later zero-copy reads.
+
+    The sidecar is written to a temporary directory and renamed into place, so
+    readers never see a partial sidecar.
+
+    Args:
+        file_hash: SHA-256 of the uploaded file
+        sheets_data: Parsed sheets (sheet name -> DataFrame)
+
+    Returns:
+        bool: True if the sidecar was written
+    """
+    if not _is_enabled() or not file_hash:
+        return False
+    if has_sidecar(file_hash):
+        return True
+
+    start_time = time.perf_counter()
+    target_dir = get_sidecar_dir(file_hash)
+    temp_dir = target_dir.with_name(f"{file_hash}.tmp-{os.getpid()}")
+
+    try:
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        sheets = []
+        for index, (sheet_name, df) in enumerate(sheets_data.items()):
+            table = _to_arrow_table(df)
+            file_name = f"{index}.arrow"
+            with pa.OSFile(str(temp_dir / file_name), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            sheets.append({"name": str(sheet_name), "file": file_name, "rows": table.num_rows})
+
+        with open(temp_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump({"file_hash": file_hash, "sheets": sheets}, f, indent=2)
+
+        if target_dir.exists():
+            shutil.rmtree(target_dir, ignore_errors=True)
+        temp_dir.replace(target_dir)
+
+        logger.info(
+            f"Wrote sidecar for {file_hash[:16]}... ({len(sheets)} sheet(s)) "
+            f"in {time.perf_counter() - start_time:.2f}s"
+        )
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to write sidecar for {file_hash[:16]}...: {e}", exc_info=True)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return False
+
+
+# =============================== READ ===============================
+def read_sidecar_tables(file_hash: Optional[str]) -> Optional[Dict[str, "pa.Table"]]:
+    """
+    Memory-map the sidecar of a file as Arrow tables (no copy of the data).
+
+    Args:
+        file_hash: SHA-256 of the uploaded file
+
+    Returns:
+        Optional[Dict[str, pa.Table]]: Sheets in original order, or None if
+        there is no usable sidecar
+    """
+    if not has_sidecar(file_hash):
+        return None
+
+    sidecar_dir = get_sidecar_dir(file_hash)
+    try:
+        with open(sidecar_dir / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        tables: Dict[str, "pa.Table"] = {}
+        for sheet in manifest["sheets"]:
+            source = pa.memory_map(str(sidecar_dir / sheet["file"]), "r")
+            tables[sheet["name"]] = pa.ipc.open_file(source).read_all()
+        return tables
+
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable sidecar for {file_hash[:16]}...: {e}")
+        return None
+
+
+def read_sidecar(file_hash: Optional[str]) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    Memory-map the sidecar of a file back into DataFrames.
+
+    Numeric columns without nulls are handed to pandas without copying
+    (split_blocks); other columns are materialized from the mapped buffers.
+
+    Args:
+        file_hash: SHA-256 of the uploaded file
+
+    Returns:
+        Optional[Dict[str, pd.DataFrame]]: Sheets in original order, or None if
+        there is no usable sidecar
+    """
+    start_time = time.perf_counter()
+    tables = read_sidecar_tables(file_hash)
+    if tables is None:
+        return None
+
+    sheets_data = {name: table.to_pandas(split_blocks=True) for name, table in tables.items()}
+    logger.info(
+        f"Read sidecar for {file_hash[:16]}... ({len(sheets_data)} sheet(s)) "
+        f"in {time.perf_counter() - start_time:.2f}s"
+    )
+    return sheets_data
+
+
+# =============================== EVICTION ===============================
+def remove_sidecar(file_hash: Optional[str]) -> bool:
+    """
+    Delete the sidecar of a file.
+
+    Args:
+        file_hash: SHA-256 of the deleted upload
+
+    Returns:
+        bool: True if a sidecar was removed
+    """
+    if not file_hash:
+        return False
+    sidecar_dir = get_sidecar_dir(file_hash)
+    if not sidecar_dir.exists():
+        return False
+    shutil.rmtree(sidecar_dir, ignore_errors=True)
+    logger.info(f"Removed sidecar for {file_hash[:16]}...")
+    return True
+
+
+def prune_sidecars(keep_hashes: Iterable[str]) -> int:
+    """
+    Delete sidecars (and leftover temporary directories) of files no longer registered.
+
+    Args:
+        keep_hashes: Hashes of the files currently in the registry
+
+    Returns:
+        int: Number of directories removed
+    """
+    if not SIDECAR_DIR.exists():
+        return 0
+
+    keep = set(keep_hashes)
+    removed = 0
+    for entry in SIDECAR_DIR.iterdir():
+        if entry.is_dir() and entry.name not in keep:
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+
+    if removed:
+        logger.info(f"Pruned {removed} stale sidecar(s)")
+    return removed
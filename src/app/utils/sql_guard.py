@@ -0,0 +1,111 @@
+# =============================== FILE PURPOSE ===============================
+"""
+SQL Guard - Local validation of generated SQL against the catalog.
+
+Checking that a generated query is a single read-only SELECT over existing
+tables and columns does not need a model: SQLite does it while preparing the
+statement. The query is compiled with EXPLAIN (nothing is scanned) on a pooled
+read connection with an authorizer installed:
+- only SELECT, READ, FUNCTION and RECURSIVE actions are allowed, so INSERT,
+  UPDATE, DELETE, DDL, PRAGMA and ATTACH are denied,
+- every table read must be a cataloged user table (internal tables such as
+  the catalog itself and sqlite_master are denied),
+- unknown tables or columns and syntax errors fail the prepare,
+- more than one statement is rejected.
+
+The SQLite query engine installs the same authorizer on every query it runs,
+so queries that reach execute_sql without this pre-check (the MCP tool called
+by a model) are held to the same rules.
+
+This module provides:
+- SqlValidationError: raised with a user-readable reason
+- ReadOnlyAuthorizer: the SQLite authorizer used for validation
+- validate_select_query: validate a query and return the tables it reads
+"""
+
+# =============================== IMPORTS ===============================
+import sqlite3
+from typing import List, Optional, Set
+
+from src.app.configs.logger_config import get_logger
+from src.app.utils.database_manager import get_all_table_names, read_connection
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-Sql-Guard")
+
+# =============================== CONSTANTS ===============================
+_ALLOWED_ACTIONS = {
+    sqlite3.SQLITE_SELECT,
+    sqlite3.SQLITE_READ,
+    sqlite3.SQLITE_FUNCTION,
+    sqlite3.SQLITE_RECURSIVE,
+}
+
+
+# =============================== ERRORS ===============================
+class SqlValidationError(ValueError):
+    """A generated query is not a valid read-only query over the loaded tables."""
+
+
+# =============================== AUTHORIZER ===============================
+class ReadOnlyAuthorizer:
+    """
+    SQLite authorizer that allows reads of cataloged tables only.
+
+    Install it with conn.set_authorizer(authorizer) before preparing a query.
+    The first denial is kept in reason; tables holds the tables read.
+    """
+
+    def __init__(self, table_names: List[str]):
+        self.allowed_tables = {name.lower() for name in table_names}
+        self.tables: Set[str] = set()
+        self.reason: Optional[str] = None
+
+    def _deny(self, reason: str) -> int:
+        if self.reason is None:
+            self.reason = reason
+        return sqlite3.SQLITE_DENY
+
+    def __call__(self, action, arg1, arg2, db_name, trigger) -> int:
+        if action not in _ALLOWED_ACTIONS:
+            return self._deny("Only read-only SELECT queries are allowed")
+        if action == sqlite3.SQLITE_READ and arg1:
+            if arg1.lower() not in self.allowed_tables:
+                return self._deny(f"Table '{arg1}' is not a loaded table")
+            self.tables.add(arg1)
+        return sqlite3.SQLITE_OK
+
+
+# =============================== PUBLIC API ===============================
+def validate_select_query(query: str) -> Set[str]:
+    """
+    Check that a query is one read-only SELECT over loaded tables and columns.
+
+    Args:
+        query: Generated SQL
+
+    Returns:
+        Set[str]: Tables the query reads
+
+    Raises:
+        SqlValidationError: If the query is empty, not read-only, reads an
+                            unknown table or column, or does not compile
+    """
+    query = (query or "").strip().rstrip(";").strip()
+    if not query:
+        raise SqlValidationError("The query is empty")
+
+    authorizer = ReadOnlyAuthorizer(get_all_table_names())
+    try:
+        with read_connection(query) as conn:
+            conn.set_authorizer(authorizer)
+            try:
+                conn.execute(f"EXPLAIN {query}").fetchall()
+            finally:
+                conn.set_authorizer(None)
+    except (sqlite3.Error, sqlite3.Warning) as e:
+        reason = authorizer.reason or str(e)
+        logger.info(f"Rejected generated query: {reason}")
+        raise SqlValidationError(reason) from e
+
+    return authorizer.tables
@@ -0,0 +1,215 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Table Append - Incremental appends of delta files to loaded tables.
+
+A daily refresh adds a few rows to a long history. Re-uploading the whole
+history would re-parse, re-profile and reload every row; appending a delta
+file instead costs O(delta):
+- the delta is checked against the stored profile of the target sheet
+  (same columns, compatible types),
+- rows whose key already exists are skipped and the rest are inserted into
+  the existing table (see database_manager.append_rows_to_db),
+- the sheet's profile is updated from the new rows alone: counts add up and
+  distinct counts come from HyperLogLog sketches merged with the delta's.
+
+The sketches of the rows already loaded are built once, on the first append
+(one scan of the table), and kept in cache/sketches; a missing or outdated
+sketch file is rebuilt the same way. Delta files are kept with the upload, so
+rebuilding a file's database replays its deltas in order.
+
+This module provides:
+- read_delta: parse a delta file into the rows of one sheet
+- append_delta: insert a delta's new rows and return the sheet's new profile
+- replay_deltas: re-apply a file's deltas after its tables were rebuilt
+- remove_table_sketches: forget the sketches of a deleted upload
+"""
+
+# =============================== IMPORTS ===============================
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.app.configs.logger_config import get_logger
+from src.app.utils.database_manager import (
+    append_rows_to_db,
+    get_physical_table_name,
+    iter_table_frames,
+    normalize_frame_for_sql,
+)
+from src.app.utils.profile_sketches import HyperLogLog
+from src.app.utils.schema_generator import (
+    PROFILE_HLL_PRECISION,
+    check_rows_against_profile,
+    get_schema_sheet_count,
+    read_excel_file,
+    sketch_values,
+    update_profile_with_rows,
+)
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-Table-Append")
+
+# =============================== CONSTANTS ===============================
+SKETCH_DIR = Path("cache") / "sketches"
+
+
+# =============================== SKETCH STORE ===============================
+def _sketch_path(file_id: str) -> Path:
+    return SKETCH_DIR / f"{file_id}.json"
+
+
+def _read_sketch_file(file_id: str) -> Dict[str, Any]:
+    try:
+        with open(_sketch_path(file_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_sketch_file(file_id: str, data: Dict[str, Any]) -> None:
+    SKETCH_DIR.mkdir(parents=True, exist_ok=True)
+    path = _sketch_path(file_id)
+    temp_path = path.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    temp_path.replace(path)
+
+
+def _load_sketches(file_id: str, table: Dict[str, Any], physical_name: str) -> Dict[str, HyperLogLog]:
+    """
+    Column sketches of a sheet's loaded rows.
+
+    Stored sketches are used while they cover exactly the sheet's profiled
+    rows; otherwise they are rebuilt by scanning the table once.
+    """
+    stored = _read_sketch_file(file_id).get(str(table["name"]))
+    column_names = [col["name"] for col in table["columns"]]
+    if stored and stored.get("row_count") == table["row_count"] and set(stored.get("columns", {})) == set(column_names):
+        return {name: HyperLogLog.from_dict(stored["columns"][name]) for name in column_names}
+
+    logger.info(f"Building column sketches of '{physical_name}' from its {table['row_count']} loaded rows")
+    sketches = {name: HyperLogLog(PROFILE_HLL_PRECISION) for name in column_names}
+    types = {col["name"]: col["type"] for col in table["columns"]}
+    for frame in iter_table_frames(physical_name):
+        for name in column_names:
+            sketches[name].add_series(sketch_values(frame[name], types[name]))
+    return sketches
+
+
+def _store_sketches(file_id: str, table: Dict[str, Any], sketches: Dict[str, HyperLogLog]) -> None:
+    data = _read_sketch_file(file_id)
+    data[str(table["name"])] = {
+        "row_count": table["row_count"],
+        "columns": {name: sketch.to_dict() for name, sketch in sketches.items()},
+    }
+    _write_sketch_file(file_id, data)
+
+
+def remove_table_sketches(file_id: str) -> None:
+    """Delete the stored sketches of an upload."""
+    _sketch_path(file_id).unlink(missing_ok=True)
+
+
+# =============================== DELTAS ===============================
+def read_delta(file_path: str, sheet_name: str) -> pd.DataFrame:
+    """
+    Parse a delta file into the rows to append to one sheet.
+
+    The delta may hold a single sheet (any name) or a sheet with the target's
+    name among others.
+
+    Raises:
+        ValueError: If the delta holds several sheets and none is named sheet_name
+    """
+    sheets = read_excel_file(file_path)
+    if sheet_name in sheets:
+        return sheets[sheet_name]
+    if len(sheets) == 1:
+        return next(iter(sheets.values()))
+    raise ValueError(f"Delta file has {len(sheets)} sheets and none is named '{sheet_name}'")
+
+
+def _find_table(schema: Dict[str, Any], sheet_name: str) -> Dict[str, Any]:
+    for table in schema.get("tables", []):
+        if str(table["name"]) == sheet_name:
+            return table
+    raise ValueError(f"Sheet '{sheet_name}' is not loaded")
+
+
+def append_delta(
+    file_id: str,
+    source_table: str,
+    schema: Dict[str, Any],
+    sheet_name: str,
+    rows: pd.DataFrame,
+    key_columns: Optional[List[str]] = None
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Append the rows of a delta to one loaded sheet of an upload.
+
+    Args:
+        file_id: Upload the sheet belongs to (sketch store key)
+        source_table: Table name of the upload
+        schema: Current schema of the upload
+        sheet_name: Sheet to append to
+        rows: Parsed delta rows (see read_delta)
+        key_columns: Columns identifying a row; rows whose key is already
+                     loaded are skipped (None: append every row)
+
+    Returns:
+        Tuple[Dict[str, Any], int]: (new schema entry of the sheet, rows appended)
+
+    Raises:
+        ValueError: If the rows do not match the sheet's columns and types
+    """
+    table = _find_table(schema, sheet_name)
+    rows = check_rows_against_profile(table, rows)
+    column_types = {col["name"]: col["type"] for col in table["columns"]}
+    physical_name = get_physical_table_name(
+        source_table, sheet_name, get_schema_sheet_count(schema, len(schema.get("tables", [])))
+    )
+
+    sketches = _load_sketches(file_id, table, physical_name)
+    key_candidates = [col["name"] for col in table["columns"] if col.get("is_potential_primary_key")]
+    inserted, still_unique = append_rows_to_db(
+        physical_name, rows, column_types, key_columns, unique_columns=key_candidates
+    )
+
+    new_table = update_profile_with_rows(
+        table, inserted, normalize_frame_for_sql(inserted, column_types), sketches, still_unique
+    )
+    _store_sketches(file_id, new_table, sketches)
+    return new_table, len(inserted)
+
+
+def replay_deltas(info: Dict[str, Any]) -> int:
+    """
+    Re-apply the deltas of an upload after its tables were rebuilt from the upload.
+
+    Each delta is appended with the key it was appended with, so the rows
+    end up as they were; the schema already accounts for them.
+
+    Args:
+        info: Registry entry of the upload (file_path, table_name, schema, deltas)
+
+    Returns:
+        int: Rows appended
+    """
+    schema = info.get("schema") or {}
+    sheet_count = get_schema_sheet_count(schema, len(schema.get("tables", [])))
+    appended = 0
+    for delta in info.get("deltas") or []:
+        table = _find_table(schema, delta["sheet"])
+        rows = check_rows_against_profile(table, read_delta(delta["file_path"], delta["sheet"]))
+        inserted, _ = append_rows_to_db(
+            get_physical_table_name(info["table_name"], delta["sheet"], sheet_count),
+            rows,
+            {col["name"]: col["type"] for col in table["columns"]},
+            delta.get("key_columns"),
+        )
+        appended += len(inserted)
+    if appended:
+        logger.info(f"Replayed {len(info['deltas'])} delta(s) of '{info['table_name']}': {appended} row(s)")
+    return appended
@@ -0,0 +1,229 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Upload Jobs - Runs uploads in the background and tracks their progress.
+
+Hashing, parsing, profiling and loading a large file takes seconds to
+minutes of blocking work. Run inside the upload endpoint, it would freeze the
+event loop and every other request on the worker, chat included. Instead the
+endpoint saves the file, submits a job to a small thread pool and returns the
+job's id at once; clients poll the job until it completes or fails.
+
+Threads suit this: the blocking work is file I/O, SQLite and pandas/Arrow
+code that mostly releases the GIL, and workbook sheets are already parsed
+in worker processes (see parallel_ingest). A job needs the registry of the
+API process, so it cannot run in a separate process itself.
+
+Each job moves through stages with a share of the overall percent:
+queued → hashing → profiling → loading → finalizing → completed (or failed).
+A stage reports its own progress as a fraction, e.g. the bytes hashed or the
+sheets loaded.
+
+This module provides:
+- UploadJob: state of one upload (stage, percent, result or error)
+- submit_upload_job: run an upload function on the job pool
+- get_upload_job: look a job up by id
+- shutdown_upload_jobs: stop the job pool on application shutdown
+"""
+
+# =============================== IMPORTS ===============================
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from src.app.configs.logger_config import get_logger
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-Upload-Jobs")
+
+# =============================== CONSTANTS ===============================
+# Uploads processed at the same time (0 runs each upload inline, in the request)
+UPLOAD_JOB_WORKERS = int(os.getenv("UPLOAD_JOB_WORKERS", "2"))
+# Finished jobs stay queryable for this long
+UPLOAD_JOB_TTL_SECONDS = int(os.getenv("UPLOAD_JOB_TTL_SECONDS", "3600"))
+
+# Stage -> (percent at its start, percent at its end)
+STAGE_PERCENT = {
+    "queued": (0, 0),
+    "hashing": (0, 10),
+    "profiling": (10, 50),
+    "loading": (50, 90),
+    "finalizing": (90, 99),
+    "completed": (100, 100),
+}
+
+# =============================== JOB STATE ===============================
+_jobs: Dict[str, "UploadJob"] = {}
+_jobs_lock = threading.Lock()
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class UploadJob:
+    """
+    Progress of one background upload.
+
+    The worker thread moves the job forward with set_stage()/set_progress();
+    request handlers read it with to_dict(). state is "queued", "running",
+    "completed" or "failed"; a completed job holds the upload response in
+    result, a failed one the error detail and its HTTP status code.
+    """
+
+    def __init__(self, file_id: str, filename: str):
+        self.job_id = str(uuid.uuid4())
+        self.file_id = file_id
+        self.filename = filename
+        self.state = "queued"
+        self.stage = "queued"
+        self.percent = 0.0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.status_code: Optional[int] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def set_stage(self, stage: str) -> None:
+        """Enter a stage (one of STAGE_PERCENT)."""
+        with self._lock:
+            self.state = "running"
+            self.stage = stage
+            self.percent = float(STAGE_PERCENT[stage][0])
+        logger.debug(f"Upload job {self.job_id} ({self.filename}): {stage}")
+
+    def set_progress(self, fraction: float) -> None:
+        """Report the fraction (0-1) of the current stage that is done."""
+        with self._lock:
+            start, end = STAGE_PERCENT[self.stage]
+            self.percent = round(start + (end - start) * min(max(fraction, 0.0), 1.0), 1)
+
+    def complete(self, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self.state = self.stage = "completed"
+            self.percent = 100.0
+            self.result = result
+            self.finished_at = time.time()
+
+    def fail(self, detail: str, status_code: int = 500) -> None:
+        with self._lock:
+            self.state = "failed"
+            self.error = detail
+            self.status_code = status_code
+            self.finished_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            data = {
+                "job_id": self.job_id,
+                "file_id": self.file_id,
+                "filename": self.filename,
+                "state": self.state,
+                "stage": self.stage,
+                "percent": self.percent,
+                "elapsed_seconds": round((self.finished_at or time.time()) - self.created_at, 2),
+            }
+            if self.result is not None:
+                data["result"] = self.result
+            if self.error is not None:
+                data["error"] = self.error
+                data["status_code"] = self.status_code
+            return data
+
+
+# =============================== JOB POOL ===============================
+def _get_pool() -> ThreadPoolExecutor:
+    """Return the shared job pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=UPLOAD_JOB_WORKERS, thread_name_prefix="upload-job")
+            logger.info(f"Started upload job pool with {UPLOAD_JOB_WORKERS} worker thread(s)")
+        return _pool
+
+
+def shutdown_upload_jobs() -> None:
+    """Stop the job pool (called on application shutdown); queued jobs are dropped."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _prune_finished_jobs() -> None:
+    """Forget jobs that finished more than UPLOAD_JOB_TTL_SECONDS ago."""
+    cutoff = time.time() - UPLOAD_JOB_TTL_SECONDS
+    with _jobs_lock:
+        for job_id in [
+            job_id for job_id, job in _jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]:
+            del _jobs[job_id]
+
+
+def _run_job(job: UploadJob, work: Callable[[UploadJob], Dict[str, Any]], cleanup: Optional[Callable[[], None]]) -> None:
+    """Worker: run an upload, clean up, then record its outcome on the job."""
+    start_time = time.perf_counter()
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[HTTPException] = None
+    try:
+        result = work(job)
+    except HTTPException as e:
+        error = e
+        logger.warning(f"Upload job {job.job_id} ({job.filename}) failed: {e.detail}")
+    except Exception as e:
+        error = HTTPException(status_code=500, detail=f"Upload failed: {e}")
+        logger.error(f"Upload job {job.job_id} ({job.filename}) failed: {e}", exc_info=True)
+    finally:
+        # Clean up first, so a client that sees the job finished sees its files settled too
+        if cleanup is not None:
+            cleanup()
+
+    if error is not None:
+        job.fail(str(error.detail), error.status_code)
+    else:
+        job.complete(result)
+        logger.info(f"Upload job {job.job_id} ({job.filename}) completed in {time.perf_counter() - start_time:.2f}s")
+
+
+# =============================== PUBLIC API ===============================
+def submit_upload_job(
+    file_id: str,
+    filename: str,
+    work: Callable[[UploadJob], Dict[str, Any]],
+    cleanup: Optional[Callable[[], None]] = None
+) -> UploadJob:
+    """
+    Run an upload in the background.
+
+    Args:
+        file_id: File ID the upload will be registered under
+        filename: Original file name (for progress reports)
+        work: Processes the upload, reporting progress on the job it is given,
+              and returns the upload response; an HTTPException fails the job
+              with its detail and status code
+        cleanup: Called after work, whether it succeeded or not
+
+    Returns:
+        UploadJob: The queued job (finished already when UPLOAD_JOB_WORKERS is 0)
+    """
+    _prune_finished_jobs()
+    job = UploadJob(file_id, filename)
+    with _jobs_lock:
+        _jobs[job.job_id] = job
+
+    if UPLOAD_JOB_WORKERS <= 0:
+        _run_job(job, work, cleanup)
+    else:
+        _get_pool().submit(_run_job, job, work, cleanup)
+    return job
+
+
+def get_upload_job(job_id: str) -> Optional[UploadJob]:
+    """Return a job by id (None if unknown or expired)."""
+    with _jobs_lock:
+        return _jobs.get(job_id)
@@ -0,0 +1,152 @@
+# =============================== FILE PURPOSE ===============================
+"""
+XLSX Stream - Row-iterating reader for large .xlsx workbooks.
+
+pd.read_excel builds the whole workbook in memory (openpyxl cell objects plus
+the DataFrame), which takes several GB for a few hundred MB of .xlsx. In
+read-only mode openpyxl parses the sheet XML as it iterates rows, so reading
+a sheet as DataFrames of XLSX_BATCH_ROWS rows keeps memory flat whatever the
+size of the workbook.
+
+Uploads choose a reader per file ("pandas", "streaming" or "auto"); "auto"
+streams .xlsx files from XLSX_STREAMING_THRESHOLD_MB on.
+
+This module provides:
+- resolve_xlsx_reader: validate a requested reader name
+- should_stream_xlsx: decide whether a file is read with the streaming reader
+- iter_sheet_batches: read one sheet as DataFrames of a bounded number of rows
+"""
+
+# =============================== IMPORTS ===============================
+import os
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional
+
+import pandas as pd
+
+from src.app.configs.logger_config import get_logger
+
+# =============================== LOGGER ===============================
+logger = get_logger("Utils-Service-XLSX-Stream")
+
+# =============================== CONSTANTS ===============================
+XLSX_READERS = ("auto", "pandas", "streaming")
+# Default reader for uploads that do not choose one
+XLSX_READER = os.getenv("XLSX_READER", "auto").lower()
+# With the "auto" reader, .xlsx files of at least this size are streamed
+XLSX_STREAMING_THRESHOLD_MB = int(os.getenv("XLSX_STREAMING_THRESHOLD_MB", "50"))
+# Rows per DataFrame handed out by the streaming reader
+XLSX_BATCH_ROWS = int(os.getenv("XLSX_BATCH_ROWS", "50000"))
+
+
+# =============================== READER SELECTION ===============================
+def resolve_xlsx_reader(reader: Optional[str] = None) -> str:
+    """
+    Validate a reader name, defaulting to XLSX_READER.
+
+    Raises:
+        ValueError: If the reader is not one of XLSX_READERS
+    """
+    reader = (reader or XLSX_READER).strip().lower()
+    if reader not in XLSX_READERS:
+        raise ValueError(f"Unknown XLSX reader '{reader}'. Allowed readers: {', '.join(XLSX_READERS)}")
+    return reader
+
+
+def should_stream_xlsx(file_path: str, reader: Optional[str] = None) -> bool:
+    """
+    Decide whether a file is ingested with the streaming XLSX reader.
+
+    Args:
+        file_path: Path to the uploaded file
+        reader: "streaming", "pandas" or "auto" (default: XLSX_READER)
+
+    Returns:
+        bool: True for .xlsx files with the "streaming" reader, or with "auto"
+        at or above XLSX_STREAMING_THRESHOLD_MB
+    """
+    path = Path(file_path)
+    if path.suffix.lower() != ".xlsx" or not path.exists():
+        return False
+    reader = resolve_xlsx_reader(reader)
+    if reader != "auto":
+        return reader == "streaming"
+    return path.stat().st_size >= XLSX_STREAMING_THRESHOLD_MB * 1024 * 1024
+
+
+# =============================== STREAMING READER ===============================
+def _header_names(header: tuple) -> List[str]:
+    """Column names of a header row, named and de-duplicated like pd.read_excel."""
+    names: List[str] = []
+    seen: dict = {}
+    for position, value in enumerate(header):
+        name = f"Unnamed: {position}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        seen.setdefault(name, 0)
+        names.append(name)
+    return names
+
+
+def iter_sheet_batches(
+    file_path: str,
+    sheet_name: str,
+    batch_rows: int = XLSX_BATCH_ROWS,
+    usecols: Optional[Callable[[Any], bool]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Read one sheet of an .xlsx file as DataFrames of at most batch_rows rows.
+
+    The first row is the header. Column names are raw (callers clean them)
+    and dtypes are inferred per batch, so a column may come out e.g. int64
+    in one batch and float64 in the next. Empty rows at the end of the sheet
+    are dropped; a sheet without data rows yields one empty DataFrame.
+
+    Args:
+        file_path: Path to the .xlsx file
+        sheet_name: Sheet to read
+        batch_rows: Maximum rows per DataFrame
+        usecols: Keep only the columns whose raw name it accepts (None: all)
+
+    Yields:
+        pd.DataFrame: Consecutive row batches of the sheet
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        names = _header_names(next(rows, ()))
+        keep = [position for position, name in enumerate(names) if usecols is None or usecols(name)]
+        columns = [names[position] for position in keep]
+        width = len(names)
+
+        batch: List[tuple] = []
+        pending_empty = 0
+        yielded = False
+        total_rows = 0
+        for row in rows:
+            if all(value is None for value in row):
+                # Blank rows only count once data follows them
+                pending_empty += 1
+                continue
+            if pending_empty:
+                batch.extend([(None,) * len(keep)] * pending_empty)
+                pending_empty = 0
+            if len(row) < width:
+                row = row + (None,) * (width - len(row))
+            batch.append(tuple(row[position] for position in keep))
+
+            while len(batch) >= batch_rows:
+                yield pd.DataFrame.from_records(batch[:batch_rows], columns=columns)
+                total_rows += batch_rows
+                batch = batch[batch_rows:]
+                yielded = True
+
+        if batch or not yielded:
+            yield pd.DataFrame.from_records(batch, columns=columns)
+            total_rows += len(batch)
+        logger.debug(f"Streamed {total_rows} rows from sheet '{sheet_name}' of {Path(file_path).name}")
+    finally:
+        workbook.close()
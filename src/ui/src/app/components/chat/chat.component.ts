@@ -2,7 +2,7 @@ import { Component, OnInit, ViewChild, ElementRef, AfterViewChecked } from '@ang
 import { CommonModule } from '@angular/common';
 import { FormsModule } from '@angular/forms';
 import { DomSanitizer, SafeHtml } from '@angular/platform-browser';
-import { ChatService, ChatRequest, ChatResponse, UploadResponse, FileStatusResponse } from '../../services/chat.service';
+import { ChatService, ChatRequest, ChatResponse, UploadResponse, UploadJobStatus, FileStatusResponse } from '../../services/chat.service';
 
 interface Message {
     role: 'user' | 'assistant';
@@ -205,7 +205,7 @@ export class ChatComponent implements OnInit, AfterViewChecked {
     addWelcomeMessage(): void {
         this.messages.push({
             role: 'assistant',
-            content: 'Hello! I\'m your SQL ChatBot. Please upload an Excel file (.xlsx, .xls, or .csv) to get started, or ask me a question!',
+            content: 'Hello! I\'m your SQL ChatBot. Please upload a data file (.xlsx, .xls, .csv, .csv.gz, .zip, .parquet or .jsonl) to get started, or ask me a question!',
             timestamp: new Date()
         });
     }
@@ -218,25 +218,34 @@ export class ChatComponent implements OnInit, AfterViewChecked {
     }
 
     uploadFile(file: File): void {
-        // Validate file type
-        const allowedTypes = [
-            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'application/vnd.ms-excel',
-            'text/csv'
-        ];
-        const allowedExtensions = ['.xlsx', '.xls', '.csv'];
-        const fileExt = '.' + file.name.split('.').pop()?.toLowerCase();
-
-        if (!allowedExtensions.includes(fileExt)) {
-            this.showError('Invalid file type. Please upload .xlsx, .xls, or .csv files.');
+        // Validate file type (compound extensions such as .csv.gz are matched on the full suffix)
+        const allowedExtensions = ['.xlsx', '.xls', '.csv', '.csv.gz', '.zip', '.parquet', '.jsonl'];
+        const fileName = file.name.toLowerCase();
+
+        if (!allowedExtensions.some(ext => fileName.endsWith(ext))) {
+            this.showError('Invalid file type. Please upload .xlsx, .xls, .csv, .csv.gz, .zip, .parquet, or .jsonl files.');
             return;
         }
 
-        this.activeRequests++;
-        this.updateLoadingState();
+        // Progress message, updated while the server processes the upload; chat stays
+        // usable meanwhile, so uploads do not count as active requests
+        const progressMessage: Message = {
+            role: 'assistant',
+            content: `⏳ Uploading "${file.name}"...`,
+            timestamp: new Date()
+        };
+        this.messages.push(progressMessage);
+        const removeProgressMessage = () => {
+            this.messages = this.messages.filter(m => m !== progressMessage);
+        };
+        const onProgress = (job: UploadJobStatus) => {
+            progressMessage.content = `⏳ Processing "${file.name}": ${job.stage} (${Math.round(job.percent)}%)`;
+        };
 
-        this.chatService.uploadFile(file).subscribe({
+        this.chatService.uploadFile(file, onProgress).subscribe({
             next: (response: UploadResponse) => {
+                removeProgressMessage();
+
                 // Add to files array
                 const newFile = {
                     file_id: response.file_id,
@@ -258,9 +267,6 @@ export class ChatComponent implements OnInit, AfterViewChecked {
                     timestamp: new Date()
                 });
 
-                this.activeRequests--;
-                this.updateLoadingState();
-
                 // Reset file input
                 if (this.fileInput) {
                     this.fileInput.nativeElement.value = '';
@@ -272,9 +278,8 @@ export class ChatComponent implements OnInit, AfterViewChecked {
                 localStorage.setItem('uploadedFilesSchemas', JSON.stringify(schemasObj));
             },
             error: (error) => {
+                removeProgressMessage();
                 this.showError(`Upload failed: ${error.error?.detail || error.message}`);
-                this.activeRequests--;
-                this.updateLoadingState();
             }
         });
     }
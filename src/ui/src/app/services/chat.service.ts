@@ -1,6 +1,7 @@
 import { Injectable } from '@angular/core';
 import { HttpClient, HttpHeaders } from '@angular/common/http';
-import { Observable } from 'rxjs';
+import { Observable, timer } from 'rxjs';
+import { exhaustMap, last, map, switchMap, takeWhile, tap } from 'rxjs/operators';
 
 export interface ChatRequest {
   message: string;
@@ -40,6 +41,20 @@ export interface UploadResponse {
   max_files: number;
 }
 
+export interface UploadJobStatus {
+  status: string;
+  job_id: string;
+  file_id: string;
+  filename: string;
+  state: 'queued' | 'running' | 'completed' | 'failed';
+  stage: string;
+  percent: number;
+  elapsed_seconds: number;
+  result?: UploadResponse;
+  error?: string;
+  status_code?: number;
+}
+
 export interface FileStatusResponse {
   status: string;
   has_files: boolean;  // Changed from has_file
@@ -53,14 +68,33 @@ export interface FileStatusResponse {
 })
 export class ChatService {
   private apiUrl = 'http://localhost:8000/api';
+  private uploadPollIntervalMs = 1000;
 
   constructor(private http: HttpClient) { }
 
-  uploadFile(file: File): Observable<UploadResponse> {
+  // The server processes uploads as background jobs: poll the job until it finishes
+  uploadFile(file: File, onProgress?: (job: UploadJobStatus) => void): Observable<UploadResponse> {
     const formData = new FormData();
     formData.append('file', file);
 
-    return this.http.post<UploadResponse>(`${this.apiUrl}/upload-file`, formData);
+    return this.http.post<UploadJobStatus>(`${this.apiUrl}/upload-file`, formData).pipe(
+      switchMap(job => timer(0, this.uploadPollIntervalMs).pipe(
+        exhaustMap(() => this.getUploadJob(job.job_id)),
+        tap(status => onProgress?.(status)),
+        takeWhile(status => status.state !== 'completed' && status.state !== 'failed', true),
+        last()
+      )),
+      map(status => {
+        if (status.state === 'failed' || !status.result) {
+          throw { error: { detail: status.error }, message: status.error };
+        }
+        return status.result;
+      })
+    );
+  }
+
+  getUploadJob(jobId: string): Observable<UploadJobStatus> {
+    return this.http.get<UploadJobStatus>(`${this.apiUrl}/upload-jobs/${jobId}`);
   }
 
   sendMessage(request: ChatRequest): Observable<ChatResponse> {
@@ -0,0 +1,54 @@
+# =============================== FILE PURPOSE ===============================
+"""
+Shared test setup.
+
+The application modules create database/, cache/ and logs/ relative to the
+working directory when they are imported, so the whole test session runs in
+a scratch directory. Every test starts from an empty database and an empty
+result cache.
+"""
+
+# =============================== IMPORTS ===============================
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+os.chdir(tempfile.mkdtemp(prefix="sql-chatbot-tests-"))
+
+
+# =============================== FIXTURES ===============================
+@pytest.fixture(autouse=True)
+def empty_database():
+    """Drop every loaded table and cached result after each test."""
+    yield
+    from src.app.utils.database_manager import clear_database
+    from src.app.utils.result_cache import clear_result_cache
+    clear_database()
+    clear_result_cache()
+
+
+@pytest.fixture
+def load_table(tmp_path):
+    """
+    Load a DataFrame as a table, like an upload of a CSV file.
+
+    Returns a function (table_name, df) -> schema generated for the file.
+    """
+    from src.app.utils.database_manager import load_file_to_db
+    from src.app.utils.schema_generator import generate_schema, read_excel_file
+
+    def load(table_name: str, df: pd.DataFrame) -> dict:
+        file_path = str(tmp_path / f"{table_name}.csv")
+        df.to_csv(file_path, index=False)
+        sheets_data = read_excel_file(file_path)
+        schema = generate_schema(file_path, sheets_data=sheets_data)
+        load_file_to_db(file_path, table_name, sheets_data=sheets_data, file_hash=table_name, schema=schema)
+        return schema
+
+    return load
@@ -0,0 +1,62 @@
+"""Large CSVs are profiled and loaded chunk by chunk, never parsed whole."""
+
+import pandas as pd
+import pytest
+
+from src.app.utils import database_manager
+from src.app.utils.database_manager import load_file_to_db, read_connection, should_stream_csv
+from src.app.utils.schema_generator import generate_schema
+
+CHUNK_ROWS = 100
+ROW_COUNT = 2000
+
+
+@pytest.fixture
+def parsed_rows(monkeypatch):
+    """Stream every CSV and record the most rows a single pd.read_csv call parses at once."""
+    monkeypatch.setattr(database_manager, "CSV_STREAMING_THRESHOLD_MB", 0)
+    largest = []
+    read_csv = pd.read_csv
+
+    def spy(*args, **kwargs):
+        result = read_csv(*args, **kwargs)
+        if kwargs.get("chunksize") is not None:
+            largest.append(kwargs["chunksize"])
+        else:
+            largest.append(len(result))
+        return result
+
+    monkeypatch.setattr(pd, "read_csv", spy)
+    return largest
+
+
+def test_streamed_csv_is_never_parsed_whole(tmp_path, parsed_rows):
+    file_path = str(tmp_path / "events.csv")
+    pd.DataFrame({
+        "id": range(1, ROW_COUNT + 1),
+        "kind": ["click", "view"] * (ROW_COUNT // 2),
+        "value": [0.5] * ROW_COUNT,
+    }).to_csv(file_path, index=False)
+    assert should_stream_csv(file_path)
+
+    schema = generate_schema(file_path, file_hash="events", csv_chunk_rows=CHUNK_ROWS)
+    load_file_to_db(file_path, "events", chunk_size=CHUNK_ROWS, file_hash="events", schema=schema)
+
+    assert parsed_rows and max(parsed_rows) <= CHUNK_ROWS
+    table = schema["tables"][0]
+    assert table["row_count"] == ROW_COUNT
+    assert {col["name"]: col["type"] for col in table["columns"]} == {"id": "INTEGER", "kind": "TEXT", "value": "REAL"}
+    assert [col["name"] for col in table["columns"] if col["is_potential_primary_key"]] == ["id"]
+    with read_connection("SELECT COUNT(*) FROM events") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == ROW_COUNT
+
+
+def test_chunked_profile_of_a_header_only_csv(tmp_path, parsed_rows):
+    file_path = str(tmp_path / "empty.csv")
+    pd.DataFrame(columns=["id", "name"]).to_csv(file_path, index=False)
+
+    schema = generate_schema(file_path, csv_chunk_rows=CHUNK_ROWS)
+
+    table = schema["tables"][0]
+    assert table["row_count"] == 0
+    assert [col["name"] for col in table["columns"]] == ["id", "name"]
@@ -0,0 +1,54 @@
+"""Question cache hits are counted only when the cached answer is served."""
+
+import pytest
+
+from src.app.utils import question_cache
+from src.app.utils.question_cache import (
+    discard_cached_sql,
+    get_question_cache_stats,
+    lookup_cached_sql,
+    record_cache_hit,
+    store_cached_sql,
+)
+
+GENERATED_SQL = '{"queries": ["SELECT * FROM employees"]}'
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(question_cache, "_entries", question_cache.OrderedDict())
+    monkeypatch.setattr(question_cache, "_stats", dict.fromkeys(question_cache._stats, 0))
+
+
+def _lookups():
+    stats = get_question_cache_stats()
+    return stats["hits"], stats["misses"]
+
+
+def test_served_answer_counts_as_a_hit():
+    store_cached_sql("Show all employees", "catalog", GENERATED_SQL)
+
+    assert lookup_cached_sql("show all employees.", "catalog") == GENERATED_SQL
+    assert _lookups() == (0, 0)
+    record_cache_hit(0.01)
+
+    assert _lookups() == (1, 0)
+    assert get_question_cache_stats()["hit_rate"] == 1.0
+
+
+def test_discarded_entry_counts_as_a_miss():
+    store_cached_sql("Show all employees", "catalog", GENERATED_SQL)
+
+    assert lookup_cached_sql("Show all employees", "catalog") == GENERATED_SQL
+    discard_cached_sql("Show all employees", "catalog")
+
+    assert _lookups() == (0, 1)
+    assert get_question_cache_stats()["discards"] == 1
+    assert lookup_cached_sql("Show all employees", "catalog") is None
+
+
+def test_other_catalog_is_a_miss():
+    store_cached_sql("Show all employees", "catalog", GENERATED_SQL)
+
+    assert lookup_cached_sql("Show all employees", "other catalog") is None
+    assert _lookups() == (0, 1)
@@ -0,0 +1,109 @@
+"""Result cache: repeated queries are served from cache until the catalog version changes."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from src.app.mcp.tools import execute_sql_query
+from src.app.utils import result_cache
+from src.app.utils.database_manager import append_rows_to_db, get_catalog_version, remove_table_from_db
+from src.app.utils.result_cache import get_result_cache_stats, normalize_sql, store_cached_result
+
+COUNT_QUERY = "SELECT COUNT(*) AS n FROM orders"
+ORDER_TYPES = {"id": "INTEGER", "amount": "REAL"}
+
+
+@pytest.fixture
+def orders(load_table):
+    return load_table("orders", pd.DataFrame({"id": range(1, 101), "amount": [10.0] * 100}))
+
+
+def _count():
+    output = json.loads(execute_sql_query(COUNT_QUERY))
+    assert output["success"], output
+    return output["data"][0]["n"]
+
+
+def _lookups():
+    stats = get_result_cache_stats()
+    return stats["hits"], stats["misses"]
+
+
+def test_repeated_query_is_served_from_cache(orders):
+    hits, misses = _lookups()
+
+    first = execute_sql_query(COUNT_QUERY)
+    second = execute_sql_query("SELECT  COUNT(*)  AS n\nFROM orders;")
+
+    assert second == first
+    assert _lookups() == (hits + 1, misses + 1)
+
+
+def test_append_bumps_the_version_and_invalidates(orders):
+    version = get_catalog_version()
+    assert _count() == 100
+
+    append_rows_to_db("orders", pd.DataFrame({"id": [101, 102], "amount": [1.0, 2.0]}), ORDER_TYPES, ["id"])
+
+    assert get_catalog_version() != version
+    hits, misses = _lookups()
+    assert _count() == 102
+    assert _lookups() == (hits, misses + 1)
+
+
+def test_reload_bumps_the_version_and_invalidates(orders, load_table):
+    assert _count() == 100
+
+    load_table("orders", pd.DataFrame({"id": range(1, 31), "amount": [1.0] * 30}))
+
+    assert _count() == 30
+
+
+def test_removal_bumps_the_version_and_invalidates(orders, load_table):
+    load_table("customers", pd.DataFrame({"id": [1, 2]}))
+    assert _count() == 100
+    version = get_catalog_version()
+
+    remove_table_from_db("orders")
+
+    assert get_catalog_version() != version
+    assert json.loads(execute_sql_query(COUNT_QUERY))["success"] is False
+
+
+def test_result_of_an_older_version_is_not_stored(orders):
+    stale_version = get_catalog_version()
+    append_rows_to_db("orders", pd.DataFrame({"id": [101], "amount": [1.0]}), ORDER_TYPES)
+
+    stored = store_cached_result("sqlite", COUNT_QUERY, stale_version, json.dumps({"success": True}))
+
+    assert stored is False
+    assert _count() == 101
+
+
+def test_failed_queries_are_not_cached(orders):
+    execute_sql_query("SELECT missing FROM orders")
+    hits, misses = _lookups()
+
+    execute_sql_query("SELECT missing FROM orders")
+
+    assert _lookups() == (hits, misses + 1)
+
+
+def test_zero_size_disables_the_cache(orders, monkeypatch):
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_MAX_BYTES", 0)
+    hits, misses = _lookups()
+
+    _count()
+    _count()
+
+    assert _lookups() == (hits, misses)
+    assert get_result_cache_stats()["enabled"] is False
+
+
+def test_normalize_sql_keeps_quoted_text():
+    assert normalize_sql("SELECT  *\n FROM t ;") == "SELECT * FROM t"
+    assert normalize_sql("SELECT * FROM t WHERE name = 'a  b'") == "SELECT * FROM t WHERE name = 'a  b'"
+    assert normalize_sql("SELECT * FROM t WHERE name = 'a b'") != normalize_sql(
+        "SELECT * FROM t WHERE name = 'a  b'"
+    )
@@ -0,0 +1,82 @@
+"""Result handles: a preview with the query, later pages read back by offset."""
+
+import pandas as pd
+import pytest
+
+from src.app.utils import result_store
+from src.app.utils.query_engine import SQLiteEngine
+from src.app.utils.result_store import RESULT_INDEX_STEP, execute_with_handle, fetch_result_page
+
+ROWS = 2 * RESULT_INDEX_STEP + 500
+
+
+@pytest.fixture
+def handle(load_table):
+    load_table("events", pd.DataFrame({"id": range(ROWS), "label": [f"e{i}" for i in range(ROWS)]}))
+    return execute_with_handle(SQLiteEngine(), "SELECT id, label FROM events ORDER BY id", preview_rows=100)
+
+
+def test_preview_and_handle(handle):
+    assert handle["row_count"] == ROWS
+    assert handle["stored_rows"] == ROWS
+    assert [row[0] for row in handle["rows"]] == list(range(100))
+    assert handle["result_id"] is not None
+
+
+@pytest.mark.parametrize("offset", [0, 1, 99, 100, RESULT_INDEX_STEP - 1, RESULT_INDEX_STEP,
+                                    RESULT_INDEX_STEP + 1, 2 * RESULT_INDEX_STEP + 3, ROWS - 10])
+def test_page_starts_at_offset(handle, offset):
+    page = fetch_result_page(handle["result_id"], offset=offset, limit=25)
+
+    assert page["columns"] == ["id", "label"]
+    assert page["offset"] == offset
+    assert [row[0] for row in page["rows"]] == list(range(offset, min(offset + 25, ROWS)))
+    assert page["rows"][0] == [offset, f"e{offset}"]
+
+
+def test_pages_chain_through_next_offset(handle):
+    ids, offset = [], 0
+    while offset is not None:
+        page = fetch_result_page(handle["result_id"], offset=offset, limit=700)
+        ids += [row[0] for row in page["rows"]]
+        offset = page["next_offset"]
+
+    assert ids == list(range(ROWS))
+
+
+@pytest.mark.parametrize("offset", [ROWS, ROWS + 5, 10 * ROWS])
+def test_page_past_the_end_is_empty(handle, offset):
+    page = fetch_result_page(handle["result_id"], offset=offset, limit=10)
+
+    assert page["rows"] == []
+    assert page["next_offset"] is None
+
+
+def test_invalid_page_is_rejected(handle):
+    with pytest.raises(ValueError):
+        fetch_result_page(handle["result_id"], offset=-1)
+    with pytest.raises(ValueError):
+        fetch_result_page(handle["result_id"], limit=0)
+    with pytest.raises(ValueError):
+        fetch_result_page("0" * 32)
+
+
+def test_small_result_has_no_handle(load_table):
+    load_table("events", pd.DataFrame({"id": range(10)}))
+
+    handle = execute_with_handle(SQLiteEngine(), "SELECT id FROM events", preview_rows=100)
+
+    assert handle["result_id"] is None
+    assert handle["row_count"] == 10
+
+
+def test_rows_beyond_the_stored_limit_are_counted_not_kept(load_table, monkeypatch):
+    monkeypatch.setattr(result_store, "RESULT_MAX_ROWS", 1500)
+    load_table("events", pd.DataFrame({"id": range(ROWS)}))
+
+    handle = execute_with_handle(SQLiteEngine(), "SELECT id FROM events ORDER BY id", preview_rows=100)
+    page = fetch_result_page(handle["result_id"], offset=1490, limit=50)
+
+    assert (handle["row_count"], handle["stored_rows"]) == (ROWS, 1500)
+    assert [row[0] for row in page["rows"]] == list(range(1490, 1500))
+    assert page["next_offset"] is None
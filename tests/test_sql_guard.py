@@ -0,0 +1,70 @@
+"""Validation of generated SQL: one read-only SELECT over loaded tables and columns."""
+
+import pandas as pd
+import pytest
+
+from src.app.utils.query_engine import QueryExecutionError, SQLiteEngine
+from src.app.utils.sql_guard import SqlValidationError, validate_select_query
+
+
+@pytest.fixture(autouse=True)
+def tables(load_table):
+    load_table("employees", pd.DataFrame({"id": [1, 2, 3], "name": ["Ada", "Bo", "Cy"], "dept": [10, 10, 20]}))
+    load_table("departments", pd.DataFrame({"dept": [10, 20], "title": ["R&D", "Sales"]}))
+
+
+@pytest.mark.parametrize("query, tables_read", [
+    ("SELECT * FROM employees", {"employees"}),
+    ("select name from employees where dept = 10;", {"employees"}),
+    ("SELECT e.name, d.title FROM employees e JOIN departments d ON d.dept = e.dept", {"employees", "departments"}),
+    ("WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 3) SELECT x FROM n", set()),
+    ("SELECT dept, COUNT(*), upper(MAX(name)) FROM employees GROUP BY dept", {"employees"}),
+])
+def test_valid_queries_pass(query, tables_read):
+    assert validate_select_query(query) == tables_read
+
+
+@pytest.mark.parametrize("query", [
+    "",
+    "   ;  ",
+    "DELETE FROM employees",
+    "UPDATE employees SET name = 'x'",
+    "INSERT INTO employees VALUES (4, 'Di', 20)",
+    "DROP TABLE employees",
+    "CREATE TABLE t (x)",
+    "PRAGMA table_info(employees)",
+    "ATTACH DATABASE 'other.db' AS other",
+    "SELECT * FROM employees; DELETE FROM employees",
+    "SELECT * FROM missing_table",
+    "SELECT salary FROM employees",
+    "SELEC * FROM employees",
+    "SELECT * FROM sqlite_master",
+    "SELECT * FROM _table_catalog",
+    "SELECT * FROM _catalog_version",
+])
+def test_invalid_queries_are_rejected(query):
+    with pytest.raises(SqlValidationError):
+        validate_select_query(query)
+
+
+def test_rejection_names_the_table():
+    with pytest.raises(SqlValidationError, match="sqlite_master"):
+        validate_select_query("SELECT name FROM sqlite_master")
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT * FROM sqlite_master",
+    "SELECT * FROM _table_catalog",
+    "SELECT * FROM main._catalog_version",
+    "SELECT e.* FROM employees e, pragma_table_info('employees')",
+])
+def test_engine_applies_the_same_rules(query):
+    with pytest.raises(QueryExecutionError):
+        SQLiteEngine().execute(query)
+
+
+def test_engine_runs_valid_queries():
+    columns, rows = SQLiteEngine().execute("SELECT name FROM employees WHERE dept = 10 ORDER BY id")
+
+    assert columns == ["name"]
+    assert rows == [("Ada",), ("Bo",)]
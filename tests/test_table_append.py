@@ -0,0 +1,65 @@
+"""Appending delta rows to a loaded table: rows whose key is already loaded are skipped."""
+
+import pandas as pd
+
+from src.app.utils.database_manager import append_rows_to_db, read_connection
+from src.app.utils.table_append import append_delta
+
+
+def _ids(table_name):
+    with read_connection(f"SELECT id FROM {table_name}") as conn:
+        return [row[0] for row in conn.execute(f"SELECT id FROM {table_name} ORDER BY id")]
+
+
+def test_append_skips_rows_whose_key_is_loaded(load_table):
+    schema = load_table("orders", pd.DataFrame({"id": range(1, 101), "amount": [1.5] * 100}))
+    delta = pd.DataFrame({"id": range(91, 121), "amount": [2.5] * 30})
+
+    new_table, appended = append_delta("f1", "orders", schema, "Sheet1", delta, ["id"])
+
+    assert appended == 20
+    assert new_table["row_count"] == 120
+    assert _ids("orders") == list(range(1, 121))
+
+
+def test_append_skips_duplicate_keys_within_the_delta(load_table):
+    load_table("orders", pd.DataFrame({"id": [1, 2, 3], "amount": [1.0, 2.0, 3.0]}))
+    delta = pd.DataFrame({"id": [3, 4, 4, 5, 5], "amount": [9.0, 4.0, 4.5, 5.0, 5.5]})
+
+    inserted, _ = append_rows_to_db("orders", delta, {"id": "INTEGER", "amount": "REAL"}, ["id"])
+
+    assert inserted["id"].tolist() == [4, 5]
+    assert _ids("orders") == [1, 2, 3, 4, 5]
+
+
+def test_append_with_composite_key(load_table):
+    load_table("stock", pd.DataFrame({"store": [1, 1, 2], "item": ["a", "b", "a"], "qty": [5, 6, 7]}))
+    delta = pd.DataFrame({"store": [1, 2, 2], "item": ["b", "a", "b"], "qty": [0, 0, 8]})
+    column_types = {"store": "INTEGER", "item": "TEXT", "qty": "INTEGER"}
+
+    inserted, _ = append_rows_to_db("stock", delta, column_types, ["store", "item"])
+
+    assert inserted[["store", "item"]].values.tolist() == [[2, "b"]]
+
+
+def test_append_without_key_inserts_every_row(load_table):
+    load_table("orders", pd.DataFrame({"id": [1, 2], "amount": [1.0, 2.0]}))
+
+    delta = pd.DataFrame({"id": [2, 3], "amount": [2.0, 3.0]})
+
+    inserted, _ = append_rows_to_db("orders", delta, {"id": "INTEGER", "amount": "REAL"})
+
+    assert len(inserted) == 2
+    assert _ids("orders") == [1, 2, 2, 3]
+
+
+def test_reappending_a_delta_appends_nothing(load_table):
+    schema = load_table("orders", pd.DataFrame({"id": range(1, 11), "amount": [1.0] * 10}))
+    delta = pd.DataFrame({"id": range(8, 15), "amount": [2.0] * 7})
+
+    table, first = append_delta("f1", "orders", schema, "Sheet1", delta, ["id"])
+    schema = {**schema, "tables": [table]}
+    _, second = append_delta("f1", "orders", schema, "Sheet1", delta, ["id"])
+
+    assert (first, second) == (4, 0)
+    assert _ids("orders") == list(range(1, 15))